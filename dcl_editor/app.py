@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import multiprocessing
 import sys
 
 from .startup import ensure_supported_python, fail_startup
@@ -20,14 +21,21 @@ except Exception:  # pragma: no cover - guard path
 
 from PySide6.QtWidgets import QApplication
 
-from .ui.main_window import MainWindow
-from .ui.theme import ThemeMode, apply_theme
-
 
 def main() -> int:
     """Run the DCL Editor application and return the exit status."""
 
+    # Worker processes of a frozen Windows build re-enter here; this runs
+    # their task and exits instead of opening another window.
+    multiprocessing.freeze_support()
+
     app = QApplication(sys.argv)
+
+    # Imported after the application exists; the window pulls in its own
+    # heavier modules lazily once it is on screen.
+    from .ui.main_window import MainWindow
+    from .ui.theme import ThemeMode, apply_theme
+
     apply_theme(app, ThemeMode.LIGHT)
 
     window = MainWindow()
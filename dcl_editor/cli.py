@@ -0,0 +1,329 @@
+"""Command line entry point; without a sub-command the desktop viewer starts.
+
+Sub-commands import their back ends when they run so that starting the viewer
+does not pay for asyncio, the exporters or the query engine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Sequence
+
+
+def _run_stats(args: argparse.Namespace) -> int:
+    from .core.extractor import minutes_to_timestamp
+    from .io.indexer import DclIndexer
+    from .io.loader import LogLoader
+    from .io.stats import DclStatistics, format_report, read_cached_stats, write_cached_stats
+
+    cached = None if args.refresh else read_cached_stats(args.path, args.bucket)
+    if cached is not None:
+        stats, anomalies = cached
+    else:
+        loader = LogLoader()
+        try:
+            stat = os.stat(args.path)
+            blocks = loader.load(args.path)
+        except OSError as exc:
+            print(f"Could not read file: {exc}")
+            return 1
+        stats = DclStatistics(bucket_minutes=args.bucket)
+        stats.extend(blocks)
+        stats.record_dangling(loader.dangling_starts)
+        indexer = DclIndexer()
+        indexer.rebuild(blocks)
+        anomalies = indexer.anomaly_counts()
+        try:
+            write_cached_stats(args.path, stats, anomalies, stat)
+        except OSError:
+            pass
+    for line in format_report(stats, top=args.top, anomalies=anomalies):
+        print(line)
+    if args.timeline:
+        print("Timeline:")
+        for bucket, counts in stats.timeline():
+            detail = " ".join(f"{key}={value}" for key, value in sorted(counts.items()))
+            print(f"  {minutes_to_timestamp(bucket)}  {detail}")
+    return 0
+
+
+def _run_peek(args: argparse.Namespace) -> int:
+    from .io.sampler import format_sample_report, sample_log
+
+    try:
+        report = sample_log(args.path, samples=args.samples, window_bytes=args.window, top=args.top, seed=args.seed)
+    except OSError as exc:
+        print(f"Could not read file: {exc}")
+        return 1
+    for line in format_sample_report(report):
+        print(line)
+    return 0
+
+
+def _run_query(args: argparse.Namespace) -> int:
+    from .io.indexer import DclIndexer
+    from .io.loader import LogLoader
+    from .io.query import QuerySyntaxError, execute_query, parse_query
+
+    try:
+        query = parse_query(args.query)
+    except QuerySyntaxError as exc:
+        print(f"Query error: {exc}")
+        return 2
+    loader = LogLoader()
+    try:
+        blocks = loader.load(args.path)
+    except OSError as exc:
+        print(f"Could not read file: {exc}")
+        return 1
+    indexer = DclIndexer()
+    indexer.rebuild(blocks)
+    result = execute_query(query, indexer, loader.read_text)
+    if args.explain:
+        for step in result.explain:
+            print(f"# {step}")
+    for block in result.blocks[: args.limit] if args.limit else result.blocks:
+        print(f"{block.ts or '------'}  {block.type:<7} {block.callsign or '-':<8} {block.summary}")
+    return 0
+
+
+def _run_extract(args: argparse.Namespace) -> int:
+    from .io.extract import extract_sublog
+    from .io.indexer import DclIndexer
+    from .io.loader import LogLoader
+    from .io.query import QuerySyntaxError, execute_query, parse_query
+
+    try:
+        query = parse_query(args.query)
+    except QuerySyntaxError as exc:
+        print(f"Query error: {exc}")
+        return 2
+    try:
+        loader = LogLoader()
+        blocks = loader.load(args.path)
+        indexer = DclIndexer()
+        indexer.rebuild(blocks)
+        selected = execute_query(query, indexer, loader.read_text).blocks
+        result = extract_sublog(args.path, selected, args.destination, context=blocks, write_index=not args.no_index)
+    except OSError as exc:
+        print(f"Could not extract: {exc}")
+        return 1
+    print(f"Extracted {result.blocks} blocks in {result.ranges} ranges ({result.bytes_written} bytes) to {args.destination}")
+    return 0
+
+
+def _run_compare(args: argparse.Namespace) -> int:
+    from .io.compare import LogComparer
+
+    comparer = LogComparer(args.left, args.right, shift_minutes=args.shift)
+    shown = 0
+    try:
+        for difference in comparer.differences():
+            if args.limit and shown >= args.limit:
+                continue
+            shown += 1
+            print(difference.describe())
+            if args.diff:
+                for line in difference.diff:
+                    print(f"    {line}")
+    except OSError as exc:
+        print(f"Could not read file: {exc}")
+        return 1
+    counts = comparer.counts
+    print(
+        f"{comparer.matched} matched, {counts['missing']} missing, "
+        f"{counts['extra']} extra, {counts['changed']} changed"
+    )
+    return 0
+
+
+def _run_serve(args: argparse.Namespace) -> int:
+    from .io.server import QueryServer, QueryService
+
+    try:
+        service = QueryService(args.path, cache_size=args.cache, cache_ids=args.cache_ids)
+        server = QueryServer(service, host=args.host, port=args.port, verbose=args.verbose)
+    except OSError as exc:
+        print(f"Could not start server: {exc}")
+        return 1
+    print(f"Serving {len(service.indexer.blocks)} blocks on http://{args.host}:{server.bound_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _parse_host_port(text: str) -> tuple[str, int]:
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def _run_replay(args: argparse.Namespace) -> int:
+    from .io.replay import ReplayServer
+
+    udp_target = _parse_host_port(args.udp) if args.udp else None
+    try:
+        server = ReplayServer(
+            args.path,
+            host=args.host,
+            port=args.port,
+            frames_per_second=args.rate,
+            repeat=args.repeat,
+            udp_target=udp_target,
+        )
+    except OSError as exc:
+        print(f"Could not read file: {exc}")
+        return 1
+    server.start()
+    target = f"udp://{udp_target[0]}:{udp_target[1]}" if udp_target else f"tcp://{args.host}:{server.bound_port}"
+    print(f"Replaying {len(server.frames)} frames on {target}")
+    try:
+        while server.running:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    print(f"Sent {server.sent_frames} frames")
+    return 0
+
+
+def _run_ingest(args: argparse.Namespace) -> int:
+    from .io.alerts import AlertDispatcher
+    from .io.live import LiveIngestor
+    from .io.query import QuerySyntaxError
+
+    alerts = AlertDispatcher()
+    try:
+        for text in args.alert:
+            alerts.subscribe(text)
+    except QuerySyntaxError as exc:
+        print(f"Query error: {exc}")
+        return 2
+    try:
+        ingestor = LiveIngestor(args.endpoint, batch_size=args.batch)
+        ingestor.start()
+    except (ValueError, RuntimeError) as exc:
+        print(exc)
+        return 1
+    started = time.perf_counter()
+    total = 0
+    try:
+        while args.duration <= 0 or time.perf_counter() - started < args.duration:
+            time.sleep(1.0)
+            blocks = ingestor.drain()
+            for match in alerts.dispatch_many(blocks):
+                print(f"ALERT {match.describe()}")
+            received = len(blocks)
+            total += received
+            print(f"{received} blocks/s, {total} total, {ingestor.dropped_frames} dropped")
+            if not ingestor.running:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingestor.stop()
+    blocks = ingestor.drain()
+    for match in alerts.dispatch_many(blocks):
+        print(f"ALERT {match.describe()}")
+    total += len(blocks)
+    elapsed = time.perf_counter() - started
+    print(f"Received {total} blocks in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} blocks/s)")
+    return 0
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {text}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="dcl_editor", description="DCL Log Viewer")
+    commands = parser.add_subparsers(dest="command")
+
+    stats = commands.add_parser(
+        "stats", help="print message statistics for a log file, cached next to it until the file changes"
+    )
+    stats.add_argument("path", help="path to an ASMGCS DEBUG.log")
+    stats.add_argument("--top", type=int, default=5, help="number of top callsigns to list")
+    stats.add_argument("--bucket", type=int, default=60, help="timeline bucket size in minutes")
+    stats.add_argument("--timeline", action="store_true", help="also print counts per time bucket")
+    stats.add_argument("--refresh", action="store_true", help="reparse the log even if cached statistics match it")
+    stats.set_defaults(handler=_run_stats)
+
+    peek = commands.add_parser("peek", help="estimate a log's contents from random samples without loading it")
+    peek.add_argument("path", help="path to an ASMGCS DEBUG.log")
+    peek.add_argument("--samples", type=_positive_int, default=256, help="number of random windows to read")
+    peek.add_argument("--window", type=_positive_int, default=8192, help="bytes per sampled window")
+    peek.add_argument("--top", type=int, default=5, help="number of top callsigns to list")
+    peek.add_argument("--seed", type=int, help="random seed for repeatable estimates")
+    peek.set_defaults(handler=_run_peek)
+
+    query = commands.add_parser("query", help="filter a log file with the query language")
+    query.add_argument("path", help="path to an ASMGCS DEBUG.log")
+    query.add_argument("query", help='e.g. \'type:CDA callsign:THY* text:"SQUAWK 3270"\'')
+    query.add_argument("--explain", action="store_true", help="print the evaluation plan")
+    query.add_argument("--limit", type=int, default=0, help="maximum number of rows to print")
+    query.set_defaults(handler=_run_query)
+
+    extract = commands.add_parser("extract", help="copy the raw blocks matching a query into a sub-log")
+    extract.add_argument("path", help="path to an ASMGCS DEBUG.log")
+    extract.add_argument("destination", help="path of the sub-log to write")
+    extract.add_argument("query", help="e.g. 'callsign:THY1QN' or 'ts:170400..170530'")
+    extract.add_argument("--no-index", action="store_true", help="do not write the companion .dclidx index")
+    extract.set_defaults(handler=_run_extract)
+
+    compare = commands.add_parser("compare", help="list messages that differ between two logs")
+    compare.add_argument("left", help="reference log, e.g. from the main server")
+    compare.add_argument("right", help="log to compare, e.g. from the standby server")
+    compare.add_argument("--diff", action="store_true", help="print a body diff for changed messages")
+    compare.add_argument("--limit", type=int, default=0, help="maximum number of differences to print")
+    compare.add_argument("--shift", type=int, default=0, help="minutes added to right-hand timestamps")
+    compare.set_defaults(handler=_run_compare)
+
+    serve = commands.add_parser("serve", help="serve a parsed log over a local HTTP/JSON API")
+    serve.add_argument("path", help="path to an ASMGCS DEBUG.log")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    serve.add_argument("--cache", type=int, default=256, help="number of query results to keep cached")
+    serve.add_argument(
+        "--cache-ids", type=int, default=4_000_000, help="total block ids the cached query results may hold"
+    )
+    serve.add_argument("--verbose", action="store_true", help="log every request")
+    serve.set_defaults(handler=_run_serve)
+
+    replay = commands.add_parser("replay", help="stream a recorded log as a local live feed")
+    replay.add_argument("path", help="path to a recorded DEBUG.log")
+    replay.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    replay.add_argument("--port", type=int, default=4001, help="TCP port to listen on")
+    replay.add_argument("--rate", type=float, default=0.0, help="frames per second, 0 for unthrottled")
+    replay.add_argument("--repeat", type=int, default=1, help="how many times to replay the file")
+    replay.add_argument("--udp", metavar="HOST:PORT", help="send UDP datagrams to this address instead")
+    replay.set_defaults(handler=_run_replay)
+
+    ingest = commands.add_parser("ingest", help="decode a live feed and report throughput")
+    ingest.add_argument("endpoint", help="tcp://, tcp+connect://, udp:// or pipe:// feed endpoint")
+    ingest.add_argument("--duration", type=float, default=0.0, help="seconds to run, 0 until interrupted")
+    ingest.add_argument("--batch", type=int, default=256, help="blocks per published batch")
+    ingest.add_argument(
+        "--alert", action="append", default=[], metavar="QUERY", help="print blocks matching this standing query"
+    )
+    ingest.set_defaults(handler=_run_ingest)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        from .app import main as run_app
+
+        return run_app()
+    return args.handler(args)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from .extractor import timestamp_minutes
+from .models import ANY_ANOMALY, DclAnomaly, DclType
+from .tokenizer import START_BYTES
+
+
+OVERSIZED_BLOCK_BYTES = 8 << 10
+
+
+def detect_anomalies(raw: bytes, block_type: DclType, callsign: str | None, ts: str | None) -> DclAnomaly:
+    """Return the anomaly flags of one parsed block.
+
+    :attr:`DclAnomaly.DUPLICATE` is left to the deduplicator. A second <STX>
+    inside *raw* means an earlier frame lost its <ETX> and was swallowed by
+    this one, so the block is reported as truncated.
+    """
+
+    flags = DclAnomaly(0)
+    if raw.find(START_BYTES, len(START_BYTES)) != -1:
+        flags |= DclAnomaly.TRUNCATED
+    if block_type == "UNKNOWN":
+        flags |= DclAnomaly.UNKNOWN_TYPE
+    if not callsign:
+        flags |= DclAnomaly.MISSING_CALLSIGN
+    if not ts:
+        flags |= DclAnomaly.MISSING_TS
+    elif timestamp_minutes(ts) is None:
+        flags |= DclAnomaly.INVALID_TS
+    if len(raw) > OVERSIZED_BLOCK_BYTES:
+        flags |= DclAnomaly.OVERSIZED
+    if not raw.isascii():
+        flags |= DclAnomaly.NON_ASCII
+    return flags
+
+
+def parse_anomalies(text: str) -> DclAnomaly:
+    """Parse comma separated flag names such as ``truncated,missing_ts``; ``any`` selects every flag."""
+
+    flags = DclAnomaly(0)
+    for name in (token.strip().upper() for token in text.split(",")):
+        if not name:
+            continue
+        if name == "ANY":
+            flags |= ANY_ANOMALY
+        elif name in DclAnomaly.__members__:
+            flags |= DclAnomaly[name]
+        else:
+            raise ValueError(f"Unknown anomaly flag {name.lower()!r}")
+    return flags
+
+
+def describe_anomalies(flags: DclAnomaly) -> str:
+    return ",".join(flag.name.lower() for flag in DclAnomaly if flag in flags)
@@ -30,11 +30,51 @@ def _find_timestamp(lines: Iterable[str]) -> str | None:
     return None
 
 
+def timestamp_minutes(ts: str | None) -> int | None:
+    """Convert a ``DDHHMM`` timestamp to minutes since the start of the month."""
+
+    if not ts or len(ts) != 6 or not ts.isdigit():
+        return None
+    day, hour, minute = int(ts[:2]), int(ts[2:4]), int(ts[4:])
+    if not 1 <= day <= 31 or hour > 23 or minute > 59:
+        return None
+    return (day * 24 + hour) * 60 + minute
+
+
+def elapsed_minutes(start: int, end: int) -> int | None:
+    """Return the minutes from *start* to *end*, both from :func:`timestamp_minutes`.
+
+    ``DDHHMM`` carries no month, so an *end* on the 1st that is earlier than a
+    *start* on the 28th or later is a month rollover; the day of *start* is
+    then the length of the month. Any other step back returns ``None``.
+    """
+
+    if end >= start:
+        return end - start
+    day = start // (24 * 60)
+    if day < 28 or end // (24 * 60) != 1:
+        return None
+    return end + day * 24 * 60 - start
+
+
+def minutes_to_timestamp(minutes: int) -> str:
+    """Inverse of :func:`timestamp_minutes`."""
+
+    day, remainder = divmod(minutes, 24 * 60)
+    hour, minute = divmod(remainder, 60)
+    return f"{day:02d}{hour:02d}{minute:02d}"
+
+
+def extract_keys(clean_lines: list[str]) -> tuple[str | None, str | None]:
+    """Return the ``(callsign, ts)`` pair :func:`extract_fields` would report, without the snippets."""
+
+    return _find_callsign(clean_lines), _find_timestamp(clean_lines[:2]) or _find_timestamp(clean_lines)
+
+
 def extract_fields(clean_lines: list[str]) -> dict:
     """Extract callsign, timestamp and helper snippets for UI rendering."""
 
-    callsign = _find_callsign(clean_lines)
-    ts = _find_timestamp(clean_lines[:2]) or _find_timestamp(clean_lines)
+    callsign, ts = extract_keys(clean_lines)
 
     primary_text = ""
     for line in clean_lines:
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal, Optional
+from enum import IntFlag
+from typing import Callable, Literal, Optional
 
 
 DclType = Literal["RCD", "CLD", "CDA", "FSM", "UNKNOWN"]
 
 
+class DclAnomaly(IntFlag):
+    """Data-quality problems found while parsing a block; a block carries any combination."""
+
+    TRUNCATED = 1
+    UNKNOWN_TYPE = 2
+    MISSING_CALLSIGN = 4
+    MISSING_TS = 8
+    INVALID_TS = 16
+    OVERSIZED = 32
+    NON_ASCII = 64
+    DUPLICATE = 128
+
+
+ANY_ANOMALY = DclAnomaly(sum(DclAnomaly))
+
+
 @dataclass(slots=True)
 class DclBlock:
-    """Represents a cleaned and classified DCL exchange extracted from the log."""
+    """Represents a cleaned and classified DCL exchange extracted from the log.
+
+    ``start_offset`` and ``end_offset`` are byte offsets into the source file,
+    which ``source`` names when blocks from several logs are shown together.
+    ``anomalies`` is filled in together with the other enriched fields.
+    ``full_block_text`` is only kept for blocks with no file to re-read it
+    from; otherwise it is empty and read on demand through a
+    :data:`BlockTextReader` such as ``LogLoader.read_text``. ``digest`` is a
+    hash of that text taken while parsing, so duplicates are found without
+    reading it again.
+    """
 
     start_offset: int
     end_offset: int
@@ -20,6 +47,12 @@ class DclBlock:
     preview_text: str
     full_block_text: str
     metadata_json: str | None = None
+    enriched: bool = True
+    repeat_count: int = 1
+    duplicate_offsets: list[int] | None = None
+    source: str | None = None
+    anomalies: DclAnomaly = DclAnomaly(0)
+    digest: bytes | None = None
 
     def matches_callsign(self, callsign: str | None) -> bool:
         if not callsign:
@@ -32,3 +65,12 @@ class DclBlock:
         if not allowed_types:
             return True
         return self.type in allowed_types
+
+
+BlockTextReader = Callable[[DclBlock], str]
+
+
+def stored_text(block: DclBlock) -> str:
+    """:data:`BlockTextReader` for blocks that keep their normalized text."""
+
+    return block.full_block_text
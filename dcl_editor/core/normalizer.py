@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import re
 
 CRLF_TOKEN = "<CR><LF>"
@@ -8,6 +9,16 @@ CR_TOKEN = "<CR>"
 SPACE_TOKEN = "<SP>"
 CONTROL_PATTERN = re.compile(r"<(?:STX|ETX|CR|LF|SP)>")
 ANGLE_PATTERN = re.compile(r"[<>]")
+RAW_TOKEN_PATTERN = re.compile(r"<[A-Z]{2,3}>")
+RAW_BREAK_PATTERN = re.compile(r"(<CR><LF>|<LF>|<CR>)")
+DIGEST_BYTES = 16
+
+CRLF_BYTES = CRLF_TOKEN.encode("ascii")
+LF_BYTES = LF_TOKEN.encode("ascii")
+CR_BYTES = CR_TOKEN.encode("ascii")
+SPACE_BYTES = SPACE_TOKEN.encode("ascii")
+CONTROL_BYTES_PATTERN = re.compile(CONTROL_PATTERN.pattern.encode("ascii"))
+ANGLE_BYTES_PATTERN = re.compile(ANGLE_PATTERN.pattern.encode("ascii"))
 
 
 def normalize_block(raw: str) -> str:
@@ -23,6 +34,48 @@ def normalize_block(raw: str) -> str:
     text = text.replace(SPACE_TOKEN, " ")
     text = CONTROL_PATTERN.sub("", text)
     text = ANGLE_PATTERN.sub("", text)
+    return _join_clean_lines(text)
+
+
+def normalize_block_bytes(raw: bytes) -> str:
+    """Byte-level variant of :func:`normalize_block` for undecoded log data.
+
+    Control tokens are replaced on the raw bytes and only the cleaned result is
+    decoded. Blocks containing non-ASCII bytes are decoded first so that the
+    output is identical to ``normalize_block(raw.decode("utf-8", "ignore"))``.
+    """
+
+    if not raw:
+        return ""
+    if not raw.isascii():
+        return normalize_block(raw.decode("utf-8", errors="ignore"))
+
+    data = raw.replace(CRLF_BYTES, b"\n")
+    data = data.replace(LF_BYTES, b"\n")
+    data = data.replace(CR_BYTES, b"\n")
+    data = data.replace(SPACE_BYTES, b" ")
+    data = CONTROL_BYTES_PATTERN.sub(b"", data)
+    data = ANGLE_BYTES_PATTERN.sub(b"", data)
+    return _join_clean_lines(data.decode("ascii"))
+
+
+def text_digest(clean: str) -> bytes:
+    """Return a :data:`DIGEST_BYTES` digest of normalized block text, the key retransmissions are matched on."""
+
+    return hashlib.blake2b(clean.encode("utf-8"), digest_size=DIGEST_BYTES).digest()
+
+
+def format_raw_block(raw: bytes) -> str:
+    """Decode *raw* for display with every control token kept visible.
+
+    A line break is inserted after each line-break token so the raw view
+    reads line by line like the normalized text.
+    """
+
+    return RAW_BREAK_PATTERN.sub("\\1\n", raw.decode("utf-8", errors="replace"))
+
+
+def _join_clean_lines(text: str) -> str:
     lines = [line.rstrip() for line in text.splitlines()]
     normalized_lines: list[str] = []
     for line in lines:
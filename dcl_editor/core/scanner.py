@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import List
+
+from .tokenizer import END_BYTES, START_BYTES, find_block_spans
+
+
+MARKER_BYTES = len(START_BYTES)
+SCAN_CHUNK_BYTES = 32 * 1024 * 1024
+VECTOR_MIN_BYTES = 64 * 1024
+
+_LT, _GT, _T, _X = (ord(char) for char in "<>TX")
+_S, _E = START_BYTES[1], END_BYTES[1]
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    # Optional: numpy is only imported on the first large scan, never at startup.
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def vectorized_scanning_available() -> bool:
+    return _numpy() is not None
+
+
+def scan_block_spans(buffer, *, vectorized: bool | None = None) -> List[tuple[int, int]]:
+    """Return the same spans as :func:`find_block_spans` for any bytes-like *buffer*.
+
+    With numpy installed, large buffers (including ``mmap`` objects) are
+    scanned in fixed-size chunks with array comparisons instead of one
+    ``find`` call per marker, and the markers are paired with
+    ``searchsorted``. Without numpy, or for small buffers, the reference
+    implementation is used. *vectorized* forces either path.
+    """
+
+    if vectorized is None:
+        vectorized = len(buffer) >= VECTOR_MIN_BYTES and vectorized_scanning_available()
+    if not vectorized:
+        # bytes and mmap objects both provide ``find``.
+        return find_block_spans(buffer if hasattr(buffer, "find") else bytes(buffer))
+    if not vectorized_scanning_available():
+        raise RuntimeError("numpy is required for vectorized scanning")
+    starts, ends = marker_positions(buffer)
+    span_starts, span_ends = pair_markers(starts, ends)
+    return list(zip(span_starts.tolist(), span_ends.tolist()))
+
+
+def count_start_markers(buffer, chunk_bytes: int = SCAN_CHUNK_BYTES) -> int:
+    """Return how many <STX> markers *buffer* holds, counting an ``mmap`` chunk by chunk.
+
+    Chunks overlap by one marker length less one byte, so a marker split
+    across a boundary is counted exactly once.
+    """
+
+    if hasattr(buffer, "count"):
+        return buffer.count(START_BYTES)
+    return sum(
+        buffer[offset : offset + chunk_bytes + MARKER_BYTES - 1].count(START_BYTES)
+        for offset in range(0, len(buffer), chunk_bytes)
+    )
+
+
+def marker_positions(buffer, chunk_bytes: int = SCAN_CHUNK_BYTES):
+    """Return sorted ``int64`` arrays with the offsets of every <STX> and <ETX>.
+
+    The buffer is viewed with ``np.frombuffer`` without copying; only the
+    boolean masks of one chunk are allocated at a time.
+    """
+
+    np = _numpy()
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    size = len(data)
+    starts = []
+    ends = []
+    for offset in range(0, size, chunk_bytes):
+        chunk = data[offset : min(size, offset + chunk_bytes + MARKER_BYTES - 1)]
+        windows = len(chunk) - MARKER_BYTES + 1
+        if windows <= 0:
+            break
+        hits = chunk[:windows] == _LT
+        hits &= chunk[2 : windows + 2] == _T
+        hits &= chunk[3 : windows + 3] == _X
+        hits &= chunk[4 : windows + 4] == _GT
+        candidates = np.flatnonzero(hits)
+        kinds = chunk[candidates + 1]
+        starts.append(candidates[kinds == _S] + offset)
+        ends.append(candidates[kinds == _E] + offset)
+    if not starts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(starts).astype(np.int64), np.concatenate(ends).astype(np.int64)
+
+
+def pair_markers(starts, ends):
+    """Pair marker offsets into ``(span_starts, span_ends)`` arrays.
+
+    Each <STX> is matched with the first <ETX> after it. Consecutive <STX>
+    markers sharing that <ETX> belong to one block, so only the first opens a
+    span; markers with no <ETX> after them are dangling.
+    """
+
+    np = _numpy()
+    if not len(starts):
+        return starts, starts
+    match = np.searchsorted(ends, starts + MARKER_BYTES, side="left")
+    opens = np.empty(len(starts), dtype=bool)
+    opens[0] = True
+    np.not_equal(match[1:], match[:-1], out=opens[1:])
+    opens &= match < len(ends)
+    return starts[opens], ends[match[opens]] + MARKER_BYTES
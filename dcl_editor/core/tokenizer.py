@@ -5,6 +5,8 @@ from typing import Iterable, List
 
 START_TOKEN = "<STX>"
 END_TOKEN = "<ETX>"
+START_BYTES = START_TOKEN.encode("ascii")
+END_BYTES = END_TOKEN.encode("ascii")
 
 
 def _coerce_to_text(stream: Iterable[str] | str) -> str:
@@ -39,3 +41,75 @@ def tokenize_blocks(stream: Iterable[str] | str) -> List[str]:
         search_pos = end
 
     return blocks
+
+
+def count_dangling_starts(text: str | bytes, block_count: int) -> int:
+    """Return how many <STX> markers in *text* did not open one of *block_count* blocks."""
+
+    marker = START_BYTES if isinstance(text, bytes) else START_TOKEN
+    return text.count(marker) - block_count
+
+
+def find_block_spans(data: bytes) -> List[tuple[int, int]]:
+    """Return ``(start, end)`` byte offsets of the blocks :func:`tokenize_blocks` would return."""
+
+    spans: List[tuple[int, int]] = []
+    search_pos = 0
+    while True:
+        start = data.find(START_BYTES, search_pos)
+        if start == -1:
+            break
+        end = data.find(END_BYTES, start + len(START_BYTES))
+        if end == -1:
+            break
+        end += len(END_BYTES)
+        spans.append((start, end))
+        search_pos = end
+    return spans
+
+
+class IncrementalTokenizer:
+    """Reassemble <STX> .. <ETX> frames from a byte stream delivered in chunks.
+
+    Feeding the chunks of a file yields the same spans as
+    :func:`find_block_spans` on the whole file. Offsets count bytes from the
+    start of the stream. A pending frame longer than *max_frame_bytes* is
+    dropped and scanning resumes after its <STX>.
+    """
+
+    def __init__(self, max_frame_bytes: int | None = None) -> None:
+        self.max_frame_bytes = max_frame_bytes
+        self.dropped_frames = 0
+        self._buffer = bytearray()
+        self._base = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, chunk: bytes) -> List[tuple[int, int, bytes]]:
+        """Append *chunk* and return ``(start, end, raw)`` for every completed frame."""
+
+        self._buffer += chunk
+        frames: List[tuple[int, int, bytes]] = []
+        buffer = self._buffer
+        search_pos = 0
+        while True:
+            start = buffer.find(START_BYTES, search_pos)
+            if start == -1:
+                search_pos = max(search_pos, len(buffer) - len(START_BYTES) + 1)
+                break
+            end = buffer.find(END_BYTES, start + len(START_BYTES))
+            if end == -1:
+                if self.max_frame_bytes is not None and len(buffer) - start > self.max_frame_bytes:
+                    self.dropped_frames += 1
+                    search_pos = start + len(START_BYTES)
+                    continue
+                search_pos = start
+                break
+            end += len(END_BYTES)
+            frames.append((self._base + start, self._base + end, bytes(buffer[start:end])))
+            search_pos = end
+        del buffer[:search_pos]
+        self._base += search_pos
+        return frames
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from ..core.models import BlockTextReader, DclBlock, DclType, stored_text
+from .query import CallsignPredicate, Query, TypePredicate, parse_query
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Subscription:
+    """A standing query registered with an :class:`AlertDispatcher`."""
+
+    id: int
+    name: str
+    text: str
+    query: Query
+    log: bool = False
+
+
+@dataclass(slots=True)
+class AlertMatch:
+    subscription: Subscription
+    block: DclBlock
+
+    def describe(self) -> str:
+        block = self.block
+        return f"[{self.subscription.name}] {block.ts or '------'} {block.type} {block.callsign or '-'} {block.summary}"
+
+
+class AlertDispatcher:
+    """Match incoming blocks against many standing queries at once.
+
+    Each subscription is filed under one anchor predicate: an exact callsign,
+    a callsign prefix (bucketed by prefix length) or its message types.
+    A block therefore only reaches the subscriptions filed under its callsign,
+    its callsign prefixes and its type, plus those without any anchor, and
+    only those are checked in full. The cost per block depends on the number
+    of distinct prefix lengths, not on the number of subscriptions.
+    ``text:`` terms read block text through *read_text*.
+    """
+
+    def __init__(self, read_text: BlockTextReader = stored_text) -> None:
+        self.read_text = read_text
+        self.subscriptions: Dict[int, Subscription] = {}
+        self._next_id = 1
+        self._by_callsign: Dict[str, List[Subscription]] = defaultdict(list)
+        self._by_prefix: Dict[int, Dict[str, List[Subscription]]] = defaultdict(lambda: defaultdict(list))
+        self._by_type: Dict[DclType, List[Subscription]] = defaultdict(list)
+        self._unanchored: List[Subscription] = []
+
+    def subscribe(self, text: str, name: str | None = None, *, log: bool = False) -> Subscription:
+        """Register the query *text*; raises :class:`QuerySyntaxError` if it is invalid."""
+
+        query = parse_query(text)
+        subscription = Subscription(self._next_id, name or text, text, query, log)
+        self._next_id += 1
+        self.subscriptions[subscription.id] = subscription
+        self._file(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription_id: int) -> None:
+        if self.subscriptions.pop(subscription_id, None) is None:
+            return
+        self._rebuild()
+
+    def dispatch(self, block: DclBlock) -> List[AlertMatch]:
+        """Return the subscriptions *block* satisfies."""
+
+        candidates: List[Subscription] = list(self._unanchored)
+        candidates.extend(self._by_type.get(block.type, ()))
+        if block.callsign:
+            callsign = block.callsign.upper()
+            candidates.extend(self._by_callsign.get(callsign, ()))
+            for length, buckets in self._by_prefix.items():
+                if length <= len(callsign):
+                    candidates.extend(buckets.get(callsign[:length], ()))
+        matches = [
+            AlertMatch(subscription, block)
+            for subscription in candidates
+            if subscription.query.matches(block, self.read_text)
+        ]
+        for match in matches:
+            if match.subscription.log:
+                logger.info("alert %s", match.describe())
+        return matches
+
+    def dispatch_many(self, blocks: Iterable[DclBlock]) -> List[AlertMatch]:
+        matches: List[AlertMatch] = []
+        for block in blocks:
+            matches.extend(self.dispatch(block))
+        return matches
+
+    def _file(self, subscription: Subscription) -> None:
+        predicates = subscription.query.predicates
+        callsigns = [predicate for predicate in predicates if isinstance(predicate, CallsignPredicate)]
+        exact = next((predicate for predicate in callsigns if predicate.exact), None)
+        if exact is not None:
+            self._by_callsign[exact.value].append(subscription)
+            return
+        prefixes = [predicate for predicate in callsigns if predicate.prefix]
+        if prefixes:
+            prefix = max(prefixes, key=lambda predicate: len(predicate.value)).value
+            self._by_prefix[len(prefix)][prefix].append(subscription)
+            return
+        types = next((predicate for predicate in predicates if isinstance(predicate, TypePredicate)), None)
+        if types is not None:
+            for block_type in types.types:
+                self._by_type[block_type].append(subscription)
+            return
+        self._unanchored.append(subscription)
+
+    def _rebuild(self) -> None:
+        self._by_callsign.clear()
+        self._by_prefix.clear()
+        self._by_type.clear()
+        self._unanchored.clear()
+        for subscription in self.subscriptions.values():
+            self._file(subscription)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import difflib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from ..core.extractor import minutes_to_timestamp, timestamp_minutes
+from ..core.models import BlockTextReader, DclBlock, stored_text
+from .indexer import DclIndexer
+from .loader import STREAM_CHUNK_BYTES, iter_log_blocks, parse_block
+
+
+COMPARE_KINDS = ("missing", "extra", "changed")
+
+CompareKey = tuple[Optional[str], str, Optional[int], int]
+
+
+@dataclass(slots=True)
+class BlockDifference:
+    """One message that is present on one side only or differs between sides."""
+
+    kind: str
+    key: CompareKey
+    left: DclBlock | None
+    right: DclBlock | None
+    diff: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        callsign, block_type, minute, occurrence = self.key
+        ts = minutes_to_timestamp(minute) if minute is not None else "------"
+        suffix = f" #{occurrence + 1}" if occurrence else ""
+        return f"{self.kind:<7} {ts}  {block_type:<7} {callsign or '-'}{suffix}"
+
+
+class LogComparer:
+    """Align the blocks of two logs with a hash join and report the differences.
+
+    Blocks are keyed by callsign, type and timestamp, plus an occurrence number
+    for keys that repeat. The *left* log is streamed once into a table of keys,
+    body hashes and offsets; the *right* log is then streamed against it, so
+    neither log is held in memory. ``missing`` blocks exist only on the left,
+    ``extra`` blocks only on the right. *shift_minutes* is added to right-hand
+    timestamps when comparing two periods.
+    """
+
+    def __init__(
+        self,
+        left: str | Path,
+        right: str | Path,
+        *,
+        shift_minutes: int = 0,
+        chunk_bytes: int = STREAM_CHUNK_BYTES,
+    ) -> None:
+        self.left = Path(left)
+        self.right = Path(right)
+        self.shift_minutes = shift_minutes
+        self.chunk_bytes = chunk_bytes
+        self.matched = 0
+        self.counts: Counter[str] = Counter()
+
+    def differences(self) -> Iterator[BlockDifference]:
+        self.matched = 0
+        self.counts.clear()
+        table: Dict[CompareKey, tuple[int, int, int]] = {}
+        occurrences: Counter = Counter()
+        for block in iter_log_blocks(self.left, self.chunk_bytes, keep_text=True):
+            key = self._key(block, occurrences, 0)
+            table[key] = (hash(block.full_block_text), block.start_offset, block.end_offset)
+
+        occurrences.clear()
+        with self.left.open("rb") as left_handle:
+            for block in iter_log_blocks(self.right, self.chunk_bytes, keep_text=True):
+                key = self._key(block, occurrences, self.shift_minutes)
+                entry = table.pop(key, None)
+                if entry is None:
+                    yield self._record(BlockDifference("extra", key, None, block))
+                    continue
+                digest, start, end = entry
+                if digest == hash(block.full_block_text):
+                    self.matched += 1
+                    continue
+                original = self._read_block(left_handle, start, end)
+                yield self._record(
+                    BlockDifference("changed", key, original, block, body_diff(original, block))
+                )
+            for key, (_, start, end) in table.items():
+                yield self._record(BlockDifference("missing", key, self._read_block(left_handle, start, end), None))
+
+    def _key(self, block: DclBlock, occurrences: Counter, shift: int) -> CompareKey:
+        minute = timestamp_minutes(block.ts)
+        if minute is not None:
+            minute += shift
+        base = (DclIndexer.callsign_key(block), block.type, minute)
+        occurrence = occurrences[base]
+        occurrences[base] = occurrence + 1
+        return (*base, occurrence)
+
+    def _record(self, difference: BlockDifference) -> BlockDifference:
+        self.counts[difference.kind] += 1
+        return difference
+
+    @staticmethod
+    def _read_block(handle, start: int, end: int) -> DclBlock:
+        handle.seek(start)
+        return parse_block(handle.read(end - start), start, end, keep_text=True)
+
+
+def body_diff(left: DclBlock, right: DclBlock, read_text: BlockTextReader = stored_text) -> List[str]:
+    """Return a unified diff of the normalized bodies of two blocks, fetched through *read_text*."""
+
+    return list(
+        difflib.unified_diff(
+            read_text(left).split("\n"),
+            read_text(right).split("\n"),
+            fromfile="left",
+            tofile="right",
+            lineterm="",
+            n=1,
+        )
+    )
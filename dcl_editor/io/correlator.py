@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..core.extractor import elapsed_minutes, timestamp_minutes
+from ..core.models import DclBlock, DclType
+
+
+EXCHANGE_SEQUENCE: tuple[DclType, ...] = ("RCD", "CLD", "CDA", "FSM")
+REQUIRED_STAGES: tuple[DclType, ...] = ("RCD", "CLD", "CDA")
+_STAGE_ORDER = {stage: position for position, stage in enumerate(EXCHANGE_SEQUENCE)}
+
+
+@dataclass(slots=True)
+class Exchange:
+    """One RCD → CLD → CDA → FSM dialogue of a single flight."""
+
+    callsign: str
+    blocks: List[DclBlock] = field(default_factory=list)
+    stages: Dict[DclType, DclBlock] = field(default_factory=dict)
+    minutes: Dict[DclType, int] = field(default_factory=dict)
+    first_minute: Optional[int] = None
+    last_minute: Optional[int] = None
+
+    @property
+    def last_stage(self) -> int:
+        return max((_STAGE_ORDER[stage] for stage in self.stages), default=-1)
+
+    @property
+    def is_complete(self) -> bool:
+        return all(stage in self.stages for stage in REQUIRED_STAGES)
+
+    @property
+    def missing_stages(self) -> List[DclType]:
+        return [stage for stage in REQUIRED_STAGES if stage not in self.stages]
+
+    def latency(self, from_stage: DclType, to_stage: DclType) -> Optional[int]:
+        """Return minutes between the first *from_stage* and *to_stage* blocks.
+
+        A step across a month boundary is counted forward; ``None`` is returned
+        when either stage has no timestamp or *to_stage* comes before *from_stage*.
+        """
+
+        start = self.minutes.get(from_stage)
+        end = self.minutes.get(to_stage)
+        if start is None or end is None:
+            return None
+        return elapsed_minutes(start, end)
+
+
+class ExchangeCorrelator:
+    """Group blocks into per-flight exchanges in a single incremental pass."""
+
+    def __init__(self, window_minutes: int = 30, timeout_minutes: int | None = None) -> None:
+        self.window_minutes = window_minutes
+        self.timeout_minutes = timeout_minutes if timeout_minutes is not None else window_minutes
+        self.flights: Dict[str, List[Exchange]] = {}
+        self.latencies: Dict[tuple[DclType, DclType], Counter[int]] = {
+            (earlier, later): Counter()
+            for position, later in enumerate(EXCHANGE_SEQUENCE)
+            for earlier in EXCHANGE_SEQUENCE[:position]
+        }
+        self.unmatched = 0
+        self.latest_minute: Optional[int] = None
+
+    def rebuild(self, blocks: Sequence[DclBlock]) -> None:
+        self.flights.clear()
+        for counter in self.latencies.values():
+            counter.clear()
+        self.unmatched = 0
+        self.latest_minute = None
+        self.extend(blocks)
+
+    def extend(self, blocks: Iterable[DclBlock]) -> None:
+        for block in blocks:
+            self.add(block)
+
+    def add(self, block: DclBlock) -> Exchange | None:
+        stage = block.type
+        if not block.callsign or stage not in _STAGE_ORDER:
+            self.unmatched += 1
+            return None
+
+        key = block.callsign.upper()
+        minute = timestamp_minutes(block.ts)
+        if minute is not None and (self.latest_minute is None or minute > self.latest_minute):
+            self.latest_minute = minute
+
+        history = self.flights.setdefault(key, [])
+        exchange = history[-1] if history else None
+        if exchange is None or self._starts_new_exchange(exchange, stage, minute):
+            exchange = Exchange(callsign=key)
+            history.append(exchange)
+
+        exchange.blocks.append(block)
+        if minute is not None:
+            if exchange.first_minute is None:
+                exchange.first_minute = minute
+            exchange.last_minute = minute
+        if stage not in exchange.stages:
+            exchange.stages[stage] = block
+            if minute is not None:
+                exchange.minutes[stage] = minute
+                self._record_latency(exchange, stage)
+        return exchange
+
+    def _starts_new_exchange(self, exchange: Exchange, stage: DclType, minute: Optional[int]) -> bool:
+        if _STAGE_ORDER[stage] < exchange.last_stage:
+            return True
+        if minute is not None and exchange.last_minute is not None:
+            gap = elapsed_minutes(exchange.last_minute, minute)
+            return gap is not None and gap > self.window_minutes
+        return False
+
+    def _record_latency(self, exchange: Exchange, stage: DclType) -> None:
+        """Record the latency from every earlier stage already seen, e.g. RCD→CDA as well as CLD→CDA."""
+
+        for earlier in EXCHANGE_SEQUENCE[: _STAGE_ORDER[stage]]:
+            latency = exchange.latency(earlier, stage)
+            if latency is not None:
+                self.latencies[(earlier, stage)][latency] += 1
+
+    def forget(self, blocks: Iterable[DclBlock]) -> None:
+        """Drop exchanges whose blocks have all been evicted.
+
+        Blocks are evicted oldest first, so an exchange is gone once its last
+        block is among *blocks*. Latency distributions are left untouched.
+        """
+
+        gone = {id(block) for block in blocks}
+        for key in {block.callsign.upper() for block in blocks if block.callsign}:
+            history = self.flights.get(key)
+            if history is None:
+                continue
+            expired = 0
+            while expired < len(history) and id(history[expired].blocks[-1]) in gone:
+                expired += 1
+            if expired == len(history):
+                del self.flights[key]
+            elif expired:
+                del history[:expired]
+
+    # Queries -----------------------------------------------------------
+    def exchanges_for(self, callsign: str) -> List[Exchange]:
+        return self.flights.get(callsign.upper(), [])
+
+    def latency_distribution(self, from_stage: DclType = "RCD", to_stage: DclType = "CLD") -> Dict[int, int]:
+        """Return ``{minutes: exchanges}`` from *from_stage* to any later stage *to_stage*."""
+
+        counter = self.latencies.get((from_stage, to_stage))
+        if counter is None:
+            raise ValueError(f"No latency is recorded from {from_stage} to {to_stage}")
+        return dict(sorted(counter.items()))
+
+    def incomplete(self) -> List[Exchange]:
+        return [
+            exchange
+            for history in self.flights.values()
+            for exchange in history
+            if not exchange.is_complete
+        ]
+
+    def timed_out(self, now_minute: int | None = None) -> List[Exchange]:
+        """Return incomplete exchanges idle for longer than the timeout."""
+
+        now = now_minute if now_minute is not None else self.latest_minute
+        if now is None:
+            return []
+        return [
+            exchange
+            for exchange in self.incomplete()
+            if exchange.last_minute is not None and now - exchange.last_minute > self.timeout_minutes
+        ]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from ..core.extractor import timestamp_minutes
+from ..core.models import BlockTextReader, DclAnomaly, DclBlock, stored_text
+from ..core.normalizer import text_digest
+
+
+class BlockDeduplicator:
+    """Collapse retransmitted copies of a block into one logical row.
+
+    A block whose normalized text equals one seen within *window_minutes* of
+    log time is folded into the first copy, which counts the repeat and keeps
+    the start offsets of the duplicates. The duplicate itself is pointed at the
+    original's strings so that raw copies kept for display share memory, and
+    is flagged :attr:`DclAnomaly.DUPLICATE`.
+    Blocks that are not enriched yet are always kept since their text is
+    unknown. Blocks are keyed on the ``digest`` taken while parsing; only
+    blocks without one have their text fetched through *read_text*.
+    """
+
+    def __init__(self, window_minutes: int = 10, read_text: BlockTextReader = stored_text) -> None:
+        self.window_minutes = window_minutes
+        self.read_text = read_text
+        self.collapsed = 0
+        self._seen: Dict[bytes, tuple[DclBlock, Optional[int]]] = {}
+        self._stream_minute: Optional[int] = None
+
+    def add(self, block: DclBlock) -> bool:
+        """Return ``True`` if *block* starts a new logical row."""
+
+        self._advance(block)
+        if not block.enriched:
+            return True
+
+        key = self._key(block)
+        previous = self._seen.get(key)
+        if previous is not None:
+            original, seen_at = previous
+            if seen_at is None or self._stream_minute - seen_at <= self.window_minutes:
+                original.repeat_count += 1
+                if original.duplicate_offsets is None:
+                    original.duplicate_offsets = []
+                original.duplicate_offsets.append(block.start_offset)
+                self._share_text(original, block)
+                # The block may have started a row in an earlier pass, e.g. over one file of several.
+                block.repeat_count = 1
+                block.duplicate_offsets = None
+                block.anomalies |= DclAnomaly.DUPLICATE
+                self.collapsed += 1
+                return False
+
+        block.repeat_count = 1
+        block.duplicate_offsets = None
+        block.anomalies &= ~DclAnomaly.DUPLICATE
+        self._seen[key] = (block, self._stream_minute)
+        return True
+
+    @staticmethod
+    def _share_text(original: DclBlock, duplicate: DclBlock) -> None:
+        duplicate.full_block_text = original.full_block_text
+        duplicate.summary = original.summary
+        duplicate.preview_text = original.preview_text
+        duplicate.metadata_json = original.metadata_json
+
+    def remember(self, blocks: Iterable[DclBlock]) -> None:
+        """Compare later blocks against *blocks*, which were deduplicated already, without changing them."""
+
+        for block in blocks:
+            self._advance(block)
+            if block.enriched and not block.anomalies & DclAnomaly.DUPLICATE:
+                self._seen[self._key(block)] = (block, self._stream_minute)
+
+    def _advance(self, block: DclBlock) -> None:
+        minute = timestamp_minutes(block.ts)
+        if minute is not None and (self._stream_minute is None or minute > self._stream_minute):
+            self._stream_minute = minute
+
+    def forget(self, blocks: Iterable[DclBlock]) -> None:
+        """Stop comparing against *blocks*, typically rows evicted from a session."""
+
+        for block in blocks:
+            if not block.enriched:
+                continue
+            key = self._key(block)
+            previous = self._seen.get(key)
+            if previous is not None and previous[0] is block:
+                del self._seen[key]
+
+    def _key(self, block: DclBlock) -> bytes:
+        return block.digest if block.digest is not None else text_digest(self.read_text(block))
+
+    def extend(self, blocks: Iterable[DclBlock]) -> List[DclBlock]:
+        """Feed *blocks* in log order and return those that start new rows."""
+
+        return [block for block in blocks if self.add(block)]
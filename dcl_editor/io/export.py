@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from pathlib import Path
+from typing import Callable, Sequence
+
+from ..core.models import BlockTextReader, DclBlock, stored_text
+from .extract import ExtractCancelled, extract_sublog
+
+
+EXPORT_FORMATS = ("csv", "jsonl", "raw")
+CSV_COLUMNS = ("ts", "type", "callsign", "summary", "start_offset", "end_offset")
+PROGRESS_EVERY = 1000
+
+
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled; the partial file has been removed."""
+
+
+def block_record(block: DclBlock, read_text: BlockTextReader = stored_text) -> dict:
+    """Return the JSON representation of *block* shared by exports and the HTTP service.
+
+    The normalized lines are fetched through *read_text* for this record only.
+    """
+
+    text = read_text(block)
+    return {
+        "ts": block.ts,
+        "type": block.type,
+        "callsign": block.callsign,
+        "summary": block.summary,
+        "start_offset": block.start_offset,
+        "end_offset": block.end_offset,
+        "lines": text.split("\n") if text else [],
+    }
+
+
+def export_blocks(
+    blocks: Sequence[DclBlock],
+    destination: str | Path,
+    fmt: str,
+    *,
+    source: str | Path | None = None,
+    context: Sequence[DclBlock] | None = None,
+    read_text: BlockTextReader = stored_text,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """Stream *blocks* to *destination* one row at a time and return the row count.
+
+    ``csv`` and ``jsonl`` write the parsed fields; ``raw`` extracts a sub-log
+    of the original bytes from each block's source file, *source* for blocks
+    without one (see :func:`extract_sublog`, which *context* is passed to). Rows are formatted as they are written and
+    the file only appears under its final name once complete; ``jsonl`` reads
+    each block's text through *read_text* as its row is written.
+    """
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt!r}")
+
+    total = len(blocks)
+    if fmt == "raw":
+        try:
+            extract_sublog(source, blocks, destination, context=context, progress=progress, cancelled=cancelled)
+        except ExtractCancelled as exc:
+            raise ExportCancelled() from exc
+        return total
+
+    destination = Path(destination)
+    partial = destination.with_name(destination.name + ".part")
+    try:
+        with partial.open("w", encoding="utf-8", newline="") as writer:
+            if fmt == "csv":
+                rows = csv.writer(writer)
+                rows.writerow(CSV_COLUMNS)
+                for position in range(total):
+                    block = blocks[position]
+                    rows.writerow(
+                        (
+                            block.ts or "",
+                            block.type,
+                            block.callsign or "",
+                            block.summary,
+                            block.start_offset,
+                            block.end_offset,
+                        )
+                    )
+                    _report(position, total, progress, cancelled)
+            else:
+                for position in range(total):
+                    block = blocks[position]
+                    json.dump(block_record(block, read_text), writer, ensure_ascii=False)
+                    writer.write("\n")
+                    _report(position, total, progress, cancelled)
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    if progress:
+        progress(total, total)
+    return total
+
+
+def _report(
+    position: int,
+    total: int,
+    progress: Callable[[int, int], None] | None,
+    cancelled: Callable[[], bool] | None,
+) -> None:
+    if (position + 1) % PROGRESS_EVERY:
+        return
+    if cancelled and cancelled():
+        raise ExportCancelled()
+    if progress:
+        progress(position + 1, total)
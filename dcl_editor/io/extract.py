@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Sequence
+
+from ..core.models import DclBlock
+
+
+INDEX_SUFFIX = ".dclidx"
+INDEX_VERSION = 2
+
+
+class ExtractCancelled(Exception):
+    """Raised when an extraction is cancelled; partial files have been removed."""
+
+
+@dataclass(slots=True)
+class ExtractResult:
+    ranges: int
+    blocks: int
+    bytes_written: int
+    index_path: Path | None
+
+
+def index_path_for(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def coalesce_ranges(
+    blocks: Sequence[DclBlock],
+    context: Sequence[DclBlock] | None = None,
+) -> List[tuple[int, int]]:
+    """Merge the byte ranges of *blocks* into as few contiguous ranges as possible.
+
+    Touching or overlapping ranges are always merged. When *context* (every
+    block of the source log) is given, two selected blocks are also merged if
+    no other block starts between them, so the log lines around them are kept.
+    """
+
+    spans = sorted((block.start_offset, block.end_offset) for block in blocks)
+    starts = sorted(block.start_offset for block in context) if context is not None else None
+    ranges: List[tuple[int, int]] = []
+    for start, end in spans:
+        if ranges:
+            previous_start, previous_end = ranges[-1]
+            touching = start <= previous_end
+            if not touching and starts is not None:
+                touching = bisect_right(starts, previous_end - 1) == bisect_right(starts, start - 1)
+            if touching:
+                ranges[-1] = (previous_start, max(previous_end, end))
+                continue
+        ranges.append((start, end))
+    return ranges
+
+
+def copy_ranges(
+    source: str | Path,
+    ranges: Sequence[tuple[int, int]],
+    destination: str | Path,
+    *,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """Concatenate byte *ranges* of *source* into *destination* without decoding.
+
+    The kernel copies the data where possible (``os.copy_file_range`` or
+    ``os.sendfile``); otherwise slices of a read-only mmap are written.
+    """
+
+    return copy_source_ranges([(source, ranges)], destination, progress=progress, cancelled=cancelled)
+
+
+def copy_source_ranges(
+    groups: Sequence[tuple[str | Path, Sequence[tuple[int, int]]]],
+    destination: str | Path,
+    *,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """Like :func:`copy_ranges` for ``(source, ranges)`` *groups*, written one source after another."""
+
+    total = sum(len(ranges) for _, ranges in groups)
+    written = 0
+    number = 0
+    with open(destination, "wb") as writer:
+        for source, ranges in groups:
+            with open(source, "rb") as reader:
+                copier = _KernelCopier(reader.fileno(), writer.fileno())
+                try:
+                    for start, end in ranges:
+                        if cancelled and cancelled():
+                            raise ExtractCancelled()
+                        written += copier.copy(start, end - start, writer)
+                        number += 1
+                        if progress:
+                            progress(number, total)
+                finally:
+                    copier.close()
+    return written
+
+
+class _KernelCopier:
+    def __init__(self, source_fd: int, destination_fd: int) -> None:
+        self._source_fd = source_fd
+        self._destination_fd = destination_fd
+        self._strategy = "copy_file_range" if hasattr(os, "copy_file_range") else "sendfile"
+        self._map: mmap.mmap | None = None
+
+    def copy(self, offset: int, length: int, writer) -> int:
+        done = 0
+        if self._strategy != "mmap":
+            try:
+                for copied in self._copy_in_kernel(offset, length):
+                    done += copied
+                return done
+            except (AttributeError, OSError):
+                # Unsupported on this platform or file system; mmap slices finish the range from where it stopped.
+                self._strategy = "mmap"
+                os.lseek(self._destination_fd, 0, os.SEEK_END)
+        if self._map is None:
+            self._map = mmap.mmap(self._source_fd, 0, access=mmap.ACCESS_READ)
+        with memoryview(self._map) as view:
+            writer.write(view[offset + done : offset + length])
+        writer.flush()
+        return length
+
+    def _copy_in_kernel(self, offset: int, length: int) -> Iterator[int]:
+        """Copy in kernel calls, yielding the bytes each one moved, so a failure leaves a known position."""
+
+        copied_total = 0
+        while copied_total < length:
+            remaining = length - copied_total
+            if self._strategy == "copy_file_range":
+                copied = os.copy_file_range(self._source_fd, self._destination_fd, remaining, offset + copied_total)
+            else:
+                copied = os.sendfile(self._destination_fd, self._source_fd, offset + copied_total, remaining)
+            if copied == 0:
+                break
+            copied_total += copied
+            yield copied
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def extract_sublog(
+    source: str | Path | None,
+    blocks: Sequence[DclBlock],
+    destination: str | Path,
+    *,
+    context: Sequence[DclBlock] | None = None,
+    write_index: bool = True,
+    progress: Callable[[int, int], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> ExtractResult:
+    """Copy the original bytes of *blocks* into a standalone sub-log.
+
+    Offsets are read from each block's own ``source`` file, or from *source*
+    for blocks without one, so a selection mixing a log with live spool
+    segments copies every block from the file it came from; sources are
+    written in the order they first appear in *blocks*. A companion
+    ``.dclidx`` file records where each block landed together with its cheap
+    keys, so :meth:`LogLoader.scan` can reopen the sub-log without tokenizing it.
+    """
+
+    destination = Path(destination)
+    partial = destination.with_name(destination.name + ".part")
+    groups = _group_by_source(blocks, source)
+    contexts = _group_by_source(context, source, strict=False) if context is not None else {}
+    ranges = {path: coalesce_ranges(selected, contexts.get(path)) for path, selected in groups.items()}
+    try:
+        written = copy_source_ranges(list(ranges.items()), partial, progress=progress, cancelled=cancelled)
+        os.replace(partial, destination)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    index_path = None
+    if write_index:
+        index_path = index_path_for(destination)
+        relocated = _relocate([(groups[path], ranges[path]) for path in groups])
+        write_block_index(index_path, relocated, destination.stat())
+    count = sum(len(spans) for spans in ranges.values())
+    return ExtractResult(ranges=count, blocks=len(blocks), bytes_written=written, index_path=index_path)
+
+
+def _group_by_source(
+    blocks: Sequence[DclBlock], source: str | Path | None, strict: bool = True
+) -> Dict[str, List[DclBlock]]:
+    groups: Dict[str, List[DclBlock]] = {}
+    for block in blocks:
+        path = block.source or source
+        if path is None:
+            if strict:
+                raise ValueError("A source log is required for blocks that do not name their file")
+            continue
+        groups.setdefault(str(path), []).append(block)
+    return groups
+
+
+def _relocate(
+    groups: Sequence[tuple[Sequence[DclBlock], Sequence[tuple[int, int]]]],
+) -> List[tuple[int, int, DclBlock]]:
+    relocated = []
+    position = 0
+    for blocks, ranges in groups:
+        range_starts = [start for start, _ in ranges]
+        destination_starts: List[int] = []
+        for start, end in ranges:
+            destination_starts.append(position)
+            position += end - start
+        for block in sorted(blocks, key=lambda item: item.start_offset):
+            slot = bisect_right(range_starts, block.start_offset) - 1
+            new_start = destination_starts[slot] + block.start_offset - range_starts[slot]
+            relocated.append((new_start, new_start + block.end_offset - block.start_offset, block))
+    return relocated
+
+
+def write_block_index(path: Path, entries: Sequence[tuple[int, int, DclBlock]], stat: os.stat_result) -> None:
+    """Write the index of a sub-log whose file had *stat*; its size and mtime mark the index stale later."""
+
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(
+            {
+                "version": INDEX_VERSION,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "blocks": [[start, end, block.ts, block.type, block.callsign] for start, end, block in entries],
+            },
+            handle,
+        )
+
+
+def read_block_index(path: str | Path) -> List[DclBlock] | None:
+    """Return unenriched blocks from the companion index of *path*, if it is valid."""
+
+    path = Path(path)
+    index_path = index_path_for(path)
+    try:
+        with index_path.open(encoding="utf-8") as handle:
+            payload = json.load(handle)
+        stat = path.stat()
+    except (OSError, ValueError):
+        return None
+    if (
+        payload.get("version") != INDEX_VERSION
+        or payload.get("size") != stat.st_size
+        or payload.get("mtime_ns") != stat.st_mtime_ns
+    ):
+        return None
+    return [
+        DclBlock(
+            start_offset=start,
+            end_offset=end,
+            ts=ts,
+            type=block_type,
+            callsign=callsign,
+            summary="",
+            preview_text="",
+            full_block_text="",
+            enriched=False,
+        )
+        for start, end, ts, block_type, callsign in payload.get("blocks", [])
+    ]
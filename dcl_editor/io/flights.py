@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..core.models import DclBlock, DclType
+
+
+FLIGHT_TYPE_ORDER: tuple[DclType, ...] = ("RCD", "CLD", "CDA", "FSM", "UNKNOWN")
+NO_CALLSIGN = ""
+
+
+@dataclass(slots=True)
+class FlightSummary:
+    """Aggregate of every block filed under one callsign, oldest block first."""
+
+    callsign: str
+    serial: int
+    blocks: List[DclBlock] = field(default_factory=list)
+    type_counts: Counter[DclType] = field(default_factory=Counter)
+    first_ts: Optional[str] = None
+    last_ts: Optional[str] = None
+
+    @property
+    def last_status(self) -> DclType | None:
+        """Type of the most recent block, i.e. how far the clearance dialogue got."""
+
+        return self.blocks[-1].type if self.blocks else None
+
+    def describe_counts(self) -> str:
+        counts = self.type_counts
+        parts = [f"{block_type} {counts[block_type]}" for block_type in FLIGHT_TYPE_ORDER if counts[block_type]]
+        noun = "message" if len(self.blocks) == 1 else "messages"
+        return f"{len(self.blocks)} {noun} — " + ", ".join(parts)
+
+
+class FlightGroups:
+    """Group-by index of blocks per callsign, built in one pass and updated incrementally.
+
+    Flights keep their first-seen order. Each flight holds references to its
+    blocks in log order, so appending is O(1) per block and evicting the oldest
+    blocks only trims the front of the affected flights.
+    """
+
+    def __init__(self) -> None:
+        self.flights: Dict[str, FlightSummary] = {}
+        self._serials = count(1)
+
+    def __len__(self) -> int:
+        return len(self.flights)
+
+    @staticmethod
+    def key(block: DclBlock) -> str:
+        return block.callsign.upper() if block.callsign else NO_CALLSIGN
+
+    def rebuild(self, blocks: Iterable[DclBlock]) -> None:
+        self.flights.clear()
+        self.extend(blocks)
+
+    def extend(self, blocks: Iterable[DclBlock]) -> None:
+        for block in blocks:
+            self.add(block)
+
+    def add(self, block: DclBlock) -> FlightSummary:
+        """File *block* under its flight and return the (possibly new) flight."""
+
+        key = self.key(block)
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = self.flights[key] = FlightSummary(key, next(self._serials))
+        flight.blocks.append(block)
+        flight.type_counts[block.type] += 1
+        if block.ts:
+            if flight.first_ts is None:
+                flight.first_ts = block.ts
+            flight.last_ts = block.ts
+        return flight
+
+    def evict(self, blocks: Sequence[DclBlock]) -> List[tuple[FlightSummary, int]]:
+        """Drop *blocks*, the oldest ones indexed, and return ``(flight, removed)`` pairs.
+
+        Flights left without blocks are removed from :attr:`flights`.
+        """
+
+        removed: Counter[str] = Counter(self.key(block) for block in blocks)
+        changes: List[tuple[FlightSummary, int]] = []
+        for key, number in removed.items():
+            flight = self.flights.get(key)
+            if flight is None:
+                continue
+            number = min(number, len(flight.blocks))
+            for block in flight.blocks[:number]:
+                flight.type_counts[block.type] -= 1
+            del flight.blocks[:number]
+            flight.type_counts = +flight.type_counts
+            if not flight.blocks:
+                del self.flights[key]
+            else:
+                flight.first_ts = next((block.ts for block in flight.blocks if block.ts), None)
+                if flight.first_ts is None:
+                    flight.last_ts = None
+            changes.append((flight, number))
+        return changes
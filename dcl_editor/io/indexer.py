@@ -1,29 +1,236 @@
 from __future__ import annotations
 
+import heapq
+import re
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
 from typing import Dict, Iterable, List, Sequence
 
-from ..core.models import DclBlock, DclType
+from ..core.extractor import timestamp_minutes
+from ..core.models import ANY_ANOMALY, DclAnomaly, DclBlock, DclType
+from .ngram import MAX_TYPOS, CallsignNgramIndex
+
+
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
 
 
 class DclIndexer:
-    """Maintain indices to filter DCL blocks efficiently."""
+    """Maintain indices to filter DCL blocks efficiently.
+
+    Anomaly flags are kept as one bitmap per flag, a Python ``int`` whose bit
+    *i* is set when block *i* has the flag; combining flags is a bitwise OR
+    and evicting blocks is a right shift.
+    """
 
     def __init__(self) -> None:
         self.blocks: List[DclBlock] = []
         self.callsign_index: Dict[str, List[int]] = defaultdict(list)
         self.type_index: Dict[DclType, List[int]] = defaultdict(list)
+        self.time_keys: List[int] = []
+        self.time_positions: List[int] = []
+        self._sorted_callsigns: List[str] | None = None
+        self.callsign_ngrams = CallsignNgramIndex()
+        self.anomaly_bitmaps: Dict[DclAnomaly, int] = {}
 
     def rebuild(self, blocks: Sequence[DclBlock]) -> None:
         self.blocks = list(blocks)
         self.callsign_index.clear()
         self.type_index.clear()
+        self._sorted_callsigns = None
+        self.callsign_ngrams.clear()
+        timed: List[tuple[int, int]] = []
         for idx, block in enumerate(self.blocks):
-            if block.callsign:
-                self.callsign_index[block.callsign.upper()].append(idx)
-            self.type_index[block.type].append(idx)
+            self._index_block(idx, block)
+            minute = timestamp_minutes(block.ts)
+            if minute is not None:
+                timed.append((minute, idx))
+        timed.sort()
+        self.time_keys = [minute for minute, _ in timed]
+        self.time_positions = [idx for _, idx in timed]
+        self.anomaly_bitmaps = anomaly_bitmaps(self.blocks)
+
+    def merge(self, indexers: Sequence["DclIndexer"]) -> None:
+        """Replace the contents with the concatenation of *indexers*.
+
+        Positions from each indexer are shifted by the number of blocks before
+        it; the blocks themselves are shared, not copied, and no timestamp is
+        parsed again. The result equals :meth:`rebuild` on the combined blocks.
+        """
+
+        self.blocks = []
+        self.callsign_index.clear()
+        self.type_index.clear()
+        self._sorted_callsigns = None
+        self.callsign_ngrams.clear()
+        self.anomaly_bitmaps = {}
+        timed_runs = []
+        for indexer in indexers:
+            base = len(self.blocks)
+            self.blocks.extend(indexer.blocks)
+            for flag, bitmap in indexer.anomaly_bitmaps.items():
+                self.anomaly_bitmaps[flag] = self.anomaly_bitmaps.get(flag, 0) | bitmap << base
+            for key, positions in indexer.callsign_index.items():
+                self.callsign_ngrams.add(key)
+                self.callsign_index[key].extend(idx + base for idx in positions)
+            for block_type, positions in indexer.type_index.items():
+                self.type_index[block_type].extend(idx + base for idx in positions)
+            timed_runs.append(zip(indexer.time_keys, [idx + base for idx in indexer.time_positions]))
+        timed = list(heapq.merge(*timed_runs))
+        self.time_keys = [minute for minute, _ in timed]
+        self.time_positions = [idx for _, idx in timed]
+
+    def extend(self, blocks: Iterable[DclBlock]) -> None:
+        """Index newly arrived *blocks* without touching existing entries."""
+
+        blocks = list(blocks)
+        base = len(self.blocks)
+        for block in blocks:
+            idx = len(self.blocks)
+            self.blocks.append(block)
+            self._index_block(idx, block)
+            minute = timestamp_minutes(block.ts)
+            if minute is not None:
+                position = bisect_right(self.time_keys, minute)
+                self.time_keys.insert(position, minute)
+                self.time_positions.insert(position, idx)
+        for flag, bitmap in anomaly_bitmaps(blocks).items():
+            self.anomaly_bitmaps[flag] = self.anomaly_bitmaps.get(flag, 0) | bitmap << base
+
+    def evict(self, count: int) -> List[DclBlock]:
+        """Drop the *count* oldest blocks and shift the remaining positions down.
+
+        Every position list is sorted, so each is cut with a bisection and
+        rewritten once; callers evict in batches to amortize the pass.
+        """
+
+        count = min(max(count, 0), len(self.blocks))
+        if not count:
+            return []
+        evicted = self.blocks[:count]
+        del self.blocks[:count]
+        for index in (self.callsign_index, self.type_index):
+            for key in list(index):
+                positions = index[key]
+                cut = bisect_left(positions, count)
+                if cut == len(positions):
+                    del index[key]
+                    self._sorted_callsigns = None
+                    if index is self.callsign_index:
+                        self.callsign_ngrams.discard(key)
+                else:
+                    index[key] = [idx - count for idx in positions[cut:]]
+        kept = [(minute, idx - count) for minute, idx in zip(self.time_keys, self.time_positions) if idx >= count]
+        self.time_keys = [minute for minute, _ in kept]
+        self.time_positions = [idx for _, idx in kept]
+        shifted = {flag: bitmap >> count for flag, bitmap in self.anomaly_bitmaps.items()}
+        self.anomaly_bitmaps = {flag: bitmap for flag, bitmap in shifted.items() if bitmap}
+        return evicted
+
+    def anomaly_counts(self) -> Dict[DclAnomaly, int]:
+        """Return the number of blocks carrying each flag, without scanning the blocks."""
+
+        return {flag: bitmap.bit_count() for flag, bitmap in self.anomaly_bitmaps.items()}
+
+    def count_with_anomalies(self, flags: DclAnomaly = ANY_ANOMALY) -> int:
+        """Return how many blocks carry any of *flags*, from a bitmap popcount."""
+
+        return self._combined_bitmap(flags).bit_count()
+
+    def indices_with_anomalies(self, flags: DclAnomaly = ANY_ANOMALY) -> List[int]:
+        """Return sorted indices of blocks carrying any of *flags*."""
+
+        return bitmap_positions(self._combined_bitmap(flags))
+
+    def indices_without_anomalies(self, flags: DclAnomaly = ANY_ANOMALY) -> List[int]:
+        """Return sorted indices of blocks carrying none of *flags*, e.g. every original of a duplicate."""
+
+        everything = (1 << len(self.blocks)) - 1
+        return bitmap_positions(everything & ~self._combined_bitmap(flags))
+
+    def _combined_bitmap(self, flags: DclAnomaly) -> int:
+        combined = 0
+        for flag, bitmap in self.anomaly_bitmaps.items():
+            if flag & flags:
+                combined |= bitmap
+        return combined
 
-    def filter(self, callsign: str | None, allowed_types: Iterable[DclType] | None) -> List[DclBlock]:
+    @staticmethod
+    def callsign_key(block: DclBlock) -> str | None:
+        """Return the key *block* is filed under in :attr:`callsign_index`."""
+
+        return block.callsign.upper() if block.callsign else None
+
+    def _index_block(self, idx: int, block: DclBlock) -> None:
+        key = self.callsign_key(block)
+        if key:
+            if key not in self.callsign_index:
+                self._sorted_callsigns = None
+                self.callsign_ngrams.add(key)
+            self.callsign_index[key].append(idx)
+        self.type_index[block.type].append(idx)
+
+    def sibling(self, block: DclBlock, step: int) -> DclBlock | None:
+        """Return the block *step* places after *block* among those with its callsign.
+
+        Positions of one log are in file order, so *block* is found by a binary
+        search on its start offset. Only when blocks of several logs were
+        merged, and offsets restart per log, does a miss fall back to a scan.
+        """
+
+        key = self.callsign_key(block)
+        positions = self.callsign_index.get(key, []) if key else []
+        blocks = self.blocks
+        number = bisect_left(positions, block.start_offset, key=lambda idx: blocks[idx].start_offset)
+        if not (number < len(positions) and blocks[positions[number]] is block):
+            number = next((number for number, idx in enumerate(positions) if blocks[idx] is block), None)
+            if number is None:
+                return None
+        target = number + step
+        return blocks[positions[target]] if 0 <= target < len(positions) else None
+
+    def callsigns_with_prefix(self, prefix: str) -> List[str]:
+        """Return indexed callsigns starting with *prefix* using a sorted key list."""
+
+        if self._sorted_callsigns is None:
+            self._sorted_callsigns = sorted(self.callsign_index)
+        keys = self._sorted_callsigns
+        prefix = prefix.upper()
+        result: List[str] = []
+        for key in keys[bisect_left(keys, prefix) :]:
+            if not key.startswith(prefix):
+                break
+            result.append(key)
+        return result
+
+    def callsigns_containing(self, text: str) -> List[str]:
+        """Return indexed callsigns containing *text*, e.g. just the flight number."""
+
+        return self.callsign_ngrams.containing(text.upper())
+
+    def similar_callsigns(self, text: str, max_typos: int = MAX_TYPOS) -> List[tuple[str, int]]:
+        """Return ``(callsign, edits)`` for callsigns within *max_typos* edits of *text*, closest first."""
+
+        return self.callsign_ngrams.similar(text.upper(), max_typos)
+
+    def count_in_time_range(self, start: int, end: int) -> int:
+        """Return how many blocks have a timestamp in ``[start, end]`` minutes, without collecting them."""
+
+        return bisect_right(self.time_keys, end) - bisect_left(self.time_keys, start)
+
+    def indices_in_time_range(self, start: int, end: int) -> List[int]:
+        """Return sorted block indices whose timestamp lies in ``[start, end]`` minutes."""
+
+        low = bisect_left(self.time_keys, start)
+        high = bisect_right(self.time_keys, end)
+        return sorted(self.time_positions[low:high])
+
+    def filter(
+        self,
+        callsign: str | None,
+        allowed_types: Iterable[DclType] | None,
+        time_range: tuple[int, int] | None = None,
+    ) -> List[DclBlock]:
         if not self.blocks:
             return []
 
@@ -37,9 +244,16 @@ class DclIndexer:
                 if key.startswith(normalized_callsign)
                 for idx in indices
             ]
-        else:
+        elif time_range is None:
             matching_indices = list(range(len(self.blocks)))
 
+        if time_range is not None:
+            in_range = self.indices_in_time_range(*time_range)
+            if normalized_callsign:
+                selected = set(matching_indices)
+                in_range = [idx for idx in in_range if idx in selected]
+            matching_indices = in_range
+
         filtered: List[DclBlock] = []
         for idx in matching_indices:
             block = self.blocks[idx]
@@ -50,3 +264,31 @@ class DclIndexer:
 
     def types_present(self) -> Dict[DclType, int]:
         return {key: len(indices) for key, indices in self.type_index.items()}
+
+
+def anomaly_bitmaps(blocks: Sequence[DclBlock]) -> Dict[DclAnomaly, int]:
+    """Return one bitmap per anomaly flag present in *blocks*, bit *i* standing for ``blocks[i]``."""
+
+    rows: Dict[int, bytearray] = {}
+    size = (len(blocks) + 7) // 8
+    for idx, block in enumerate(blocks):
+        flags = int(block.anomalies)
+        while flags:
+            flag = flags & -flags
+            flags ^= flag
+            row = rows.get(flag)
+            if row is None:
+                row = rows[flag] = bytearray(size)
+            row[idx >> 3] |= 1 << (idx & 7)
+    return {DclAnomaly(flag): int.from_bytes(row, "little") for flag, row in rows.items()}
+
+
+def bitmap_positions(bitmap: int) -> List[int]:
+    """Return the positions of the set bits of *bitmap* in ascending order."""
+
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    positions: List[int] = []
+    for match in _NONZERO_BYTE.finditer(data):
+        base = match.start() * 8
+        positions.extend(base + bit for bit in _BYTE_BITS[data[match.start()]])
+    return positions
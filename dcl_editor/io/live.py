@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Collection, Dict, List
+from urllib.parse import urlsplit
+
+from ..core.models import DclBlock
+from ..core.tokenizer import IncrementalTokenizer
+from .loader import parse_block
+
+
+FEED_SCHEMES = ("tcp", "tcp+connect", "udp", "pipe")
+MAX_FRAME_BYTES = 1 << 20
+READ_CHUNK_BYTES = 64 * 1024
+# A spool rolls over to a new segment file at this size; only the newest segments are kept.
+SPOOL_SEGMENT_BYTES = 64 << 20
+SPOOL_SEGMENTS = 8
+
+
+@dataclass(slots=True)
+class FeedEndpoint:
+    """Where a live feed is read from.
+
+    ``tcp://host:port`` listens for feed connections, ``tcp+connect://host:port``
+    connects to a feed, ``udp://host:port`` receives datagrams and
+    ``pipe://path`` reads a named pipe or FIFO.
+    """
+
+    scheme: str
+    host: str = "127.0.0.1"
+    port: int = 0
+    path: str = ""
+
+
+def parse_endpoint(text: str) -> FeedEndpoint:
+    scheme, _, rest = text.partition("://")
+    if scheme not in FEED_SCHEMES or not rest:
+        raise ValueError(f"Unsupported feed endpoint: {text!r}")
+    if scheme == "pipe":
+        return FeedEndpoint(scheme=scheme, path=rest)
+    parts = urlsplit(f"//{rest}")
+    try:
+        port = parts.port or 0
+    except ValueError as exc:
+        raise ValueError(f"Invalid port in feed endpoint: {text!r}") from exc
+    return FeedEndpoint(scheme=scheme, host=parts.hostname or "127.0.0.1", port=port)
+
+
+class BackgroundLoop:
+    """Run an asyncio service on a daemon thread with a thread-safe start/stop."""
+
+    def __init__(self) -> None:
+        self.error: BaseException | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop_event: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    def start(self, timeout: float = 5.0) -> None:
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        if self.error is not None:
+            raise RuntimeError(f"{type(self).__name__} failed to start: {self.error}") from self.error
+
+    def stop(self, timeout: float = 5.0) -> None:
+        loop, stop_event = self._loop, self._stop_event
+        if loop is not None and stop_event is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(stop_event.set)
+            except RuntimeError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop_event is not None and self._stop_event.is_set()
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._bootstrap())
+        except BaseException as exc:  # pragma: no cover - surfaced through .error
+            self.error = exc
+        finally:
+            self._ready.set()
+
+    async def _bootstrap(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        await self.serve(self._stop_event)
+
+    def _mark_ready(self) -> None:
+        self._ready.set()
+
+    async def serve(self, stop_event: asyncio.Event) -> None:
+        raise NotImplementedError
+
+
+class LiveIngestor(BackgroundLoop):
+    """Decode raw <STX> .. <ETX> frames from a live feed into block batches.
+
+    Parsed batches are published on :attr:`batches`, a bounded queue. When the
+    consumer falls behind, stream readers stop reading (TCP and pipes apply
+    backpressure to the sender) while UDP frames that do not fit are dropped
+    and counted in :attr:`dropped_frames`.
+
+    With a *spool* path every decoded frame is also appended to that file and
+    block offsets refer to it, so blocks dropped from memory can be read back.
+    The spool rolls over to ``<stem>.<n><suffix>`` segments of
+    *spool_segment_bytes*. Segments beyond the newest *spool_segments* are
+    deleted by :meth:`prune_spool` once no retained block refers to them, and
+    :meth:`remove_spool` deletes the rest.
+    """
+
+    def __init__(
+        self,
+        endpoint: str | FeedEndpoint,
+        batch_size: int = 256,
+        flush_interval: float = 0.25,
+        max_pending_batches: int = 64,
+        spool: str | Path | None = None,
+        spool_segment_bytes: int = SPOOL_SEGMENT_BYTES,
+        spool_segments: int = SPOOL_SEGMENTS,
+    ) -> None:
+        super().__init__()
+        self.endpoint = parse_endpoint(endpoint) if isinstance(endpoint, str) else endpoint
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batches: queue.Queue[List[DclBlock]] = queue.Queue(maxsize=max_pending_batches)
+        self.received_frames = 0
+        self.dropped_frames = 0
+        self.bound_port: int | None = None
+        self.spool = Path(spool) if spool is not None else None
+        self.spool_segment_bytes = spool_segment_bytes
+        self.spool_segments = max(1, spool_segments)
+        self.spool_files: List[Path] = [self.spool] if self.spool is not None else []
+        self._spool_handle: BinaryIO | None = None
+        self._spool_serial = 0
+        # Rotation runs on the event loop thread, pruning on the consumer's.
+        self._spool_lock = threading.Lock()
+
+    def drain(self, max_batches: int | None = None) -> List[DclBlock]:
+        """Return the blocks of all queued batches without blocking."""
+
+        blocks: List[DclBlock] = []
+        taken = 0
+        while max_batches is None or taken < max_batches:
+            try:
+                blocks.extend(self.batches.get_nowait())
+            except queue.Empty:
+                break
+            taken += 1
+        return blocks
+
+    async def serve(self, stop_event: asyncio.Event) -> None:
+        endpoint = self.endpoint
+        if endpoint.scheme == "tcp":
+            server = await asyncio.start_server(self._consume_stream, endpoint.host, endpoint.port)
+            self.bound_port = server.sockets[0].getsockname()[1]
+            self._mark_ready()
+            async with server:
+                await stop_event.wait()
+        elif endpoint.scheme == "tcp+connect":
+            reader, writer = await asyncio.open_connection(endpoint.host, endpoint.port)
+            self._mark_ready()
+            await self._until_stopped(self._consume_stream(reader, writer), stop_event)
+        elif endpoint.scheme == "udp":
+            await self._serve_datagrams(stop_event)
+        else:
+            reader = asyncio.StreamReader()
+            threading.Thread(
+                target=self._read_pipe, args=(endpoint.path, reader, asyncio.get_running_loop()), daemon=True
+            ).start()
+            self._mark_ready()
+            await self._until_stopped(self._consume_stream(reader), stop_event)
+
+    async def _until_stopped(self, coroutine, stop_event: asyncio.Event) -> None:
+        task = asyncio.ensure_future(coroutine)
+        waiter = asyncio.ensure_future(stop_event.wait())
+        await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        for pending in (task, waiter):
+            pending.cancel()
+        await asyncio.gather(task, waiter, return_exceptions=True)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        super().stop(timeout)
+        self._close_spool()
+
+    def remove_spool(self) -> None:
+        """Delete every spool segment still on disk; call once the spooled blocks are no longer needed."""
+
+        self._close_spool()
+        with self._spool_lock:
+            paths, self.spool_files = self.spool_files, []
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def prune_spool(self, in_use: Collection[str], close: Callable[[Path], None] | None = None) -> List[Path]:
+        """Delete old spool segments that no source in *in_use* names and return them.
+
+        Only segments beyond the newest *spool_segments* are candidates.
+        *close* is called with each path first so readers can drop open
+        handles, which Windows requires before a file can be deleted. A
+        segment that still cannot be deleted is kept and tried again next time.
+        """
+
+        with self._spool_lock:
+            candidates = [path for path in self.spool_files[: -self.spool_segments] if str(path) not in in_use]
+        removed = []
+        for path in candidates:
+            if close is not None:
+                close(path)
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            removed.append(path)
+        with self._spool_lock:
+            self.spool_files = [path for path in self.spool_files if path not in removed]
+        return removed
+
+    def _close_spool(self) -> None:
+        if self._spool_handle is not None:
+            self._spool_handle.close()
+            self._spool_handle = None
+
+    def _rotate_spool(self) -> None:
+        self._close_spool()
+        self._spool_serial += 1
+        base = self.spool
+        with self._spool_lock:
+            self.spool_files = self.spool_files + [base.with_name(f"{base.stem}.{self._spool_serial}{base.suffix}")]
+
+    def _parse_frames(self, frames: List[tuple[int, int, bytes]]) -> List[DclBlock]:
+        self.received_frames += len(frames)
+        if self.spool is None:
+            return [parse_block(raw, start, end, keep_text=True) for start, end, raw in frames]
+        if self._spool_handle is None:
+            self._spool_handle = self.spool_files[-1].open("ab")
+        handle = self._spool_handle
+        source = str(self.spool_files[-1])
+        blocks = []
+        for _, _, raw in frames:
+            start = handle.tell()
+            handle.write(raw + b"\n")
+            block = parse_block(raw, start, start + len(raw))
+            block.source = source
+            blocks.append(block)
+        handle.flush()
+        if handle.tell() >= self.spool_segment_bytes:
+            self._rotate_spool()
+        return blocks
+
+    async def _publish(self, batch: List[DclBlock]) -> None:
+        while not self.stopping:
+            try:
+                self.batches.put_nowait(batch)
+                return
+            except queue.Full:
+                await asyncio.sleep(0.01)
+
+    async def _consume_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter | None = None) -> None:
+        loop = asyncio.get_running_loop()
+        tokenizer = IncrementalTokenizer(MAX_FRAME_BYTES)
+        pending: List[DclBlock] = []
+        deadline = loop.time() + self.flush_interval
+        try:
+            while not self.stopping:
+                try:
+                    chunk = await asyncio.wait_for(reader.read(READ_CHUNK_BYTES), self.flush_interval)
+                except asyncio.TimeoutError:
+                    chunk = None
+                if chunk == b"":
+                    break
+                if chunk:
+                    pending.extend(self._parse_frames(tokenizer.feed(chunk)))
+                if len(pending) >= self.batch_size or (pending and loop.time() >= deadline):
+                    await self._publish(pending)
+                    pending = []
+                    deadline = loop.time() + self.flush_interval
+            if pending:
+                await self._publish(pending)
+        finally:
+            self.dropped_frames += tokenizer.dropped_frames
+            if writer is not None:
+                writer.close()
+
+    async def _serve_datagrams(self, stop_event: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        protocol = _DatagramFeed(self)
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: protocol, local_addr=(self.endpoint.host, self.endpoint.port)
+        )
+        self.bound_port = transport.get_extra_info("sockname")[1]
+        self._mark_ready()
+        try:
+            while not stop_event.is_set():
+                try:
+                    await asyncio.wait_for(stop_event.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+                protocol.flush()
+        finally:
+            transport.close()
+
+    def _read_pipe(self, path: str, reader: asyncio.StreamReader, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            with open(path, "rb", buffering=0) as handle:
+                while not self.stopping:
+                    while self.batches.full() and not self.stopping:
+                        time.sleep(0.01)
+                    chunk = handle.read(READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    loop.call_soon_threadsafe(reader.feed_data, chunk)
+        except OSError as exc:
+            self.error = exc
+        finally:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(reader.feed_eof)
+
+
+class _DatagramFeed(asyncio.DatagramProtocol):
+    def __init__(self, ingestor: LiveIngestor) -> None:
+        self._ingestor = ingestor
+        self._tokenizers: Dict[tuple, IncrementalTokenizer] = {}
+        self._pending: List[DclBlock] = []
+
+    def datagram_received(self, data: bytes, addr) -> None:  # type: ignore[override]
+        tokenizer = self._tokenizers.get(addr)
+        if tokenizer is None:
+            tokenizer = self._tokenizers[addr] = IncrementalTokenizer(MAX_FRAME_BYTES)
+        self._pending.extend(self._ingestor._parse_frames(tokenizer.feed(data)))
+        if len(self._pending) >= self._ingestor.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        try:
+            self._ingestor.batches.put_nowait(self._pending)
+        except queue.Full:
+            self._ingestor.dropped_frames += len(self._pending)
+        self._pending = []
@@ -1,67 +1,265 @@
 from __future__ import annotations
 
+import mmap
+import sys
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Iterable, List
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, Sequence
 
+from ..core.anomalies import detect_anomalies
 from ..core.classifier import classify_block
 from ..core.extractor import extract_fields
 from ..core.models import DclBlock, DclType
-from ..core.normalizer import normalize_block
-from ..core.tokenizer import tokenize_blocks
+from ..core.normalizer import normalize_block_bytes, text_digest
+from ..core.scanner import count_start_markers, scan_block_spans
+from ..core.tokenizer import IncrementalTokenizer, count_dangling_starts
+from .dedupe import BlockDeduplicator
+from .extract import read_block_index
+
+
+STREAM_CHUNK_BYTES = 1 << 20
 
 
 class LogLoader:
-    """Load DCL log blocks from an ASMGCS DEBUG.log file."""
+    """Load DCL log blocks from an ASMGCS DEBUG.log file.
+
+    Files are processed as bytes; block offsets are byte offsets into the file
+    and only the normalized text of each block is decoded.
+    """
 
     def __init__(self) -> None:
         self._source: Path | None = None
-        self._raw_cache: str = ""
+        self._raw_bytes: bytes | mmap.mmap = b""
+        # Other logs read_raw seeks into, e.g. the sources of merged or live blocks.
+        self._handles: Dict[Path, BinaryIO] = {}
+        self._handles_lock = threading.Lock()
+        self.dangling_starts = 0
 
     def load(self, path: str | Path) -> List[DclBlock]:
-        self._source = Path(path)
-        data = self._source.read_text(encoding="utf-8", errors="ignore")
-        self._raw_cache = data
-        return self._build_blocks(data)
+        """Parse every block of *path*, flagging retransmissions :attr:`DclAnomaly.DUPLICATE`."""
+
+        return self._flag_duplicates(self._build_blocks(self._read_source(Path(path))))
 
     def reload(self) -> List[DclBlock]:
         if not self._source:
             return []
-        data = self._source.read_text(encoding="utf-8", errors="ignore")
-        self._raw_cache = data
-        return self._build_blocks(data)
-
-    def _build_blocks(self, data: str) -> List[DclBlock]:
-        blocks: List[DclBlock] = []
-        raw_blocks = tokenize_blocks(data)
-        search_pos = 0
-        for raw in raw_blocks:
-            start = data.find(raw, search_pos)
-            if start == -1:
-                start = search_pos
-            end = start + len(raw)
-            search_pos = end
-            clean = normalize_block(raw)
-            lines = clean.split("\n") if clean else []
-            block_type: DclType = classify_block(lines)
-            fields = extract_fields(lines)
-            summary = fields.get("summary") or (lines[0] if lines else "")
-            preview = fields.get("preview_text") or clean
-            block = DclBlock(
-                start_offset=start,
-                end_offset=end,
-                ts=fields.get("ts"),
-                type=block_type,
-                callsign=fields.get("callsign"),
-                summary=summary,
-                preview_text=preview,
-                full_block_text=clean,
-                metadata_json=fields.get("json"),
-            )
-            blocks.append(block)
+        return self._flag_duplicates(self._build_blocks(self._read_source(self._source)))
+
+    def scan(self, path: str | Path) -> List[DclBlock]:
+        """First loading phase: find block spans only.
+
+        The file is memory-mapped rather than read, and the returned blocks
+        carry nothing but their offsets; :meth:`enrich` parses every other
+        field later. A valid companion index written by :func:`extract_sublog`
+        replaces the span search entirely.
+        """
+
+        path = Path(path)
+        data = self._map_source(path)
+        indexed = read_block_index(path)
+        if indexed is not None:
+            self.dangling_starts = 0
+            return indexed
+        spans = scan_block_spans(data)
+        self.dangling_starts = count_start_markers(data) - len(spans)
+        return [
+            DclBlock(start, end, None, "UNKNOWN", None, summary="", preview_text="", full_block_text="", enriched=False)
+            for start, end in spans
+        ]
+
+    def enrich(self, block: DclBlock) -> DclBlock:
+        """Second loading phase: normalize and extract fields of a scanned block."""
+
+        if block.enriched:
+            return block
+        raw = self._raw_bytes[block.start_offset : block.end_offset]
+        full = parse_block(raw, block.start_offset, block.end_offset)
+        block.ts = full.ts
+        block.type = full.type
+        block.callsign = full.callsign
+        block.summary = full.summary
+        block.preview_text = full.preview_text
+        block.metadata_json = full.metadata_json
+        block.anomalies = full.anomalies
+        block.digest = full.digest
+        block.enriched = True
+        return block
+
+    def read_raw(self, block: DclBlock) -> bytes:
+        """Return the original bytes of *block* from its offsets.
+
+        Blocks of the loaded file are sliced from the buffer kept for
+        enrichment; blocks naming another ``source`` are read by seeking into
+        that file, whose handle stays open for the next block. Raises
+        ``OSError`` if the file cannot be read.
+        """
+
+        source = Path(block.source) if block.source else self._source
+        if source is None:
+            return b""
+        if source == self._source and block.end_offset <= len(self._raw_bytes):
+            return self._raw_bytes[block.start_offset : block.end_offset]
+        with self._handles_lock:
+            handle = self._handles.get(source)
+            if handle is None:
+                handle = self._handles[source] = source.open("rb")
+            handle.seek(block.start_offset)
+            return handle.read(block.end_offset - block.start_offset)
+
+    def close_source(self, source: str | Path) -> None:
+        """Close the handle kept open for *source*, e.g. before that file is deleted."""
+
+        with self._handles_lock:
+            handle = self._handles.pop(Path(source), None)
+        if handle is not None:
+            handle.close()
+
+    def read_text(self, block: DclBlock) -> str:
+        """Return the normalized text of *block*, re-read from its offsets unless it was kept.
+
+        This is the :data:`BlockTextReader` for blocks of this loader; it
+        raises ``OSError`` like :meth:`read_raw`.
+        """
+
+        return block.full_block_text or normalize_block_bytes(self.read_raw(block))
+
+    def _read_source(self, path: Path) -> bytes:
+        self._close_source()
+        self._source = path
+        self._raw_bytes = path.read_bytes()
+        return self._raw_bytes
+
+    def _map_source(self, path: Path) -> bytes | mmap.mmap:
+        self._close_source()
+        self._source = path
+        with path.open("rb") as handle:
+            try:
+                self._raw_bytes = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                self._raw_bytes = b""
+        return self._raw_bytes
+
+    def _close_source(self) -> None:
+        if isinstance(self._raw_bytes, mmap.mmap):
+            self._raw_bytes.close()
+        self._raw_bytes = b""
+        with self._handles_lock:
+            for handle in self._handles.values():
+                handle.close()
+            self._handles.clear()
+
+    def _flag_duplicates(self, blocks: List[DclBlock]) -> List[DclBlock]:
+        # Flags are set before any index is built, so every bitmap includes them.
+        BlockDeduplicator(read_text=self.read_text).extend(blocks)
         return blocks
 
+    def _build_blocks(self, data: bytes, keep_text: bool = False) -> List[DclBlock]:
+        spans = scan_block_spans(data)
+        self.dangling_starts = count_dangling_starts(data, len(spans))
+        return [parse_block(data[start:end], start, end, keep_text=keep_text) for start, end in spans]
+
+
+def parse_block(raw: bytes, start: int, end: int, *, keep_text: bool = False) -> DclBlock:
+    """Run normalize, classify, extract and anomaly detection on the raw bytes of one block.
+
+    Callsign, timestamp and type strings are interned since they repeat across
+    millions of blocks. The normalized text is only stored with *keep_text*,
+    for blocks that cannot be re-read from a file by their offsets.
+    """
+
+    clean = normalize_block_bytes(raw)
+    lines = clean.split("\n") if clean else []
+    block_type: DclType = classify_block(lines)
+    fields = extract_fields(lines)
+    summary = fields.get("summary") or (lines[0] if lines else "")
+    preview = fields.get("preview_text") or clean
+    callsign = fields.get("callsign")
+    ts = fields.get("ts")
+    return DclBlock(
+        start_offset=start,
+        end_offset=end,
+        ts=sys.intern(ts) if ts else None,
+        type=sys.intern(block_type),  # type: ignore[arg-type]
+        callsign=sys.intern(callsign) if callsign else None,
+        summary=summary,
+        preview_text=preview,
+        full_block_text=clean if keep_text else "",
+        metadata_json=fields.get("json"),
+        anomalies=detect_anomalies(raw, block_type, callsign, ts),
+        digest=text_digest(clean),
+    )
+
+
+class EnrichmentQueue:
+    """Order pending blocks for enrichment, most recently requested first.
+
+    Blocks requested through :meth:`prioritize` (typically the rows currently
+    painted by the view) jump ahead of the sequential sweep over all blocks.
+    """
+
+    def __init__(self, blocks: Sequence[DclBlock]) -> None:
+        self._blocks = blocks
+        self._cursor = 0
+        self._priority: Deque[DclBlock] = deque()
+        self._lock = threading.Lock()
+
+    def prioritize(self, blocks: Iterable[DclBlock]) -> None:
+        with self._lock:
+            self._priority.extend(block for block in blocks if not block.enriched)
 
-def load_blocks_from_stream(stream: Iterable[str] | str) -> List[DclBlock]:
-    data = stream.read() if hasattr(stream, "read") else str(stream)
+    def next_batch(self, size: int) -> List[DclBlock]:
+        batch: List[DclBlock] = []
+        taken: set[int] = set()
+        with self._lock:
+            while self._priority and len(batch) < size:
+                block = self._priority.pop()
+                if not block.enriched and id(block) not in taken:
+                    taken.add(id(block))
+                    batch.append(block)
+            while self._cursor < len(self._blocks) and len(batch) < size:
+                block = self._blocks[self._cursor]
+                self._cursor += 1
+                if not block.enriched and id(block) not in taken:
+                    taken.add(id(block))
+                    batch.append(block)
+        return batch
+
+
+def load_tail(path: str | Path, offset: int) -> List[DclBlock]:
+    """Parse the blocks of *path* that start at or after byte *offset*, e.g. after the file grew."""
+
+    with Path(path).open("rb") as handle:
+        handle.seek(offset)
+        data = handle.read()
+    return [parse_block(data[start:end], offset + start, offset + end) for start, end in scan_block_spans(data)]
+
+
+def load_blocks_from_stream(stream: Iterable[str] | str | bytes) -> List[DclBlock]:
+    data = stream.read() if hasattr(stream, "read") else stream
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    elif not isinstance(data, bytes):
+        data = "".join(data).encode("utf-8")
     loader = LogLoader()
-    return loader._build_blocks(data)
+    return loader._build_blocks(data, keep_text=True)
+
+
+def iter_log_blocks(
+    path: str | Path, chunk_bytes: int = STREAM_CHUNK_BYTES, keep_text: bool = False
+) -> Iterator[DclBlock]:
+    """Parse the log at *path* chunk by chunk, yielding blocks in file order.
+
+    Only the frame being reassembled is held in memory, so arbitrarily large
+    logs can be processed in a single pass.
+    """
+
+    tokenizer = IncrementalTokenizer()
+    with Path(path).open("rb") as handle:
+        while True:
+            chunk = handle.read(chunk_bytes)
+            if not chunk:
+                break
+            for start, end, raw in tokenizer.feed(chunk):
+                yield parse_block(raw, start, end, keep_text=keep_text)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from ..core.models import DclBlock
+from .indexer import DclIndexer
+from .loader import LogLoader
+
+
+LOG_PATTERNS = ("*.log", "*.txt")
+
+
+@dataclass(slots=True)
+class LoadedFile:
+    """Parsed blocks and index of one log, tagged with the file state they came from."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    indexer: DclIndexer
+    dangling_starts: int
+
+    @property
+    def blocks(self) -> List[DclBlock]:
+        return self.indexer.blocks
+
+
+def logs_in_folder(folder: str | Path, patterns: Iterable[str] = LOG_PATTERNS) -> List[Path]:
+    """Return the log files directly inside *folder*, sorted by name."""
+
+    folder = Path(folder)
+    found = {path for pattern in patterns for path in folder.glob(pattern) if path.is_file()}
+    return sorted(found)
+
+
+def load_file(path: Path) -> LoadedFile:
+    """Parse and index one log; runs inside a worker process."""
+
+    stat = path.stat()
+    loader = LogLoader()
+    blocks = loader.load(path)
+    source = str(path)
+    for block in blocks:
+        block.source = source
+    indexer = DclIndexer()
+    indexer.rebuild(blocks)
+    return LoadedFile(
+        path=path,
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        indexer=indexer,
+        dangling_starts=loader.dangling_starts,
+    )
+
+
+class MultiFileLoader:
+    """Load several logs concurrently, one worker process per file.
+
+    Each worker parses and indexes its file and the result is pickled back to
+    the parent, so blocks are copied once across the process boundary rather
+    than shared. Workers are started with the platform's default method,
+    ``spawn`` on Windows, which needs ``multiprocessing.freeze_support()`` at
+    the top of a frozen build's entry point.
+
+    Results are cached by path and reused while the file's size and
+    modification time are unchanged, so reopening a folder only parses the
+    files that were added or have grown since.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cache: Dict[Path, LoadedFile] = {}
+
+    def is_current(self, path: Path) -> bool:
+        cached = self._cache.get(path)
+        if cached is None:
+            return False
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == (cached.size, cached.mtime_ns)
+
+    def load(
+        self,
+        paths: Sequence[str | Path],
+        progress: Callable[[int, int], None] | None = None,
+    ) -> List[LoadedFile]:
+        """Return one :class:`LoadedFile` per path, in the order given.
+
+        Raises ``OSError`` for the first file that cannot be read.
+        """
+
+        paths = [Path(path).resolve() for path in paths]
+        stale = list(dict.fromkeys(path for path in paths if not self.is_current(path)))
+        done = len(paths) - len(stale)
+        if progress:
+            progress(done, len(paths))
+        workers = min(len(stale), self.max_workers)
+        if workers <= 1:
+            for path in stale:
+                self._cache[path] = load_file(path)
+                done += 1
+                if progress:
+                    progress(done, len(paths))
+        else:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(load_file, path) for path in stale]
+                for future in as_completed(futures):
+                    loaded = future.result()
+                    self._cache[loaded.path] = loaded
+                    done += 1
+                    if progress:
+                        progress(done, len(paths))
+        return [self._cache[path] for path in paths]
+
+    def forget(self, keep: Iterable[Path] = ()) -> None:
+        """Drop cached files other than *keep* to release their blocks."""
+
+        kept = {Path(path).resolve() for path in keep}
+        for path in list(self._cache):
+            if path not in kept:
+                del self._cache[path]
+
+
+def merge_loaded(files: Sequence[LoadedFile]) -> DclIndexer:
+    """Combine per-file indexes into one global view, reusing the blocks already in this process."""
+
+    indexer = DclIndexer()
+    indexer.merge([loaded.indexer for loaded in files])
+    return indexer
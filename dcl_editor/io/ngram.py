@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List
+
+GRAM = 3
+PAD = "\x02"
+END = "\x03"
+MAX_TYPOS = 2
+
+
+def trigrams(text: str, padded: bool = True) -> List[str]:
+    """Return the overlapping trigrams of *text*, padded at both ends unless told otherwise."""
+
+    if padded:
+        text = PAD * (GRAM - 1) + text + END
+    return [text[idx : idx + GRAM] for idx in range(len(text) - GRAM + 1)]
+
+
+def edit_distance(left: str, right: str, limit: int = MAX_TYPOS) -> int:
+    """Levenshtein distance of two strings, capped at ``limit + 1``.
+
+    Uses the bit-parallel algorithm of Myers and Hyyrö: one column of the
+    distance matrix is kept as bit vectors and advanced a character at a time.
+    """
+
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    if not left:
+        return min(len(right), limit + 1)
+    masks: Dict[str, int] = {}
+    for position, char in enumerate(left):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    full = (1 << len(left)) - 1
+    last = 1 << (len(left) - 1)
+    positive, negative, score = full, 0, len(left)
+    for char in right:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        up = negative | ~(horizontal | positive)
+        down = positive & horizontal
+        if up & last:
+            score += 1
+        elif down & last:
+            score -= 1
+        up = (up << 1) | 1
+        down <<= 1
+        positive = (down | ~(vertical | up)) & full
+        negative = up & vertical & full
+    return min(score, limit + 1)
+
+
+class CallsignNgramIndex:
+    """Trigram postings over distinct callsigns for substring and typo-tolerant lookups.
+
+    Each callsign gets an integer id in insertion order, so every posting list
+    is sorted and candidates come from intersecting (substring) or counting
+    (fuzzy) the postings of the query's trigrams. Only the candidates are
+    verified against the query.
+    """
+
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._removed: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self) -> None:
+        self.keys.clear()
+        self._ids.clear()
+        self._postings.clear()
+        self._removed.clear()
+
+    def add(self, key: str) -> None:
+        if key in self._ids:
+            return
+        key_id = len(self.keys)
+        self.keys.append(key)
+        self._ids[key] = key_id
+        for gram in set(trigrams(key)):
+            self._postings.setdefault(gram, []).append(key_id)
+
+    def discard(self, key: str) -> None:
+        """Forget *key*; its postings are skipped until most ids are stale and the index is rebuilt."""
+
+        key_id = self._ids.pop(key, None)
+        if key_id is None:
+            return
+        self._removed.add(key_id)
+        if len(self._removed) > len(self._ids):
+            remaining = list(self._ids)
+            self.clear()
+            for key in remaining:
+                self.add(key)
+
+    def containing(self, text: str) -> List[str]:
+        """Return the callsigns that contain *text*, in insertion order."""
+
+        if len(text) < GRAM:
+            return [key for key in self._ids if text in key]
+        lists = sorted((self._postings.get(gram, []) for gram in set(trigrams(text, padded=False))), key=len)
+        candidates = lists[0]
+        for postings in lists[1:]:
+            if not candidates:
+                break
+            candidates = _intersect(candidates, postings)
+        keys = self.keys
+        return [keys[key_id] for key_id in candidates if key_id not in self._removed and text in keys[key_id]]
+
+    def similar(self, text: str, max_typos: int = MAX_TYPOS) -> List[tuple[str, int]]:
+        """Return ``(callsign, distance)`` pairs within *max_typos* edits of *text*, closest first.
+
+        Every edit destroys at most three padded trigrams, so a callsign within
+        *max_typos* edits shares at least ``len(grams) - 3 * max_typos`` of
+        them; only callsigns reaching that count are compared in full. Ties
+        are ranked by trigram overlap.
+        """
+
+        grams = set(trigrams(text))
+        needed = len(grams) - GRAM * max_typos
+        counts: Counter[int] = Counter()
+        for gram in grams:
+            counts.update(self._postings.get(gram, ()))
+        if needed > 0:
+            candidates = [key_id for key_id, shared in counts.items() if shared >= needed]
+        else:
+            candidates = list(self._ids.values())
+        matches = []
+        for key_id in candidates:
+            if key_id in self._removed:
+                continue
+            key = self.keys[key_id]
+            distance = edit_distance(text, key, max_typos)
+            if distance <= max_typos:
+                matches.append((distance, -counts[key_id], key))
+        matches.sort()
+        return [(key, distance) for distance, _, key in matches]
+
+
+def _intersect(smaller: List[int], larger: List[int]) -> List[int]:
+    result: List[int] = []
+    low = 0
+    for key_id in smaller:
+        low = bisect_left(larger, key_id, low)
+        if low == len(larger):
+            break
+        if larger[low] == key_id:
+            result.append(key_id)
+    return result
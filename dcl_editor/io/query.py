@@ -0,0 +1,348 @@
+"""Small filter query language shared by the GUI and the command line.
+
+Terms are combined with AND; ``NOT`` negates the following term::
+
+    type:CDA,CLD callsign:THY* ts:170400..170530 text:"SQUAWK 3270" NOT type:UNKNOWN
+
+``callsign`` matches exactly unless the value ends with ``*`` (prefix), starts
+with ``*`` (substring, e.g. ``callsign:*1QN``) or ends with ``~`` or ``~2``
+(up to one or two typos, e.g. ``callsign:THU1QN~``); ``ts`` takes a
+``DDHHMM`` minute or an inclusive ``start..end`` range (either side optional);
+``flag`` selects blocks with any of the named anomaly flags (e.g.
+``flag:truncated,missing_ts`` or ``flag:any``) and a bare word is a
+case-insensitive ``text`` search.
+"""
+
+from __future__ import annotations
+
+import heapq
+import shlex
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence
+
+from ..core.anomalies import describe_anomalies, parse_anomalies
+from ..core.extractor import minutes_to_timestamp, timestamp_minutes
+from ..core.models import BlockTextReader, DclAnomaly, DclBlock, DclType, stored_text
+from .indexer import DclIndexer
+from .ngram import edit_distance
+
+
+QUERY_TYPES: tuple[DclType, ...] = ("RCD", "CLD", "CDA", "FSM", "UNKNOWN")
+MAX_MINUTE = (31 * 24 + 23) * 60 + 59
+# Candidates are checked row by row instead of materializing a posting list this many times larger.
+PROBE_RATIO = 4
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a query string cannot be parsed."""
+
+
+@dataclass(frozen=True, slots=True)
+class TypePredicate:
+    types: frozenset[DclType]
+
+    def describe(self) -> str:
+        return "type:" + ",".join(sorted(self.types))
+
+    def matches(self, block: DclBlock, read_text: BlockTextReader = stored_text) -> bool:
+        return block.type in self.types
+
+    def estimate(self, indexer: DclIndexer) -> int:
+        return sum(len(indexer.type_index.get(block_type, ())) for block_type in self.types)
+
+    def lookup(self, indexer: DclIndexer) -> List[int]:
+        lists = [indexer.type_index.get(block_type, []) for block_type in self.types]
+        return lists[0] if len(lists) == 1 else list(heapq.merge(*lists))
+
+
+@dataclass(frozen=True, slots=True)
+class CallsignPredicate:
+    value: str
+    prefix: bool = False
+    contains: bool = False
+    typos: int = 0
+
+    @property
+    def exact(self) -> bool:
+        return not (self.prefix or self.contains or self.typos)
+
+    def describe(self) -> str:
+        if self.contains:
+            return f"callsign:*{self.value}"
+        if self.typos:
+            return f"callsign:{self.value}~{self.typos}"
+        return f"callsign:{self.value}{'*' if self.prefix else ''}"
+
+    def matches(self, block: DclBlock, read_text: BlockTextReader = stored_text) -> bool:
+        if not block.callsign:
+            return False
+        callsign = block.callsign.upper()
+        if self.contains:
+            return self.value in callsign
+        if self.typos:
+            return edit_distance(self.value, callsign, self.typos) <= self.typos
+        return callsign.startswith(self.value) if self.prefix else callsign == self.value
+
+    def _keys(self, indexer: DclIndexer) -> List[str]:
+        if self.exact:
+            return [self.value] if self.value in indexer.callsign_index else []
+        if self.contains:
+            return indexer.callsigns_containing(self.value)
+        if self.typos:
+            return [key for key, _ in indexer.similar_callsigns(self.value, self.typos)]
+        return indexer.callsigns_with_prefix(self.value)
+
+    def estimate(self, indexer: DclIndexer) -> int:
+        return sum(len(indexer.callsign_index[key]) for key in self._keys(indexer))
+
+    def lookup(self, indexer: DclIndexer) -> List[int]:
+        if self.exact:
+            return indexer.callsign_index.get(self.value, [])
+        return list(heapq.merge(*(indexer.callsign_index[key] for key in self._keys(indexer))))
+
+
+@dataclass(frozen=True, slots=True)
+class TimePredicate:
+    start: int
+    end: int
+
+    def describe(self) -> str:
+        return f"ts:{minutes_to_timestamp(self.start)}..{minutes_to_timestamp(self.end)}"
+
+    def matches(self, block: DclBlock, read_text: BlockTextReader = stored_text) -> bool:
+        minute = timestamp_minutes(block.ts)
+        return minute is not None and self.start <= minute <= self.end
+
+    def estimate(self, indexer: DclIndexer) -> int:
+        return indexer.count_in_time_range(self.start, self.end)
+
+    def lookup(self, indexer: DclIndexer) -> List[int]:
+        return indexer.indices_in_time_range(self.start, self.end)
+
+
+@dataclass(frozen=True, slots=True)
+class FlagPredicate:
+    flags: DclAnomaly
+
+    def describe(self) -> str:
+        return "flag:" + describe_anomalies(self.flags)
+
+    def matches(self, block: DclBlock, read_text: BlockTextReader = stored_text) -> bool:
+        return bool(block.anomalies & self.flags)
+
+    def estimate(self, indexer: DclIndexer) -> int:
+        return indexer.count_with_anomalies(self.flags)
+
+    def lookup(self, indexer: DclIndexer) -> List[int]:
+        return indexer.indices_with_anomalies(self.flags)
+
+
+@dataclass(frozen=True, slots=True)
+class TextPredicate:
+    text: str
+
+    def describe(self) -> str:
+        return f'text:"{self.text}"'
+
+    def matches(self, block: DclBlock, read_text: BlockTextReader = stored_text) -> bool:
+        return self.text in read_text(block).upper()
+
+    def estimate(self, indexer: DclIndexer) -> None:
+        return None
+
+    def lookup(self, indexer: DclIndexer) -> None:
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class NotPredicate:
+    inner: "Predicate"
+
+    def describe(self) -> str:
+        return f"NOT {self.inner.describe()}"
+
+    def matches(self, block: DclBlock, read_text: BlockTextReader = stored_text) -> bool:
+        return not self.inner.matches(block, read_text)
+
+    def estimate(self, indexer: DclIndexer) -> int | None:
+        if isinstance(self.inner, FlagPredicate):
+            return len(indexer.blocks) - indexer.count_with_anomalies(self.inner.flags)
+        return None
+
+    def lookup(self, indexer: DclIndexer) -> List[int] | None:
+        if isinstance(self.inner, FlagPredicate):
+            return indexer.indices_without_anomalies(self.inner.flags)
+        return None
+
+
+Predicate = TypePredicate | CallsignPredicate | TimePredicate | FlagPredicate | TextPredicate | NotPredicate
+
+
+@dataclass(slots=True)
+class Query:
+    """Conjunction of predicates parsed from a query string."""
+
+    predicates: List[Predicate] = field(default_factory=list)
+
+    def matches(self, block: DclBlock, read_text: BlockTextReader = stored_text) -> bool:
+        """Return whether *block* satisfies every predicate; ``text:`` terms read it through *read_text*."""
+
+        return all(predicate.matches(block, read_text) for predicate in self.predicates)
+
+    def describe(self) -> str:
+        return " ".join(predicate.describe() for predicate in self.predicates)
+
+
+@dataclass(slots=True)
+class QueryResult:
+    indices: List[int]
+    blocks: List[DclBlock]
+    explain: List[str]
+
+
+def _parse_minute(text: str, default: int) -> int:
+    if not text:
+        return default
+    minute = timestamp_minutes(text)
+    if minute is None:
+        raise QuerySyntaxError(f"Invalid timestamp {text!r}, expected DDHHMM")
+    return minute
+
+
+def _parse_term(key: str, value: str) -> Predicate:
+    if not value:
+        raise QuerySyntaxError(f"Missing value for {key!r}")
+    if key == "type":
+        types = {token.strip().upper() for token in value.split(",") if token.strip()}
+        unknown = sorted(types.difference(QUERY_TYPES))
+        if unknown:
+            raise QuerySyntaxError(f"Unknown message type(s): {', '.join(unknown)}")
+        return TypePredicate(frozenset(types))  # type: ignore[arg-type]
+    if key == "callsign":
+        value = value.upper()
+        if value.startswith("*"):
+            return CallsignPredicate(value.strip("*"), contains=True)
+        if value.endswith("*"):
+            return CallsignPredicate(value.rstrip("*"), prefix=True)
+        if "~" in value:
+            value, _, typos = value.partition("~")
+            if typos not in ("", "1", "2") or not value:
+                raise QuerySyntaxError(f"Callsign typo tolerance must be ~, ~1 or ~2, got {typos!r}")
+            return CallsignPredicate(value, typos=int(typos or 1))
+        return CallsignPredicate(value)
+    if key == "ts":
+        if ".." in value:
+            low, _, high = value.partition("..")
+            return TimePredicate(_parse_minute(low, 0), _parse_minute(high, MAX_MINUTE))
+        minute = _parse_minute(value, 0)
+        return TimePredicate(minute, minute)
+    if key == "flag":
+        try:
+            flags = parse_anomalies(value)
+        except ValueError as exc:
+            raise QuerySyntaxError(str(exc)) from exc
+        if not flags:
+            raise QuerySyntaxError(f"Missing value for {key!r}")
+        return FlagPredicate(flags)
+    if key == "text":
+        return TextPredicate(value.upper())
+    raise QuerySyntaxError(f"Unknown field {key!r}")
+
+
+def parse_query(text: str) -> Query:
+    try:
+        tokens = shlex.split(text)
+    except ValueError as exc:
+        raise QuerySyntaxError(str(exc)) from exc
+
+    query = Query()
+    negate = False
+    for token in tokens:
+        if token.upper() == "NOT":
+            if negate:
+                raise QuerySyntaxError("NOT must be followed by a term")
+            negate = True
+            continue
+        key, separator, value = token.partition(":")
+        if separator and key.lower() in ("type", "callsign", "ts", "flag", "text"):
+            predicate = _parse_term(key.lower(), value)
+        else:
+            predicate = TextPredicate(token.upper())
+        query.predicates.append(NotPredicate(predicate) if negate else predicate)
+        negate = False
+    if negate:
+        raise QuerySyntaxError("NOT must be followed by a term")
+    return query
+
+
+def _intersect(smaller: Sequence[int], larger: Sequence[int]) -> List[int]:
+    """Intersect sorted index vectors with a binary search per element of *smaller*."""
+
+    result: List[int] = []
+    low = 0
+    for idx in smaller:
+        low = bisect_left(larger, idx, low)
+        if low == len(larger):
+            break
+        if larger[low] == idx:
+            result.append(idx)
+    return result
+
+
+def execute_query(query: Query, indexer: DclIndexer, read_text: BlockTextReader = stored_text) -> QueryResult:
+    """Evaluate *query* using indexes for selective predicates and scanning the rest.
+
+    Indexed predicates are ordered by a cheap size estimate (posting-list
+    lengths, bitmap popcounts) and only the smallest is materialized up front.
+    Each further one is intersected when its list is comparable to the
+    candidates, or checked row by row on the candidates when it would be much
+    larger, so e.g. ``NOT flag:duplicate`` next to a callsign never builds its
+    complement. Predicates without an index are checked last, fetching text
+    through *read_text*.
+    """
+
+    explain: List[str] = []
+    indexed: List[tuple[int, Predicate]] = []
+    residual: List[Predicate] = []
+    for predicate in query.predicates:
+        estimate = predicate.estimate(indexer)
+        if estimate is None:
+            residual.append(predicate)
+        else:
+            indexed.append((estimate, predicate))
+    indexed.sort(key=lambda item: item[0])
+
+    candidates: Optional[List[int]] = None
+    for estimate, predicate in indexed:
+        if candidates is None:
+            candidates = predicate.lookup(indexer)
+            explain.append(f"index {predicate.describe()} -> {len(candidates)} rows")
+        elif len(candidates) * PROBE_RATIO < estimate:
+            candidates = [idx for idx in candidates if predicate.matches(indexer.blocks[idx], read_text)]
+            explain.append(f"probe {predicate.describe()} (~{estimate} rows) -> {len(candidates)} rows")
+        else:
+            indices = predicate.lookup(indexer)
+            candidates = _intersect(candidates, indices)
+            explain.append(f"intersect {predicate.describe()} ({len(indices)} rows) -> {len(candidates)} rows")
+
+    if candidates is None:
+        candidates = list(range(len(indexer.blocks)))
+        explain.append(f"full scan of {len(candidates)} rows")
+    for predicate in residual:
+        candidates = [idx for idx in candidates if predicate.matches(indexer.blocks[idx], read_text)]
+        explain.append(f"scan {predicate.describe()} -> {len(candidates)} rows")
+
+    return QueryResult(
+        indices=list(candidates),
+        blocks=[indexer.blocks[idx] for idx in candidates],
+        explain=explain,
+    )
+
+
+def run_query(
+    text: str, indexer: DclIndexer, extra: Iterable[Predicate] = (), read_text: BlockTextReader = stored_text
+) -> QueryResult:
+    query = parse_query(text)
+    query.predicates.extend(extra)
+    return execute_query(query, indexer, read_text)
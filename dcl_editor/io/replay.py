@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+from pathlib import Path
+from typing import List
+
+from ..core.scanner import scan_block_spans
+from .live import BackgroundLoop
+
+
+class ReplayServer(BackgroundLoop):
+    """Stand-in feed that streams the frames of a recorded DEBUG.log.
+
+    Every TCP client that connects receives all frames, paced at
+    *frames_per_second* (``0`` sends as fast as the client reads). With
+    *udp_target* set, frames are sent as datagrams to that address instead.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        frames_per_second: float = 0.0,
+        repeat: int = 1,
+        udp_target: tuple[str, int] | None = None,
+    ) -> None:
+        super().__init__()
+        data = Path(path).read_bytes()
+        self.frames: List[bytes] = [data[start:end] for start, end in scan_block_spans(data)]
+        self.host = host
+        self.port = port
+        self.frames_per_second = frames_per_second
+        self.repeat = repeat
+        self.udp_target = udp_target
+        self.bound_port: int | None = None
+        self.sent_frames = 0
+
+    async def serve(self, stop_event: asyncio.Event) -> None:
+        if self.udp_target is not None:
+            self._mark_ready()
+            await self._send_datagrams(stop_event)
+            return
+        server = await asyncio.start_server(self._stream_to, self.host, self.port)
+        self.bound_port = server.sockets[0].getsockname()[1]
+        self._mark_ready()
+        async with server:
+            await stop_event.wait()
+
+    async def _pace(self, started: float, sent: int) -> None:
+        if self.frames_per_second <= 0:
+            if sent % 256 == 0:
+                await asyncio.sleep(0)
+            return
+        delay = started + sent / self.frames_per_second - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _stream_to(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        started = time.perf_counter()
+        sent = 0
+        try:
+            for _ in range(self.repeat):
+                for frame in self.frames:
+                    if self.stopping:
+                        return
+                    writer.write(frame)
+                    sent += 1
+                    self.sent_frames += 1
+                    if writer.transport.get_write_buffer_size() > 1 << 20:
+                        await writer.drain()
+                    await self._pace(started, sent)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _send_datagrams(self, stop_event: asyncio.Event) -> None:
+        started = time.perf_counter()
+        sent = 0
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for _ in range(self.repeat):
+                for frame in self.frames:
+                    if stop_event.is_set():
+                        return
+                    sock.sendto(frame, self.udp_target)
+                    sent += 1
+                    self.sent_frames += 1
+                    await self._pace(started, sent)
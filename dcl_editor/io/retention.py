@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Iterable, List, Optional
+
+from ..core.extractor import elapsed_minutes, timestamp_minutes
+from ..core.models import DclBlock
+from ..core.tokenizer import IncrementalTokenizer
+from .loader import STREAM_CHUNK_BYTES, parse_block
+
+
+# Evicted spans are cut at this many blocks so :meth:`RetentionWindow.history` can stop early.
+SPAN_BLOCKS = 4096
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    """How much of a continuous session stays in memory.
+
+    ``max_blocks`` bounds the number of retained blocks and ``max_minutes`` the
+    span of log time behind the newest timestamp; either may be ``None``.
+    """
+
+    max_blocks: int | None = None
+    max_minutes: int | None = None
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_blocks is not None or self.max_minutes is not None
+
+
+@dataclass(slots=True)
+class EvictedSpan:
+    """A contiguous byte range of evicted blocks that can be read back from *source*."""
+
+    source: str
+    start: int
+    end: int
+    count: int
+
+
+class RetentionWindow:
+    """Keep the newest blocks of a session and report the oldest as they expire.
+
+    Blocks are tracked in a ring buffer in arrival order. Expired blocks are
+    released in slabs of at least *slack* blocks, so indexes downstream are
+    compacted once per slab instead of once per block. Evicted blocks are
+    remembered only as byte ranges of their source file, at most *span_blocks*
+    blocks each; :meth:`history` parses them again on demand.
+    """
+
+    def __init__(
+        self,
+        policy: RetentionPolicy,
+        slack: int | None = None,
+        default_source: str | None = None,
+        span_blocks: int = SPAN_BLOCKS,
+    ) -> None:
+        self.policy = policy
+        self.span_blocks = span_blocks
+        self.slack = slack if slack is not None else max(1, (policy.max_blocks or 10_000) // 10)
+        self.default_source = default_source
+        self.evicted: List[EvictedSpan] = []
+        self.evicted_count = 0
+        self._ring: Deque[tuple[Optional[int], DclBlock]] = deque()
+        self._newest_minute: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def reset(self, blocks: Iterable[DclBlock]) -> None:
+        """Track *blocks* as the retained session; evicted history is kept."""
+
+        self._ring.clear()
+        self._newest_minute = None
+        self._track(blocks)
+
+    def extend(self, blocks: Iterable[DclBlock]) -> List[DclBlock]:
+        """Track newly arrived *blocks* and return the oldest blocks that expired."""
+
+        self._track(blocks)
+        expired = self._expired_count()
+        if expired < self.slack:
+            return []
+        evicted = [self._ring.popleft()[1] for _ in range(expired)]
+        self._record(evicted)
+        return evicted
+
+    def history(self, limit: int | None = None) -> List[DclBlock]:
+        """Re-read evicted blocks from their files, the most recent *limit* of them.
+
+        Spans are read newest first until *limit* blocks are collected. Spans
+        whose file is gone (a rotated-away spool segment) are skipped.
+        """
+
+        if limit is not None and limit <= 0:
+            return []
+        spans: List[List[DclBlock]] = []
+        collected = 0
+        for span in reversed(self.evicted):
+            try:
+                blocks = read_span(span)
+            except FileNotFoundError:
+                continue
+            spans.append(blocks)
+            collected += len(blocks)
+            if limit is not None and collected >= limit:
+                break
+        recent = [block for blocks in reversed(spans) for block in blocks]
+        return recent[-limit:] if limit is not None else recent
+
+    def _track(self, blocks: Iterable[DclBlock]) -> None:
+        for block in blocks:
+            minute = timestamp_minutes(block.ts)
+            if minute is not None and (self._newest_minute is None or (_behind(self._newest_minute, minute) or 0) > 0):
+                self._newest_minute = minute
+            # Blocks without a timestamp expire with the newest one seen before them.
+            self._ring.append((minute if minute is not None else self._newest_minute, block))
+
+    def _expired_count(self) -> int:
+        ring = self._ring
+        count = 0
+        if self.policy.max_blocks is not None:
+            count = max(0, len(ring) - self.policy.max_blocks)
+        if self.policy.max_minutes is not None and self._newest_minute is not None:
+            while count < len(ring):
+                minute = ring[count][0]
+                age = _behind(minute, self._newest_minute) if minute is not None else None
+                if age is None or age <= self.policy.max_minutes:
+                    break
+                count += 1
+        return count
+
+    def _record(self, blocks: List[DclBlock]) -> None:
+        self.evicted_count += len(blocks)
+        for block in blocks:
+            source = block.source or self.default_source
+            if source is None:
+                continue
+            last = self.evicted[-1] if self.evicted else None
+            if (
+                last is not None
+                and last.source == source
+                and last.end <= block.start_offset
+                and last.count < self.span_blocks
+            ):
+                last.end = block.end_offset
+                last.count += 1
+            else:
+                self.evicted.append(EvictedSpan(source, block.start_offset, block.end_offset, 1))
+
+
+def _behind(minute: int, newest: int) -> int | None:
+    """Minutes *minute* lies behind *newest*, across a month rollover; ``None`` if it is not behind.
+
+    DDHHMM minutes are ambiguous at a rollover, so the shorter of the two
+    directions wins: day 31 23:58 is 7 minutes behind day 1 00:05, not ahead.
+    """
+
+    behind = elapsed_minutes(minute, newest)
+    ahead = elapsed_minutes(newest, minute)
+    if behind is None or (ahead is not None and 0 < ahead < behind):
+        return None
+    return behind
+
+
+def read_span(span: EvictedSpan, chunk_bytes: int = STREAM_CHUNK_BYTES) -> List[DclBlock]:
+    """Parse the blocks of *span* again by reading its byte range from the source file."""
+
+    tokenizer = IncrementalTokenizer()
+    blocks: List[DclBlock] = []
+    with Path(span.source).open("rb") as handle:
+        handle.seek(span.start)
+        remaining = span.end - span.start
+        while remaining > 0:
+            chunk = handle.read(min(chunk_bytes, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            for start, end, raw in tokenizer.feed(chunk):
+                block = parse_block(raw, span.start + start, span.start + end)
+                block.source = span.source
+                blocks.append(block)
+    return blocks
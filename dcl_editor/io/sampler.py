@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from ..core.classifier import classify_block
+from ..core.extractor import extract_keys, minutes_to_timestamp, timestamp_minutes
+from ..core.models import DclType
+from ..core.normalizer import normalize_block_bytes
+from ..core.tokenizer import find_block_spans
+
+
+DEFAULT_SAMPLES = 256
+DEFAULT_WINDOW_BYTES = 8 << 10
+# Blocks starting inside a window are completed from this much extra data.
+FRAME_SLACK_BYTES = 16 << 10
+Z_95 = 1.96
+
+# (type, upper-case callsign, ts) of one sampled block.
+BlockKeys = tuple[DclType, Optional[str], Optional[str]]
+
+
+@dataclass(slots=True)
+class Estimate:
+    """A scaled-up count with its 95% confidence interval."""
+
+    value: float
+    low: float
+    high: float
+
+    def describe(self) -> str:
+        if self.low == self.high:
+            return f"{self.value:,.0f}"
+        return f"~{self.value:,.0f} ({self.low:,.0f}–{self.high:,.0f})"
+
+
+@dataclass(slots=True)
+class SampleReport:
+    path: str
+    file_bytes: int
+    samples: int
+    sampled_bytes: int
+    sampled_blocks: int
+    exact: bool
+    total: Estimate
+    types: Dict[DclType, Estimate] = field(default_factory=dict)
+    callsigns: List[tuple[str, Estimate]] = field(default_factory=list)
+    first_ts: Optional[str] = None
+    last_ts: Optional[str] = None
+    elapsed: float = 0.0
+
+
+def sample_log(
+    path: str | Path,
+    samples: int = DEFAULT_SAMPLES,
+    window_bytes: int = DEFAULT_WINDOW_BYTES,
+    top: int = 5,
+    seed: int | None = None,
+) -> SampleReport:
+    """Estimate the contents of the log at *path* from *samples* random windows.
+
+    The file is cut into *samples* equal strata and one window of
+    *window_bytes* is read at a random offset in each. Blocks whose <STX> lies
+    inside a window are normalized, classified and keyed like a full load
+    (without building display text), so counts per window
+    scale up to the whole file; the spread between windows gives the
+    confidence intervals. The head and tail of the file are read as well to
+    bound the time span. Files smaller than the sampled bytes are parsed in
+    full and reported exactly. *samples* and *window_bytes* must be positive.
+    """
+
+    if samples < 1 or window_bytes < 1:
+        raise ValueError(f"samples and window_bytes must be positive, got {samples} and {window_bytes}")
+    started = time.perf_counter()
+    path = Path(path)
+    rng = random.Random(seed)
+    with path.open("rb") as handle:
+        size = handle.seek(0, 2)
+        if size <= samples * window_bytes:
+            handle.seek(0)
+            data = handle.read()
+            windows = [[_block_keys(data[start:end]) for start, end in find_block_spans(data)]]
+            report = _report(path, size, windows, size, size, top, exact=True)
+        else:
+            stratum = size / samples
+            windows = []
+            for number in range(samples):
+                low = int(number * stratum)
+                offset = rng.randint(low, max(low, int((number + 1) * stratum) - window_bytes))
+                windows.append(_read_window(handle, offset, window_bytes))
+            report = _report(path, size, windows, window_bytes, samples * window_bytes, top, exact=False)
+            edges = _read_window(handle, 0, window_bytes) + _read_window(handle, size - window_bytes, window_bytes)
+            _widen_span(report, edges)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def _read_window(handle, offset: int, window_bytes: int) -> List[BlockKeys]:
+    handle.seek(offset)
+    data = handle.read(window_bytes + FRAME_SLACK_BYTES)
+    return [_block_keys(data[start:end]) for start, end in find_block_spans(data) if start < window_bytes]
+
+
+def _block_keys(raw: bytes) -> BlockKeys:
+    clean = normalize_block_bytes(raw)
+    lines = clean.split("\n") if clean else []
+    callsign, ts = extract_keys(lines)
+    return classify_block(lines), callsign.upper() if callsign else None, ts
+
+
+def _report(
+    path: Path,
+    size: int,
+    windows: Sequence[List[BlockKeys]],
+    window_bytes: int,
+    sampled_bytes: int,
+    top: int,
+    exact: bool,
+) -> SampleReport:
+    scale = size / window_bytes if window_bytes else 0.0
+    # Finite population correction: sampling most of the file leaves little doubt.
+    correction = max(0.0, 1.0 - sampled_bytes / size) if size else 0.0
+    type_counts = [Counter(block_type for block_type, _, _ in blocks) for blocks in windows]
+    callsign_counts = [Counter(callsign for _, callsign, _ in blocks if callsign) for blocks in windows]
+    types: Counter[DclType] = Counter()
+    callsigns: Counter[str] = Counter()
+    for counts in type_counts:
+        types.update(counts)
+    for counts in callsign_counts:
+        callsigns.update(counts)
+    report = SampleReport(
+        path=str(path),
+        file_bytes=size,
+        samples=len(windows),
+        sampled_bytes=sampled_bytes,
+        sampled_blocks=sum(len(blocks) for blocks in windows),
+        exact=exact,
+        total=_scaled([len(blocks) for blocks in windows], scale, correction),
+    )
+    for block_type in sorted(types):
+        report.types[block_type] = _scaled([counts[block_type] for counts in type_counts], scale, correction)
+    for callsign, _ in callsigns.most_common(top):
+        estimate = _scaled([counts[callsign] for counts in callsign_counts], scale, correction)
+        report.callsigns.append((callsign, estimate))
+    _widen_span(report, [block for blocks in windows for block in blocks])
+    return report
+
+
+def _scaled(counts: Sequence[int], scale: float, correction: float) -> Estimate:
+    """Scale per-window *counts* to the file with a normal-approximation interval."""
+
+    samples = len(counts)
+    mean = sum(counts) / samples
+    value = mean * scale
+    if samples < 2 or not correction:
+        return Estimate(value, value, value)
+    variance = sum((count - mean) ** 2 for count in counts) / (samples - 1)
+    margin = Z_95 * scale * math.sqrt(variance * correction / samples)
+    # The blocks actually seen are a hard lower bound.
+    return Estimate(value, max(float(sum(counts)), value - margin), value + margin)
+
+
+def _widen_span(report: SampleReport, blocks: Sequence[BlockKeys]) -> None:
+    minutes = [minute for minute in (timestamp_minutes(ts) for _, _, ts in blocks) if minute is not None]
+    for ts in (report.first_ts, report.last_ts):
+        minute = timestamp_minutes(ts)
+        if minute is not None:
+            minutes.append(minute)
+    if minutes:
+        report.first_ts = minutes_to_timestamp(min(minutes))
+        report.last_ts = minutes_to_timestamp(max(minutes))
+
+
+def format_sample_report(report: SampleReport) -> List[str]:
+    """Render *report* as plain text lines for the CLI."""
+
+    kind = "Parsed in full" if report.exact else f"Estimated from {report.samples} samples"
+    lines = [
+        f"{kind}: {report.sampled_blocks} blocks in {report.sampled_bytes:,} of {report.file_bytes:,} bytes"
+        f" ({report.elapsed:.2f}s)",
+        f"Blocks: {report.total.describe()}",
+    ]
+    total = report.total.value or 1.0
+    for block_type, estimate in report.types.items():
+        lines.append(f"  {block_type:<8}{estimate.describe()}  {estimate.value / total:.0%}")
+    if report.first_ts:
+        lines.append(f"Time span: {report.first_ts} – {report.last_ts}")
+    if report.callsigns:
+        lines.append("Top callsigns:")
+        for callsign, estimate in report.callsigns:
+            lines.append(f"  {callsign:<8}{estimate.describe()}")
+    return lines
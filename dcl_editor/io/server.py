@@ -0,0 +1,240 @@
+"""Headless HTTP/JSON access to a parsed log.
+
+Endpoints (all ``GET``, JSON responses)::
+
+    /health
+    /stats?top=5
+    /blocks?q=<query>&text=<words>&after=<id>&limit=100
+    /search?text=<words>&after=<id>&limit=100
+
+``/blocks`` accepts the filter query language; ``id`` is a block's position in
+the loaded log and pages are requested with the ``next`` cursor of the
+previous response (keyset pagination), so paging stays stable and cheap.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, List, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+from .export import block_record
+from .indexer import DclIndexer
+from .loader import LogLoader
+from .query import QuerySyntaxError, TextPredicate, run_query
+from .stats import DclStatistics
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_ROWS = 200
+# Cached result vectors hold at most this many ids in total (8 bytes each).
+CACHE_IDS = 4_000_000
+
+
+class _ResultCache:
+    """LRU cache of result vectors bounded by entry count and by the total number of ids held.
+
+    Ids are stored as compact ``array("q")`` vectors; a result larger than the
+    whole id budget is returned without being cached.
+    """
+
+    def __init__(self, compute, max_entries: int, max_ids: int) -> None:
+        self._compute = compute
+        self.max_entries = max_entries
+        self.max_ids = max_ids
+        self.hits = 0
+        self.misses = 0
+        self.ids = 0
+        self._entries: OrderedDict[tuple[str, str], array] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __call__(self, query: str, text: str) -> array:
+        key = (query, text)
+        with self._lock:
+            ids = self._entries.get(key)
+            if ids is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return ids
+            self.misses += 1
+        ids = array("q", self._compute(query, text))
+        if len(ids) > self.max_ids or self.max_entries <= 0:
+            return ids
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = ids
+                self.ids += len(ids)
+            while len(self._entries) > self.max_entries or self.ids > self.max_ids:
+                _, evicted = self._entries.popitem(last=False)
+                self.ids -= len(evicted)
+        return ids
+
+
+class QueryService:
+    """Parse a log once and answer filter, search and statistics requests.
+
+    The indexer is never modified after loading, so any number of request
+    threads can read it concurrently. Result vectors of recent queries are
+    kept in an LRU cache of at most *cache_size* queries and *cache_ids* ids.
+    """
+
+    def __init__(self, path: str | Path, cache_size: int = 256, cache_ids: int = CACHE_IDS) -> None:
+        self.path = Path(path)
+        self.loader = loader = LogLoader()
+        blocks = loader.load(self.path)
+        self.indexer = DclIndexer()
+        self.indexer.rebuild(blocks)
+        self.statistics = DclStatistics()
+        self.statistics.extend(blocks)
+        self.statistics.record_dangling(loader.dangling_starts)
+        self.matching = _ResultCache(self._evaluate, cache_size, cache_ids)
+
+    def _evaluate(self, query: str, text: str) -> List[int]:
+        extra = [TextPredicate(text.upper())] if text else []
+        return run_query(query, self.indexer, extra, self.loader.read_text).indices
+
+    def page(self, query: str = "", text: str = "", after: int = -1, limit: int = DEFAULT_PAGE_SIZE):
+        """Return ``(ids, next_cursor, total)`` for the rows after *after*.
+
+        Raises :class:`QuerySyntaxError` for invalid queries.
+        """
+
+        ids = self.matching(query.strip(), text.strip())
+        start = bisect_right(ids, after)
+        page = ids[start : start + limit].tolist()
+        cursor = page[-1] if page and start + limit < len(ids) else None
+        return page, cursor, len(ids)
+
+    def stats(self, top: int = 5) -> dict:
+        stats = self.statistics
+        cache = self.matching
+        return {
+            "path": str(self.path),
+            "blocks": stats.total,
+            "types": dict(sorted(stats.type_counts.items())),
+            "unknown_rate": stats.unknown_rate,
+            "malformed_rate": stats.malformed_rate,
+            "dangling_starts": stats.dangling_starts,
+            "top_callsigns": stats.top_callsigns(top),
+            "anomalies": {flag.name.lower(): count for flag, count in self.indexer.anomaly_counts().items()},
+            "cache": {"hits": cache.hits, "misses": cache.misses, "size": len(cache), "ids": cache.ids},
+        }
+
+    def rows(self, ids: Sequence[int]) -> Iterator[dict]:
+        blocks = self.indexer.blocks
+        for idx in ids:
+            record = block_record(blocks[idx], self.loader.read_text)
+            record["id"] = idx
+            yield record
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "QueryServer"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        service = self.server.service
+        try:
+            if url.path == "/health":
+                self._send_json({"status": "ok", "blocks": len(service.indexer.blocks)})
+            elif url.path == "/stats":
+                self._send_json(service.stats(top=_int(params, "top", 5)))
+            elif url.path in ("/blocks", "/search"):
+                if url.path == "/search" and not params.get("text"):
+                    raise ValueError("Missing 'text' parameter")
+                limit = min(max(_int(params, "limit", DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+                ids, cursor, total = service.page(
+                    params.get("q", ""), params.get("text", ""), _int(params, "after", -1), limit
+                )
+                self._send_rows(service, ids, cursor, total)
+            else:
+                self._send_json({"error": f"Unknown endpoint {url.path}"}, status=404)
+        except (QuerySyntaxError, ValueError) as exc:
+            self._send_json({"error": str(exc)}, status=400)
+
+    def _send_json(self, payload: dict, status: int = 200) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_rows(self, service: QueryService, ids: Sequence[int], cursor: int | None, total: int) -> None:
+        """Stream a page with chunked transfer encoding, a few hundred rows per chunk."""
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._write_chunk(b'{"rows":[')
+        pending: List[str] = []
+        first = True
+        for record in service.rows(ids):
+            pending.append(json.dumps(record, ensure_ascii=False))
+            if len(pending) >= STREAM_ROWS:
+                self._write_chunk(("" if first else ",").encode() + ",".join(pending).encode("utf-8"))
+                pending.clear()
+                first = False
+        if pending:
+            self._write_chunk(("" if first else ",").encode() + ",".join(pending).encode("utf-8"))
+        self._write_chunk(f'],"next":{json.dumps(cursor)},"total":{total}}}'.encode("utf-8"))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - signature from http.server
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _int(params: dict, name: str, default: int) -> int:
+    value = params.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError as exc:
+        raise ValueError(f"Parameter {name!r} must be an integer") from exc
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Serve a :class:`QueryService` to concurrent clients, one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(self, service: QueryService, host: str = "127.0.0.1", port: int = 0, verbose: bool = False) -> None:
+        super().__init__((host, port), _RequestHandler)
+        self.service = service
+        self.verbose = verbose
+        self._thread: threading.Thread | None = None
+
+    @property
+    def bound_port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.1}, name="dcl-query-server", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
@@ -0,0 +1,564 @@
+"""Share a parsed log between viewer instances on one host.
+
+The first viewer to parse a file publishes its blocks and indexes as columnar
+segments in :mod:`multiprocessing.shared_memory`. A small manifest segment,
+named after the file's identity, lists the segments, the file state they
+describe and the PIDs of the viewers holding it. Later viewers attach to it
+instead of parsing the file again; the owner appends blocks parsed afterwards
+as new segments. Attaching skips parsing only: each viewer still rebuilds its
+own block objects from the columns, so memory is not shared between viewers.
+
+The last viewer to release the store removes every segment, and holders whose
+process has exited are reaped whenever the manifest is opened, so a crashed
+viewer does not leak its segments. The owner keeps its segments open until it
+releases the store, since on Windows a named segment disappears as soon as its
+last handle is closed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+from array import array
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Sequence, get_args
+
+from ..core.models import DclAnomaly, DclBlock, DclType
+from ..core.normalizer import DIGEST_BYTES
+from .indexer import DclIndexer, anomaly_bitmaps
+from .multiload import LoadedFile
+
+
+STORE_VERSION = 5
+MANIFEST_BYTES = 64 * 1024
+MAX_SEGMENTS = 256
+LOCK_TIMEOUT_SECONDS = 5.0
+
+_MANIFEST_HEADER = struct.Struct("<4siI")
+_MAGIC = b"DCLS"
+_TYPES: tuple[DclType, ...] = get_args(DclType)
+_TYPE_CODES = {block_type: code for code, block_type in enumerate(_TYPES)}
+_TEXT_FIELDS = ("ts", "callsign", "summary", "preview_text", "full_block_text", "metadata_json", "source")
+
+
+def store_key(path: str | Path) -> str:
+    """Return the name shared by all viewers of *path*: its resolved path, device and inode."""
+
+    path = Path(path).resolve()
+    stat = path.stat()
+    identity = f"{path}\0{stat.st_dev}\0{stat.st_ino}".encode("utf-8", errors="surrogateescape")
+    return hashlib.sha1(identity).hexdigest()[:16]
+
+
+class SharedLogStore:
+    """A parsed log published in shared memory, seen from one viewer.
+
+    Use :meth:`publish` to create a store from a freshly parsed log or
+    :meth:`attach` to reuse one; both take a reference that :meth:`release`
+    drops again.
+    """
+
+    def __init__(self, key: str, manifest: shared_memory.SharedMemory, owner: bool) -> None:
+        self.key = key
+        self.owner = owner
+        self._manifest = manifest
+        self._consumed = 0
+        self._released = False
+        # Data segments this viewer created, open for the store's lifetime.
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+
+    # Creating and attaching ---------------------------------------------
+    @classmethod
+    def publish(cls, path: str | Path, indexer: DclIndexer, dangling_starts: int = 0) -> "SharedLogStore | None":
+        """Publish *indexer* as the parsed state of *path*.
+
+        If another viewer published the same file state first, its store is
+        attached instead; if it published an older state, nothing is shared
+        and ``None`` is returned.
+        """
+
+        path = Path(path).resolve()
+        key = store_key(path)
+        stat = path.stat()
+        with _HostLock(key):
+            existing = _open(_manifest_name(key))
+            if existing is not None:
+                store = cls(key, existing, owner=False)
+                info = store._read_manifest()
+                if _reap(info):
+                    if not _describes(info, stat):
+                        existing.close()
+                        return None
+                    store._hold(info)
+                    # The caller parsed the same file state, so every published block is already in hand.
+                    store._consumed = sum(count for _, count in info["segments"])
+                    return store
+                store._discard(info)
+            manifest = _create(_manifest_name(key), MANIFEST_BYTES)
+            store = cls(key, manifest, owner=True)
+            segment = _write_segment(f"{_segment_prefix(key)}0", indexer)
+            store._segments[segment.name] = segment
+            store._write_manifest(
+                {
+                    "version": STORE_VERSION,
+                    "holders": [os.getpid()],
+                    "path": str(path),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "dangling_starts": dangling_starts,
+                    "segments": [[segment.name, len(indexer.blocks)]],
+                    "next_segment": 1,
+                    "end": max((block.end_offset for block in indexer.blocks), default=0),
+                },
+            )
+        store._consumed = len(indexer.blocks)
+        return store
+
+    @classmethod
+    def attach(cls, path: str | Path) -> "SharedLogStore | None":
+        """Attach to the store of *path* if one describes the file as it is now."""
+
+        path = Path(path).resolve()
+        key = store_key(path)
+        stat = path.stat()
+        with _HostLock(key):
+            manifest = _open(_manifest_name(key))
+            if manifest is None:
+                return None
+            store = cls(key, manifest, owner=False)
+            info = store._read_manifest()
+            if not _reap(info):
+                store._discard(info)
+                return None
+            if not _describes(info, stat):
+                manifest.close()
+                return None
+            store._hold(info)
+        return store
+
+    # Reading --------------------------------------------------------------
+    def load(self) -> LoadedFile:
+        """Rebuild the published blocks and indexes without parsing the log."""
+
+        with _HostLock(self.key):
+            info = self._read_manifest()
+            indexers = [_read_segment(name) for name, _ in info["segments"]]
+        indexer = DclIndexer()
+        indexer.merge(indexers)
+        self._consumed = len(indexer.blocks)
+        # Tag blocks with the published file so their raw bytes can be read back.
+        for block in indexer.blocks:
+            if block.source is None:
+                block.source = info["path"]
+        return LoadedFile(
+            path=Path(info["path"]),
+            size=info["size"],
+            mtime_ns=info["mtime_ns"],
+            indexer=indexer,
+            dangling_starts=info["dangling_starts"],
+        )
+
+    def refresh(self) -> List[DclBlock]:
+        """Return blocks the owner published since the last :meth:`load` or :meth:`refresh`."""
+
+        blocks: List[DclBlock] = []
+        first = 0
+        with _HostLock(self.key):
+            info = self._read_manifest()
+            for name, count in info["segments"]:
+                if first + count > self._consumed:
+                    skip = max(self._consumed - first, 0)
+                    for block in _read_segment(name).blocks[skip:]:
+                        block.source = block.source or info["path"]
+                        blocks.append(block)
+                first += count
+        self._consumed = first
+        return blocks
+
+    # Publishing more --------------------------------------------------------
+    def append(self, blocks: Sequence[DclBlock], size: int, mtime_ns: int) -> None:
+        """Publish *blocks* parsed from the file's growth to *size* bytes; owner only."""
+
+        if not self.owner:
+            raise RuntimeError("Only the viewer that published a store can append to it")
+        if not blocks:
+            return
+        with _HostLock(self.key):
+            info = self._read_manifest()
+            segments = info["segments"]
+            chunk = DclIndexer()
+            if len(segments) >= MAX_SEGMENTS:
+                # Fold every segment into one so the manifest stays small.
+                chunk.merge([_read_segment(name) for name, _ in segments])
+                chunk.extend(blocks)
+                retired = [name for name, _ in segments]
+                segments = []
+            else:
+                chunk.rebuild(blocks)
+                retired = []
+            segment = _write_segment(f"{_segment_prefix(self.key)}{info['next_segment']}", chunk)
+            self._segments[segment.name] = segment
+            segments.append([segment.name, len(chunk.blocks)])
+            info.update(
+                segments=segments,
+                next_segment=info["next_segment"] + 1,
+                size=size,
+                mtime_ns=mtime_ns,
+                end=max(info["end"], max(block.end_offset for block in blocks)),
+            )
+            self._write_manifest(info)
+            for name in retired:
+                self._close_segment(name)
+                _unlink(name)
+        self._consumed += len(blocks)
+
+    def release(self) -> None:
+        """Drop this viewer's reference; the last one removes the shared segments."""
+
+        if self._released:
+            return
+        self._released = True
+        with _HostLock(self.key):
+            info = self._read_manifest()
+            holders = info["holders"]
+            if os.getpid() in holders:
+                holders.remove(os.getpid())
+            if _reap(info):
+                self._write_manifest(info)
+                for name in list(self._segments):
+                    self._close_segment(name)
+                self._manifest.close()
+            else:
+                self._discard(info)
+
+    def _discard(self, info: dict) -> None:
+        """Remove the whole store once no live viewer holds it; the caller holds the lock."""
+
+        for name, _ in info["segments"]:
+            _unlink(name)
+        for name in list(self._segments):
+            self._close_segment(name)
+        self._manifest.close()
+        _unlink(self._manifest.name)
+
+    def _close_segment(self, name: str) -> None:
+        segment = self._segments.pop(name, None)
+        if segment is not None:
+            segment.close()
+
+    # Manifest ----------------------------------------------------------------
+    def _read_manifest(self) -> dict:
+        """Parse the manifest; callers hold :class:`_HostLock` so no update is half written."""
+
+        buffer = self._manifest.buf
+        magic, _, length = _MANIFEST_HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Shared store {self.key} has an invalid manifest")
+        start = _MANIFEST_HEADER.size
+        return json.loads(bytes(buffer[start : start + length]))
+
+    def _write_manifest(self, info: dict) -> None:
+        payload = json.dumps(info).encode("utf-8")
+        if _MANIFEST_HEADER.size + len(payload) > MANIFEST_BYTES:
+            raise ValueError(f"Shared store manifest exceeds {MANIFEST_BYTES} bytes")
+        buffer = self._manifest.buf
+        start = _MANIFEST_HEADER.size
+        buffer[start : start + len(payload)] = payload
+        _MANIFEST_HEADER.pack_into(buffer, 0, _MAGIC, len(info["holders"]), len(payload))
+
+    @property
+    def end(self) -> int:
+        """Byte offset after the last published block; the owner parses new blocks from here."""
+
+        with _HostLock(self.key):
+            return self._read_manifest()["end"]
+
+    def describes(self, stat: os.stat_result) -> bool:
+        """Return whether the store was published for a file in the state *stat*."""
+
+        with _HostLock(self.key):
+            return _describes(self._read_manifest(), stat)
+
+    def _hold(self, info: dict) -> None:
+        info["holders"].append(os.getpid())
+        self._write_manifest(info)
+
+
+def _reap(info: dict) -> bool:
+    """Drop holders whose process has exited; return whether any viewer still holds the store."""
+
+    info["holders"] = [pid for pid in info.get("holders", []) if _process_alive(pid)]
+    return bool(info["holders"])
+
+
+def _describes(info: dict, stat: os.stat_result) -> bool:
+    return info.get("version") == STORE_VERSION and (info["size"], info["mtime_ns"]) == (
+        stat.st_size,
+        stat.st_mtime_ns,
+    )
+
+
+# Segments --------------------------------------------------------------------
+def _write_segment(name: str, indexer: DclIndexer) -> shared_memory.SharedMemory:
+    """Serialize the blocks and indexes of *indexer* column by column."""
+
+    blocks = indexer.blocks
+    columns: dict[str, bytes] = {
+        "start": array("q", [block.start_offset for block in blocks]).tobytes(),
+        "end": array("q", [block.end_offset for block in blocks]).tobytes(),
+        "type": bytes(_TYPE_CODES[block.type] for block in blocks),
+        "enriched": bytes(block.enriched for block in blocks),
+        "anomalies": array("q", [block.anomalies for block in blocks]).tobytes(),
+        "repeat_count": array("q", [block.repeat_count for block in blocks]).tobytes(),
+        "digest": b"".join(block.digest or bytes(DIGEST_BYTES) for block in blocks),
+        "digest.nulls": bytes(block.digest is None for block in blocks),
+        "time_keys": array("q", indexer.time_keys).tobytes(),
+        "time_positions": array("q", indexer.time_positions).tobytes(),
+    }
+    for field in _TEXT_FIELDS:
+        _pack_text(columns, field, [getattr(block, field) for block in blocks])
+    keys = list(indexer.callsign_index)
+    _pack_text(columns, "callsign_keys", keys)
+    _pack_positions(columns, "callsign_positions", [indexer.callsign_index[key] for key in keys])
+    _pack_positions(columns, "type_positions", [indexer.type_index.get(block_type, []) for block_type in _TYPES])
+    _pack_positions(columns, "duplicate_offsets", [block.duplicate_offsets or () for block in blocks])
+
+    layout = {}
+    offset = 0
+    for column, data in columns.items():
+        layout[column] = [offset, len(data)]
+        offset += len(data)
+    header = json.dumps({"count": len(blocks), "columns": layout}).encode("utf-8")
+    segment = _create(name, 8 + len(header) + offset)
+    buffer = segment.buf
+    struct.pack_into("<Q", buffer, 0, len(header))
+    buffer[8 : 8 + len(header)] = header
+    position = 8 + len(header)
+    for data in columns.values():
+        buffer[position : position + len(data)] = data
+        position += len(data)
+    return segment
+
+
+def _read_segment(name: str) -> DclIndexer:
+    segment = _open(name)
+    if segment is None:
+        raise FileNotFoundError(f"Shared segment {name} no longer exists")
+    try:
+        buffer = segment.buf
+        (length,) = struct.unpack_from("<Q", buffer, 0)
+        header = json.loads(bytes(buffer[8 : 8 + length]))
+        base = 8 + length
+        data = {
+            column: bytes(buffer[base + start : base + start + size])
+            for column, (start, size) in header["columns"].items()
+        }
+    finally:
+        segment.close()
+
+    count = header["count"]
+    starts, ends, anomalies = _ints(data["start"]), _ints(data["end"]), _ints(data["anomalies"])
+    repeats = _ints(data["repeat_count"])
+    duplicates = _unpack_positions(data, "duplicate_offsets")
+    digests, digest_nulls = data["digest"], data["digest.nulls"]
+    texts = {field: _unpack_text(data, field) for field in _TEXT_FIELDS}
+    indexer = DclIndexer()
+    indexer.blocks = [
+        DclBlock(
+            start_offset=starts[idx],
+            end_offset=ends[idx],
+            ts=texts["ts"][idx],
+            type=_TYPES[data["type"][idx]],
+            callsign=texts["callsign"][idx],
+            summary=texts["summary"][idx] or "",
+            preview_text=texts["preview_text"][idx] or "",
+            full_block_text=texts["full_block_text"][idx] or "",
+            metadata_json=texts["metadata_json"][idx],
+            enriched=bool(data["enriched"][idx]),
+            repeat_count=repeats[idx],
+            duplicate_offsets=duplicates[idx] or None,
+            source=texts["source"][idx],
+            anomalies=DclAnomaly(anomalies[idx]),
+            digest=None if digest_nulls[idx] else digests[idx * DIGEST_BYTES : (idx + 1) * DIGEST_BYTES],
+        )
+        for idx in range(count)
+    ]
+    keys = _unpack_text(data, "callsign_keys")
+    for key, positions in zip(keys, _unpack_positions(data, "callsign_positions")):
+        indexer.callsign_index[key] = positions
+    for block_type, positions in zip(_TYPES, _unpack_positions(data, "type_positions")):
+        if positions:
+            indexer.type_index[block_type] = positions
+    indexer.time_keys = _ints(data["time_keys"]).tolist()
+    indexer.time_positions = _ints(data["time_positions"]).tolist()
+    indexer.anomaly_bitmaps = anomaly_bitmaps(indexer.blocks)
+    return indexer
+
+
+def _pack_text(columns: dict[str, bytes], name: str, values: Sequence[str | None]) -> None:
+    encoded = [value.encode("utf-8", errors="surrogateescape") if value is not None else b"" for value in values]
+    bounds = array("q", [0])
+    for item in encoded:
+        bounds.append(bounds[-1] + len(item))
+    columns[f"{name}.bounds"] = bounds.tobytes()
+    columns[f"{name}.nulls"] = bytes(value is None for value in values)
+    columns[f"{name}.heap"] = b"".join(encoded)
+
+
+def _unpack_text(data: dict[str, bytes], name: str) -> List[str | None]:
+    bounds, nulls, heap = _ints(data[f"{name}.bounds"]), data[f"{name}.nulls"], data[f"{name}.heap"]
+    return [
+        None if nulls[idx] else heap[bounds[idx] : bounds[idx + 1]].decode("utf-8", errors="surrogateescape")
+        for idx in range(len(nulls))
+    ]
+
+
+def _pack_positions(columns: dict[str, bytes], name: str, lists: Sequence[Sequence[int]]) -> None:
+    bounds = array("q", [0])
+    for positions in lists:
+        bounds.append(bounds[-1] + len(positions))
+    columns[f"{name}.bounds"] = bounds.tobytes()
+    columns[f"{name}.positions"] = array("q", [idx for positions in lists for idx in positions]).tobytes()
+
+
+def _unpack_positions(data: dict[str, bytes], name: str) -> List[List[int]]:
+    bounds, positions = _ints(data[f"{name}.bounds"]), _ints(data[f"{name}.positions"])
+    return [positions[bounds[idx] : bounds[idx + 1]].tolist() for idx in range(len(bounds) - 1)]
+
+
+def _ints(data: bytes) -> array:
+    values = array("q")
+    values.frombytes(data)
+    return values
+
+
+# Shared memory helpers -------------------------------------------------------
+def _manifest_name(key: str) -> str:
+    return f"dcl{key}m"
+
+
+def _segment_prefix(key: str) -> str:
+    return f"dcl{key}s"
+
+
+def _create(name: str, size: int) -> shared_memory.SharedMemory:
+    segment = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+    _untrack(segment)
+    return segment
+
+
+def _open(name: str) -> shared_memory.SharedMemory | None:
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return None
+    _untrack(segment)
+    return segment
+
+
+def _unlink(name: str) -> None:
+    # Opened without _untrack: unlink() drops the tracker registration again.
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    if os.name != "nt":
+        segment.unlink()
+
+
+def _untrack(segment: shared_memory.SharedMemory) -> None:
+    # The POSIX resource tracker would unlink segments when this process
+    # exits, even while other viewers still use them; lifetime is governed by
+    # the manifest's reference count instead.
+    if os.name != "nt":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(segment._name, "shared_memory")  # type: ignore[attr-defined]
+
+
+class _HostLock:
+    """An OS file lock in the temp directory serializing manifest access across processes.
+
+    The kernel drops the lock when the process holding it exits, so a crashed
+    viewer never leaves a stale lock to take over. The small lock file itself
+    is left in place. Waiting gives up with :class:`TimeoutError` after
+    *timeout* seconds.
+    """
+
+    def __init__(self, key: str, timeout: float = LOCK_TIMEOUT_SECONDS) -> None:
+        self.path = Path(tempfile.gettempdir()) / f"dcl-{key}.lock"
+        self.timeout = timeout
+        self._fd: int | None = None
+
+    def __enter__(self) -> "_HostLock":
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o666)
+        deadline = time.monotonic() + self.timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise TimeoutError(f"Timed out waiting for the shared store lock {self.path}")
+            time.sleep(0.005)
+        self._fd = fd
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._fd is not None:
+            _unlock(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+
+def _try_lock(fd: int) -> bool:
+    if os.name == "nt":
+        import msvcrt
+
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    import fcntl
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        import ctypes
+
+        # os.kill(pid, 0) would terminate the process on Windows.
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from ..core.extractor import timestamp_minutes
+from ..core.models import DclAnomaly, DclBlock, DclType
+
+
+STATS_SUFFIX = ".dclstats"
+STATS_VERSION = 1
+
+
+class DclStatistics:
+    """Mergeable counters maintained as blocks are appended."""
+
+    def __init__(self, bucket_minutes: int = 60) -> None:
+        self.bucket_minutes = bucket_minutes
+        self.total = 0
+        self.unknown = 0
+        self.malformed = 0
+        self.dangling_starts = 0
+        self.type_counts: Counter[DclType] = Counter()
+        self.callsign_counts: Counter[str] = Counter()
+        self.bucket_counts: Dict[int, Counter[DclType]] = {}
+
+    def add(self, block: DclBlock) -> None:
+        self.total += 1
+        self.type_counts[block.type] += 1
+        if block.type == "UNKNOWN":
+            self.unknown += 1
+        if block.callsign:
+            self.callsign_counts[block.callsign.upper()] += 1
+        minute = timestamp_minutes(block.ts)
+        if not block.callsign or minute is None:
+            self.malformed += 1
+        if minute is not None:
+            bucket = minute - minute % self.bucket_minutes
+            self.bucket_counts.setdefault(bucket, Counter())[block.type] += 1
+
+    def extend(self, blocks: Iterable[DclBlock]) -> None:
+        for block in blocks:
+            self.add(block)
+
+    def record_dangling(self, count: int) -> None:
+        self.dangling_starts += count
+
+    def merge(self, other: DclStatistics) -> DclStatistics:
+        """Fold *other* into this aggregate, e.g. the result of another parse shard."""
+
+        if other.bucket_minutes != self.bucket_minutes:
+            raise ValueError("Cannot merge statistics with different bucket sizes")
+        self.total += other.total
+        self.unknown += other.unknown
+        self.malformed += other.malformed
+        self.dangling_starts += other.dangling_starts
+        self.type_counts.update(other.type_counts)
+        self.callsign_counts.update(other.callsign_counts)
+        for bucket, counts in other.bucket_counts.items():
+            self.bucket_counts.setdefault(bucket, Counter()).update(counts)
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "bucket_minutes": self.bucket_minutes,
+            "total": self.total,
+            "unknown": self.unknown,
+            "malformed": self.malformed,
+            "dangling_starts": self.dangling_starts,
+            "type_counts": dict(self.type_counts),
+            "callsign_counts": dict(self.callsign_counts),
+            "bucket_counts": {str(bucket): dict(counts) for bucket, counts in self.bucket_counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> DclStatistics:
+        stats = cls(bucket_minutes=payload["bucket_minutes"])
+        stats.total = payload["total"]
+        stats.unknown = payload["unknown"]
+        stats.malformed = payload["malformed"]
+        stats.dangling_starts = payload["dangling_starts"]
+        stats.type_counts = Counter(payload["type_counts"])
+        stats.callsign_counts = Counter(payload["callsign_counts"])
+        stats.bucket_counts = {int(bucket): Counter(counts) for bucket, counts in payload["bucket_counts"].items()}
+        return stats
+
+    @property
+    def unknown_rate(self) -> float:
+        return self.unknown / self.total if self.total else 0.0
+
+    @property
+    def malformed_rate(self) -> float:
+        return self.malformed / self.total if self.total else 0.0
+
+    def top_callsigns(self, limit: int = 10) -> List[tuple[str, int]]:
+        return self.callsign_counts.most_common(limit)
+
+    def timeline(self) -> List[tuple[int, Dict[DclType, int]]]:
+        return [(bucket, dict(self.bucket_counts[bucket])) for bucket in sorted(self.bucket_counts)]
+
+
+def stats_path_for(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + STATS_SUFFIX)
+
+
+def write_cached_stats(
+    path: str | Path, stats: DclStatistics, anomalies: Dict[DclAnomaly, int], stat: os.stat_result
+) -> None:
+    """Store the aggregates of the log at *path*, whose file had *stat* when it was parsed."""
+
+    with stats_path_for(path).open("w", encoding="utf-8") as handle:
+        json.dump(
+            {
+                "version": STATS_VERSION,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "stats": stats.to_dict(),
+                "anomalies": {flag.name: count for flag, count in anomalies.items()},
+            },
+            handle,
+        )
+
+
+def read_cached_stats(
+    path: str | Path, bucket_minutes: int
+) -> tuple[DclStatistics, Dict[DclAnomaly, int]] | None:
+    """Return the stored aggregates of *path* if its size and mtime still match and the buckets agree."""
+
+    path = Path(path)
+    try:
+        with stats_path_for(path).open(encoding="utf-8") as handle:
+            payload = json.load(handle)
+        stat = path.stat()
+        if (
+            payload.get("version") != STATS_VERSION
+            or payload.get("size") != stat.st_size
+            or payload.get("mtime_ns") != stat.st_mtime_ns
+            or payload["stats"]["bucket_minutes"] != bucket_minutes
+        ):
+            return None
+        stats = DclStatistics.from_dict(payload["stats"])
+        anomalies = {DclAnomaly[name]: count for name, count in payload["anomalies"].items()}
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+    return stats, anomalies
+
+
+def format_report(stats: DclStatistics, top: int = 5, anomalies: Dict[DclAnomaly, int] | None = None) -> List[str]:
+    """Render *stats* as plain text lines for the CLI and the dashboard panel.
+
+    *anomalies* are per-flag counts such as :meth:`DclIndexer.anomaly_counts` returns.
+    """
+
+    lines = [f"Blocks: {stats.total}"]
+    for block_type, count in sorted(stats.type_counts.items()):
+        lines.append(f"  {block_type:<8}{count}")
+    lines.append(f"Unknown: {stats.unknown} ({stats.unknown_rate:.1%})")
+    lines.append(f"Malformed: {stats.malformed} ({stats.malformed_rate:.1%})")
+    lines.append(f"Dangling <STX>: {stats.dangling_starts}")
+    if anomalies:
+        lines.append("Anomalies:")
+        for flag in DclAnomaly:
+            if anomalies.get(flag):
+                lines.append(f"  {flag.name.lower():<18}{anomalies[flag]}")
+    if stats.callsign_counts:
+        lines.append("Top callsigns:")
+        for callsign, count in stats.top_callsigns(top):
+            lines.append(f"  {callsign:<8}{count}")
+    return lines
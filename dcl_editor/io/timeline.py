@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence
+
+from ..core.extractor import timestamp_minutes
+from ..core.models import DclBlock, DclType
+
+
+PYRAMID_LEVELS: tuple[int, ...] = (1, 10, 60, 1440)
+
+
+class TimelinePyramid:
+    """Message counts per type at several bucket resolutions (minutes)."""
+
+    def __init__(self, levels: Sequence[int] = PYRAMID_LEVELS) -> None:
+        self.levels = tuple(sorted(levels))
+        self._buckets: Dict[int, Dict[int, Counter[DclType]]] = {level: {} for level in self.levels}
+        self._keys: Dict[int, List[int]] = {level: [] for level in self.levels}
+        self.first_minute: int | None = None
+        self.last_minute: int | None = None
+
+    def rebuild(self, blocks: Iterable[DclBlock]) -> None:
+        for level in self.levels:
+            self._buckets[level].clear()
+            self._keys[level].clear()
+        self.first_minute = None
+        self.last_minute = None
+        self.extend(blocks)
+
+    def extend(self, blocks: Iterable[DclBlock]) -> None:
+        for block in blocks:
+            self.add(block)
+
+    def add(self, block: DclBlock) -> None:
+        minute = timestamp_minutes(block.ts)
+        if minute is None:
+            return
+        if self.first_minute is None or minute < self.first_minute:
+            self.first_minute = minute
+        if self.last_minute is None or minute > self.last_minute:
+            self.last_minute = minute
+        for level in self.levels:
+            bucket = minute - minute % level
+            counts = self._buckets[level].get(bucket)
+            if counts is None:
+                counts = self._buckets[level][bucket] = Counter()
+                insort(self._keys[level], bucket)
+            counts[block.type] += 1
+
+    def level_for_span(self, span_minutes: int, max_bins: int) -> int:
+        """Return the finest level that shows *span_minutes* in at most *max_bins* buckets."""
+
+        for level in self.levels:
+            if span_minutes / level <= max_bins:
+                return level
+        return self.levels[-1]
+
+    def bins(self, level: int, start: int, end: int) -> List[tuple[int, Counter[DclType]]]:
+        """Return non-empty buckets of *level* overlapping ``[start, end]``."""
+
+        keys = self._keys[level]
+        buckets = self._buckets[level]
+        first = bisect_left(keys, start - start % level)
+        result: List[tuple[int, Counter[DclType]]] = []
+        for key in keys[first:]:
+            if key > end:
+                break
+            result.append((key, buckets[key]))
+        return result
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from dcl_editor.io.alerts import AlertDispatcher
+from dcl_editor.io.query import Query, QuerySyntaxError
+from dcl_editor.tests.test_core import _block
+
+
+def _names(matches):
+    return sorted(match.subscription.name for match in matches)
+
+
+def test_dispatcher_matches_anchored_and_unanchored_subscriptions():
+    alerts = AlertDispatcher()
+    alerts.subscribe("callsign:THY1QN type:CLD", "THY1QN cleared")
+    alerts.subscribe("callsign:THY* type:FSM", "THY errors")
+    alerts.subscribe("type:FSM", "any error")
+    alerts.subscribe("text:PGT", "mentions PGT")
+
+    assert _names(alerts.dispatch(_block("CLD", "THY1QN", "170401"))) == ["THY1QN cleared"]
+    assert _names(alerts.dispatch(_block("RCD", "THY1QN", "170401"))) == []
+    assert _names(alerts.dispatch(_block("FSM", "THY2AB", "170401"))) == ["THY errors", "any error"]
+    assert _names(alerts.dispatch(_block("FSM", "PGT22A", "170401"))) == ["any error", "mentions PGT"]
+
+
+def test_dispatcher_only_checks_candidate_subscriptions(monkeypatch):
+    alerts = AlertDispatcher()
+    for number in range(500):
+        alerts.subscribe(f"callsign:AC{number:03d}X type:CLD")
+    alerts.subscribe("callsign:AC1*", "prefix")
+    checked = []
+    original = Query.matches
+    monkeypatch.setattr(
+        Query,
+        "matches",
+        lambda query, block, read_text: checked.append(query.describe()) or original(query, block, read_text),
+    )
+
+    matches = alerts.dispatch(_block("CLD", "AC123X", "170401"))
+
+    assert _names(matches) == ["callsign:AC123X type:CLD", "prefix"]
+    assert sorted(checked) == ["callsign:AC1*", "callsign:AC123X type:CLD"]
+
+
+def test_unsubscribe_and_logging(caplog):
+    alerts = AlertDispatcher()
+    kept = alerts.subscribe("type:CDA", "departures", log=True)
+    dropped = alerts.subscribe("type:CDA", "dropped")
+    alerts.unsubscribe(dropped.id)
+
+    with caplog.at_level(logging.INFO, logger="dcl_editor.io.alerts"):
+        matches = alerts.dispatch_many([_block("CDA", "THY1QN", "170401"), _block("CLD", "THY1QN", "170402")])
+
+    assert [match.subscription for match in matches] == [kept]
+    assert "[departures] 170401 CDA THY1QN" in caplog.text
+    with pytest.raises(QuerySyntaxError):
+        alerts.subscribe("type:BOGUS")
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pytest
+
+from dcl_editor.cli import main
+from dcl_editor.tests.test_core import SAMPLE
+
+
+def test_stats_command_prints_report(tmp_path, capsys):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE + "<STX>dangling", encoding="utf-8")
+
+    assert main(["stats", str(log), "--timeline"]) == 0
+
+    output = capsys.readouterr().out
+    assert "Blocks: 1" in output
+    assert "CDA" in output
+    assert "Dangling <STX>: 1" in output
+    assert "THY1QN" in output
+    assert "170400  CDA=1" in output
+
+
+def test_stats_command_counts_anomalies(tmp_path, capsys):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE + "\n" + SAMPLE, encoding="utf-8")
+
+    assert main(["stats", str(log)]) == 0
+
+    output = capsys.readouterr().out
+    assert "Anomalies:" in output
+    assert "  duplicate         1" in output
+
+
+def test_stats_command_reports_missing_file(tmp_path, capsys):
+    assert main(["stats", str(tmp_path / "missing.log")]) == 1
+    assert "Could not read file" in capsys.readouterr().out
+
+
+def test_query_command_prints_rows_and_plan(tmp_path, capsys):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE, encoding="utf-8")
+
+    assert main(["query", str(log), "callsign:THY1QN type:CDA", "--explain"]) == 0
+
+    output = capsys.readouterr().out.splitlines()
+    assert output[0].startswith("# index ")
+    assert output[-1].startswith("170439  CDA     THY1QN")
+    assert main(["query", str(log), "type:BOGUS"]) == 2
+
+
+def test_extract_command_writes_sublog(tmp_path, capsys):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE + "\n<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF><ETX>\n", encoding="utf-8")
+    destination = tmp_path / "sub.log"
+
+    assert main(["extract", str(log), str(destination), "callsign:PGT22A"]) == 0
+
+    assert destination.read_bytes() == b"<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF><ETX>"
+    assert "Extracted 1 blocks in 1 ranges" in capsys.readouterr().out
+
+
+def test_peek_command_reports_small_files_exactly(tmp_path, capsys):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE + "<STX>dangling", encoding="utf-8")
+
+    assert main(["peek", str(log)]) == 0
+
+    output = capsys.readouterr().out
+    assert output.startswith("Parsed in full: 1 blocks")
+    assert "Blocks: 1\n" in output
+    assert "Time span: 170439 – 170439" in output
+    assert main(["peek", str(tmp_path / "missing.log")]) == 1
+
+
+def test_peek_rejects_non_positive_samples(tmp_path, capsys):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE, encoding="utf-8")
+
+    with pytest.raises(SystemExit):
+        main(["peek", str(log), "--samples", "0"])
+    assert "must be a positive integer" in capsys.readouterr().err
+
+
+def test_stats_command_reuses_cached_aggregates(tmp_path, capsys, monkeypatch):
+    from dcl_editor.io.loader import LogLoader
+    from dcl_editor.io.stats import stats_path_for
+
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE + "\n" + SAMPLE + "<STX>dangling", encoding="utf-8")
+    assert main(["stats", str(log), "--timeline"]) == 0
+    first = capsys.readouterr().out
+    assert stats_path_for(log).exists()
+
+    calls = []
+    original = LogLoader.load
+    monkeypatch.setattr(LogLoader, "load", lambda self, path: calls.append(path) or original(self, path))
+    assert main(["stats", str(log), "--timeline"]) == 0
+    assert capsys.readouterr().out == first
+    assert calls == []
+
+    assert main(["stats", str(log), "--bucket", "30"]) == 0
+    assert len(calls) == 1
+    with log.open("a", encoding="utf-8") as handle:
+        handle.write(SAMPLE)
+    assert main(["stats", str(log)]) == 0
+    assert len(calls) == 2
+    assert "Blocks: 3" in capsys.readouterr().out
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from dcl_editor.cli import main
+from dcl_editor.core.extractor import timestamp_minutes
+from dcl_editor.io.compare import LogComparer
+from dcl_editor.io.loader import LogLoader, iter_log_blocks
+
+
+def _frame(block_type: str, callsign: str, ts: str, body: str = "CLRD") -> str:
+    return f"<STX>{block_type}<CR><LF>{callsign}<SP>{body}<CR><LF>{ts}<ETX>\n"
+
+
+LEFT = (
+    _frame("RCD", "THY1QN", "170401")
+    + _frame("CLD", "THY1QN", "170402")
+    + _frame("CLD", "PGT22A", "170403")
+    + _frame("CDA", "PGT22A", "170404")
+)
+RIGHT = (
+    _frame("RCD", "THY1QN", "170401")
+    + _frame("CLD", "THY1QN", "170402", body="CLRD VIA VADEN1E")
+    + _frame("CLD", "PGT22A", "170403")
+    + _frame("CLD", "PGT22A", "170403")
+)
+
+
+def test_iter_log_blocks_matches_load(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_text("noise\n" + LEFT, encoding="utf-8")
+
+    streamed = list(iter_log_blocks(log, chunk_bytes=7))
+
+    loaded = LogLoader().load(log)
+    assert [(b.start_offset, b.end_offset, b.full_block_text) for b in streamed] == [
+        (b.start_offset, b.end_offset, b.full_block_text) for b in loaded
+    ]
+
+
+def test_comparer_reports_missing_extra_and_changed(tmp_path):
+    left = tmp_path / "main.log"
+    right = tmp_path / "standby.log"
+    left.write_text(LEFT, encoding="utf-8")
+    right.write_text(RIGHT, encoding="utf-8")
+    comparer = LogComparer(left, right, chunk_bytes=16)
+
+    differences = list(comparer.differences())
+
+    assert [(d.kind, d.key) for d in differences] == [
+        ("changed", ("THY1QN", "CLD", timestamp_minutes("170402"), 0)),
+        ("extra", ("PGT22A", "CLD", timestamp_minutes("170403"), 1)),
+        ("missing", ("PGT22A", "CDA", timestamp_minutes("170404"), 0)),
+    ]
+    changed = differences[0]
+    assert "-THY1QN CLRD" in changed.diff
+    assert "+THY1QN CLRD VIA VADEN1E" in changed.diff
+    assert differences[2].left.callsign == "PGT22A"
+    assert comparer.matched == 2
+    assert comparer.counts == {"changed": 1, "extra": 1, "missing": 1}
+
+
+def test_compare_shift_aligns_two_periods(tmp_path):
+    left = tmp_path / "monday.log"
+    right = tmp_path / "tuesday.log"
+    left.write_text(_frame("CLD", "THY1QN", "170402"), encoding="utf-8")
+    right.write_text(_frame("CLD", "THY1QN", "170412"), encoding="utf-8")
+
+    differences = list(LogComparer(left, right, shift_minutes=-10).differences())
+
+    assert [d.kind for d in differences] == ["changed"]
+    assert differences[0].diff[-2:] == ["-170402", "+170412"]
+
+
+def test_compare_command_prints_summary(tmp_path, capsys):
+    left = tmp_path / "main.log"
+    right = tmp_path / "standby.log"
+    left.write_text(LEFT, encoding="utf-8")
+    right.write_text(RIGHT, encoding="utf-8")
+
+    assert main(["compare", str(left), str(right), "--diff"]) == 0
+
+    output = capsys.readouterr().out
+    assert "changed 170402  CLD     THY1QN" in output
+    assert "+THY1QN CLRD VIA VADEN1E" in output
+    assert output.strip().endswith("2 matched, 1 missing, 1 extra, 1 changed")
@@ -1,11 +1,30 @@
 from __future__ import annotations
 
+import mmap
+import random
+
+import pytest
+
+from dcl_editor.core.anomalies import OVERSIZED_BLOCK_BYTES
 from dcl_editor.core.classifier import classify_block
-from dcl_editor.core.extractor import extract_fields
-from dcl_editor.core.normalizer import normalize_block
-from dcl_editor.core.tokenizer import tokenize_blocks
+from dcl_editor.core.extractor import extract_fields, timestamp_minutes
+from dcl_editor.core.models import DclAnomaly, DclBlock
+from dcl_editor.core.normalizer import format_raw_block, normalize_block, normalize_block_bytes
+from dcl_editor.core.scanner import (
+    count_start_markers,
+    marker_positions,
+    pair_markers,
+    scan_block_spans,
+    vectorized_scanning_available,
+)
+from dcl_editor.core.tokenizer import count_dangling_starts, find_block_spans, tokenize_blocks
+from dcl_editor.io.correlator import ExchangeCorrelator
+from dcl_editor.io.dedupe import BlockDeduplicator
 from dcl_editor.io.indexer import DclIndexer
-from dcl_editor.io.loader import load_blocks_from_stream
+from dcl_editor.io.loader import EnrichmentQueue, LogLoader, load_blocks_from_stream, parse_block
+from dcl_editor.io.query import execute_query, parse_query
+from dcl_editor.io.stats import DclStatistics
+from dcl_editor.io.timeline import TimelinePyramid
 
 
 SAMPLE = (
@@ -80,6 +99,18 @@ def test_loader_creates_dcl_block():
     assert "CLRD TO EDDN" in block.full_block_text
 
 
+def test_loaded_blocks_read_their_text_on_demand(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_text("noise\n" + SAMPLE, encoding="utf-8")
+    loader = LogLoader()
+    (block,) = loader.load(log)
+    assert block.full_block_text == ""
+    assert loader.read_text(block) == load_blocks_from_stream(SAMPLE)[0].full_block_text
+    indexer = DclIndexer()
+    indexer.rebuild([block])
+    assert execute_query(parse_query('text:"CLRD TO EDDN"'), indexer, loader.read_text).blocks == [block]
+
+
 def test_indexer_filters_by_callsign_and_type():
     blocks = load_blocks_from_stream(SAMPLE)
     indexer = DclIndexer()
@@ -88,3 +119,326 @@ def test_indexer_filters_by_callsign_and_type():
     assert len(filtered) == 1
     filtered_empty = indexer.filter("ABC", {"CDA"})
     assert filtered_empty == []
+
+
+def _block(block_type, callsign, ts, offset=0):
+    return DclBlock(
+        start_offset=offset,
+        end_offset=offset + 1,
+        ts=ts,
+        type=block_type,
+        callsign=callsign,
+        summary=f"{callsign} {block_type}",
+        preview_text="",
+        full_block_text=f"{block_type}\n{callsign}",
+    )
+
+
+def test_timestamp_minutes_parses_day_hour_minute():
+    assert timestamp_minutes("170439") == (17 * 24 + 4) * 60 + 39
+    assert timestamp_minutes("172560") is None
+    assert timestamp_minutes(None) is None
+
+
+def test_correlator_groups_exchange_and_records_latency():
+    correlator = ExchangeCorrelator(window_minutes=30)
+    correlator.extend(
+        [
+            _block("RCD", "THY1QN", "170430"),
+            _block("RCD", "PGT22A", "170431"),
+            _block("CLD", "THY1QN", "170434"),
+            _block("CDA", "THY1QN", "170435"),
+            _block("FSM", "THY1QN", "170436"),
+        ]
+    )
+    exchanges = correlator.exchanges_for("thy1qn")
+    assert len(exchanges) == 1
+    assert exchanges[0].is_complete
+    assert exchanges[0].latency("RCD", "CLD") == 4
+    assert correlator.latency_distribution("RCD", "CLD") == {4: 1}
+    assert correlator.latency_distribution("RCD", "CDA") == {5: 1}
+    assert correlator.latency_distribution("CLD", "FSM") == {2: 1}
+    with pytest.raises(ValueError):
+        correlator.latency_distribution("CDA", "RCD")
+    assert [exchange.callsign for exchange in correlator.incomplete()] == ["PGT22A"]
+
+
+def test_correlator_latency_across_a_month_rollover():
+    correlator = ExchangeCorrelator(window_minutes=30)
+    correlator.extend(
+        [
+            _block("RCD", "THY1QN", "302358"),
+            _block("CLD", "THY1QN", "010003"),
+            _block("RCD", "PGT22A", "150010"),
+            _block("CLD", "PGT22A", "150005"),
+        ]
+    )
+    assert len(correlator.exchanges_for("THY1QN")) == 1
+    assert correlator.exchanges_for("THY1QN")[0].latency("RCD", "CLD") == 5
+    assert correlator.exchanges_for("PGT22A")[0].latency("RCD", "CLD") is None
+    assert correlator.latency_distribution("RCD", "CLD") == {5: 1}
+
+
+def test_correlator_splits_on_new_request_and_reports_timeouts():
+    correlator = ExchangeCorrelator(window_minutes=30)
+    correlator.add(_block("RCD", "THY1QN", "170400"))
+    correlator.add(_block("CLD", "THY1QN", "170402"))
+    correlator.add(_block("RCD", "THY1QN", "170500"))
+    assert len(correlator.exchanges_for("THY1QN")) == 2
+    assert correlator.timed_out(now_minute=timestamp_minutes("170600")) == correlator.incomplete()
+    assert correlator.timed_out(now_minute=timestamp_minutes("170510")) == [
+        correlator.exchanges_for("THY1QN")[0]
+    ]
+
+
+def test_count_dangling_starts_includes_nested_and_trailing_markers():
+    text = "<STX>A<STX>B<ETX><STX>C"
+    blocks = tokenize_blocks(text)
+    assert len(blocks) == 1
+    assert count_dangling_starts(text, len(blocks)) == 2
+
+
+def test_statistics_merge_matches_single_pass():
+    blocks = [
+        _block("RCD", "THY1QN", "170430"),
+        _block("CLD", "THY1QN", "170434"),
+        _block("UNKNOWN", None, "170501"),
+        _block("CDA", "PGT22A", None),
+    ]
+    combined = DclStatistics(bucket_minutes=60)
+    combined.extend(blocks)
+
+    left, right = DclStatistics(bucket_minutes=60), DclStatistics(bucket_minutes=60)
+    left.extend(blocks[:2])
+    right.extend(blocks[2:])
+    right.record_dangling(1)
+    merged = left.merge(right)
+
+    assert merged.total == combined.total == 4
+    assert merged.type_counts == combined.type_counts
+    assert merged.bucket_counts == combined.bucket_counts
+    assert merged.unknown_rate == 0.25
+    assert merged.malformed == 2
+    assert merged.dangling_starts == 1
+    assert merged.top_callsigns(1) == [("THY1QN", 2)]
+    assert [bucket for bucket, _ in merged.timeline()] == [
+        timestamp_minutes("170400"),
+        timestamp_minutes("170500"),
+    ]
+
+
+def test_timeline_pyramid_reads_only_requested_level():
+    pyramid = TimelinePyramid()
+    pyramid.extend(
+        [
+            _block("RCD", "THY1QN", "170401"),
+            _block("CLD", "THY1QN", "170409"),
+            _block("CDA", "THY1QN", "170412"),
+            _block("FSM", "PGT22A", "180000"),
+        ]
+    )
+    assert pyramid.level_for_span(120, max_bins=200) == 1
+    assert pyramid.level_for_span(24 * 60, max_bins=200) == 10
+    assert pyramid.level_for_span(40 * 24 * 60, max_bins=20) == 1440
+
+    ten_minute = pyramid.bins(10, timestamp_minutes("170400"), timestamp_minutes("170459"))
+    assert [(bucket, dict(counts)) for bucket, counts in ten_minute] == [
+        (timestamp_minutes("170400"), {"RCD": 1, "CLD": 1}),
+        (timestamp_minutes("170410"), {"CDA": 1}),
+    ]
+    daily = pyramid.bins(1440, pyramid.first_minute, pyramid.last_minute)
+    assert [sum(counts.values()) for _, counts in daily] == [3, 1]
+
+
+def test_indexer_filters_by_time_range():
+    indexer = DclIndexer()
+    indexer.rebuild(
+        [
+            _block("CLD", "THY1QN", "170430"),
+            _block("RCD", "PGT22A", "170400"),
+            _block("CDA", "THY1QN", "170500"),
+            _block("FSM", "THY1QN", None),
+        ]
+    )
+    window = (timestamp_minutes("170400"), timestamp_minutes("170430"))
+    assert [block.callsign for block in indexer.filter(None, None, window)] == ["THY1QN", "PGT22A"]
+    assert [block.ts for block in indexer.filter("THY", None, window)] == ["170430"]
+    assert indexer.filter("THY", {"CDA"}, window) == []
+
+
+def test_find_block_spans_matches_tokenize_blocks():
+    text = SAMPLE + "<STX>CLD<CR><LF>PGT22A<ETX>noise<STX>dangling"
+    spans = find_block_spans(text.encode("ascii"))
+    assert [text[start:end] for start, end in spans] == tokenize_blocks(text)
+
+
+def _random_log(seed: int, pieces: int = 400) -> bytes:
+    rng = random.Random(seed)
+    alphabet = [b"<STX>", b"<ETX>", b"<CR>", b"<LF>", b"<", b">", b"STX", b"THY1QN", b" ", b"\n"]
+    return b"".join(rng.choice(alphabet) for _ in range(pieces))
+
+
+def test_scan_block_spans_reference_path_accepts_mmap(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    data = _random_log(1)
+    log.write_bytes(data)
+    with log.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert scan_block_spans(mapped, vectorized=False) == find_block_spans(data)
+
+
+@pytest.mark.skipif(not vectorized_scanning_available(), reason="numpy is not installed")
+def test_vectorized_scanner_matches_reference():
+    for seed in range(20):
+        data = _random_log(seed)
+        assert scan_block_spans(data, vectorized=True) == find_block_spans(data), seed
+        starts, ends = pair_markers(*marker_positions(data, chunk_bytes=7))
+        assert list(zip(starts.tolist(), ends.tolist())) == find_block_spans(data), seed
+    assert scan_block_spans(b"", vectorized=True) == []
+    assert scan_block_spans(b"<STX>open", vectorized=True) == []
+
+
+def test_count_start_markers_handles_markers_split_across_chunks(tmp_path):
+    text = SAMPLE + "<STX>CLD<CR><LF>PGT22A<ETX>noise<STX>dangling"
+    log = tmp_path / "DEBUG.log"
+    log.write_text(text, encoding="utf-8")
+    with log.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for chunk_bytes in (1, 3, 7, 64):
+            assert count_start_markers(mapped, chunk_bytes=chunk_bytes) == text.count("<STX>"), chunk_bytes
+
+
+def test_scan_then_enrich_matches_full_load(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE + "<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF><ETX>", encoding="utf-8")
+    loader = LogLoader()
+    stubs = loader.scan(log)
+    assert [(block.type, block.ts, block.callsign, block.enriched) for block in stubs] == [
+        ("UNKNOWN", None, None, False),
+        ("UNKNOWN", None, None, False),
+    ]
+
+    expected = LogLoader().load(log)
+    assert [loader.enrich(block) for block in stubs] == expected
+
+
+def test_enrichment_queue_serves_requested_blocks_first():
+    blocks = [_block("CLD", f"THY{number}A", None, offset=number) for number in range(1, 6)]
+    for block in blocks:
+        block.enriched = False
+    queue = EnrichmentQueue(blocks)
+    queue.prioritize([blocks[3], blocks[4]])
+    batch = queue.next_batch(3)
+    assert batch == [blocks[4], blocks[3], blocks[0]]
+    for block in batch:
+        block.enriched = True
+    assert queue.next_batch(10) == [blocks[1], blocks[2]]
+    assert queue.next_batch(10) == []
+
+
+def test_normalize_block_bytes_matches_text_normalizer():
+    raw = tokenize_blocks(SAMPLE)[0]
+    assert normalize_block_bytes(raw.encode("ascii")) == normalize_block(raw)
+    non_ascii = "<STX>CLD<CR><LF>THY1QN<SP>İSTANBUL".encode("utf-8") + b"\xff<ETX>"
+    assert normalize_block_bytes(non_ascii) == normalize_block(non_ascii.decode("utf-8", errors="ignore"))
+
+
+def test_loader_offsets_are_byte_offsets(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    payload = "Ünicode noise \xe2\x82".encode("latin-1") + SAMPLE.encode("ascii")
+    log.write_bytes(payload)
+    loader = LogLoader()
+    block = loader.load(log)[0]
+    assert payload[block.start_offset : block.end_offset].startswith(b"<STX>CDA")
+    assert payload[block.start_offset : block.end_offset].endswith(b"<ETX>")
+    assert loader.read_raw(block) == payload[block.start_offset : block.end_offset]
+    assert block.callsign == "THY1QN"
+
+
+def test_read_raw_follows_block_source(tmp_path):
+    first, second = tmp_path / "a.log", tmp_path / "b.log"
+    first.write_bytes(b"<STX>CLD<CR><LF>PGT22A<ETX>")
+    second.write_bytes(b"xx" + SAMPLE.encode("ascii"))
+    loader = LogLoader()
+    loader.load(first)
+    block = LogLoader().load(second)[0]
+    block.source = str(second)
+    assert loader.read_raw(block).startswith(b"<STX>CDA")
+
+
+def test_format_raw_block_keeps_tokens_and_breaks_lines():
+    text = format_raw_block(b"<STX>CLD<CR><LF>THY1QN<SP>CLRD<LF>E069\xff<ETX>")
+    assert text.splitlines() == ["<STX>CLD<CR><LF>", "THY1QN<SP>CLRD<LF>", "E069\ufffd<ETX>"]
+
+
+def test_indexer_sibling_walks_blocks_of_one_callsign():
+    blocks = [_block("RCD", "THY1QN", "170400"), _block("RCD", "PGT22A", "170401"), _block("CLD", "thy1qn", "170405")]
+    indexer = DclIndexer()
+    indexer.rebuild(blocks)
+    assert indexer.sibling(blocks[0], 1) is blocks[2]
+    assert indexer.sibling(blocks[2], -1) is blocks[0]
+    assert indexer.sibling(blocks[2], 1) is None
+    assert indexer.sibling(_block("RCD", None, None), 1) is None
+
+
+def test_indexer_sibling_across_merged_logs():
+    first = [_block("RCD", "THY1QN", "170400", offset=0), _block("CLD", "THY1QN", "170401", offset=10)]
+    second = [_block("CDA", "THY1QN", "170402", offset=0), _block("RCD", "THY1QN", "170403", offset=5)]
+    parts = []
+    for blocks in (first, second):
+        part = DclIndexer()
+        part.rebuild(blocks)
+        parts.append(part)
+    indexer = DclIndexer()
+    indexer.merge(parts)
+    assert indexer.sibling(first[1], 1) is second[0]
+    assert indexer.sibling(second[1], -3) is first[0]
+
+
+def test_deduplicator_collapses_retransmissions_within_window():
+    first = _block("CLD", "THY1QN", "170430", offset=0)
+    retransmitted = _block("CLD", "THY1QN", "170430", offset=100)
+    other = _block("CDA", "THY1QN", "170431", offset=200)
+    late = _block("CLD", "PGT22A", "170600", offset=300)
+    much_later = _block("CLD", "THY1QN", "170430", offset=400)
+
+    deduplicator = BlockDeduplicator(window_minutes=10)
+    rows = deduplicator.extend([first, retransmitted, other, late, much_later])
+
+    assert rows == [first, other, late, much_later]
+    assert first.repeat_count == 2
+    assert first.duplicate_offsets == [100]
+    assert retransmitted.full_block_text is first.full_block_text
+    assert deduplicator.collapsed == 1
+    assert [block.anomalies for block in (first, retransmitted, much_later)] == [0, DclAnomaly.DUPLICATE, 0]
+
+
+def test_load_flags_duplicates_from_parse_digests(tmp_path, monkeypatch):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE + "\n" + SAMPLE, encoding="utf-8")
+
+    def unexpected(self, block):
+        raise AssertionError("block text was read again")
+
+    monkeypatch.setattr(LogLoader, "read_text", unexpected)
+    first, second = LogLoader().load(log)
+    assert first.digest is not None and first.digest == second.digest
+    assert (first.repeat_count, second.anomalies) == (2, DclAnomaly.DUPLICATE)
+
+
+def test_parse_block_flags_anomalies():
+    (clean,) = load_blocks_from_stream(SAMPLE)
+    assert clean.anomalies == 0
+    raw = "<STX>CLD<CR><LF>lost frame<STX>XYZ<CR><LF>PGT22A<SP>CLRD<SP>999999<SP>Ç<ETX>".encode("utf-8")
+    block = parse_block(raw, 0, len(raw))
+    assert block.anomalies == (
+        DclAnomaly.TRUNCATED | DclAnomaly.INVALID_TS | DclAnomaly.NON_ASCII
+    )
+    raw = b"<STX>XYZ<CR><LF>" + b"A" * OVERSIZED_BLOCK_BYTES + b"<ETX>"
+    assert parse_block(raw, 0, len(raw)).anomalies == (
+        DclAnomaly.UNKNOWN_TYPE | DclAnomaly.MISSING_CALLSIGN | DclAnomaly.MISSING_TS | DclAnomaly.OVERSIZED
+    )
+
+
+def test_loader_interns_repeating_fields():
+    first, second = load_blocks_from_stream(SAMPLE + SAMPLE)
+    assert first.callsign is second.callsign
+    assert first.ts is second.ts
@@ -0,0 +1,225 @@
+"""Differential tests: every optimized parsing path must match the reference.
+
+The reference path is the original, unoptimized pipeline: the ``str.find``
+tokenizer semantics (:func:`find_block_spans`), :func:`normalize_block` on the
+decoded block, :func:`classify_block` and :func:`extract_fields`. Inputs are
+generated from a seed so failures can be replayed; ``scripts/bench_parsers.py``
+reuses the generator and :data:`PATHS` to measure throughput.
+"""
+
+from __future__ import annotations
+
+import random
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pytest
+
+from dcl_editor.core.anomalies import detect_anomalies
+from dcl_editor.core.classifier import classify_block
+from dcl_editor.core.extractor import extract_fields
+from dcl_editor.core.models import DclBlock
+from dcl_editor.core.normalizer import normalize_block, normalize_block_bytes, text_digest
+from dcl_editor.core.scanner import scan_block_spans, vectorized_scanning_available
+from dcl_editor.core.tokenizer import IncrementalTokenizer, find_block_spans, tokenize_blocks
+from dcl_editor.io.dedupe import BlockDeduplicator
+from dcl_editor.io.loader import LogLoader, iter_log_blocks, parse_block
+from dcl_editor.io.multiload import MultiFileLoader
+
+
+CALLSIGNS = ("THY1QN", "PGT22A", "SXS4AB", "DLH9KC", "AFR1234", "BA12", "X1")
+TOKENS = (b"<CR>", b"<LF>", b"<CR><LF>", b"<SP>", b"<SOH>", b"<ETB>", b"<", b">", b"<C", b"R>")
+NON_UTF8 = (b"\xff", b"\xfe\xfe", b"\xc3", b"\xe2\x82", "ÇÖ".encode("utf-8"), b"\x00")
+KEYWORDS = ("CLRD", "RCD", "CDA", "CLD", "FSM", "REQ", "CLEAR", "VIA", "SQUAWK")
+
+
+def _line(rng: random.Random) -> bytes:
+    words: List[str] = []
+    for _ in range(rng.randint(0, 12)):
+        kind = rng.random()
+        if kind < 0.3:
+            words.append(rng.choice(CALLSIGNS))
+        elif kind < 0.5:
+            words.append(rng.choice(KEYWORDS))
+        elif kind < 0.65:
+            words.append(f"{rng.randint(0, 39):02d}{rng.randint(0, 29):02d}{rng.randint(0, 69):02d}")
+        else:
+            words.append("".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-/{}\":,") for _ in range(rng.randint(1, 8))))
+    separator = rng.choice((b" ", b"<SP>"))
+    line = separator.join(word.encode("ascii") for word in words)
+    if rng.random() < 0.2:
+        line += rng.choice(NON_UTF8)
+    if rng.random() < 0.2:
+        line += rng.choice(TOKENS)
+    return line
+
+
+def generate_block(rng: random.Random, huge: bool = False) -> bytes:
+    header = rng.choice(("RCD", "CLD", "CDA", "FSM", "XYZ", "", "clr")).encode("ascii")
+    parts = [b"<STX>", header, b"<CR><LF>"]
+    for _ in range(rng.randint(2000, 4000) if huge else rng.randint(0, 6)):
+        parts.append(_line(rng))
+        parts.append(rng.choice((b"<CR><LF>", b"<LF>", b"<CR>", b"\r\n", b"")))
+    if rng.random() < 0.1:
+        parts.insert(rng.randint(1, len(parts)), b"<STX>")
+    parts.append(b"<ETX>")
+    return b"".join(parts)
+
+
+def generate_log(seed: int, blocks: int = 40, huge_rate: float = 0.0) -> bytes:
+    """Return an adversarial log: nested and dangling <STX>, split tokens, bad bytes."""
+
+    rng = random.Random(seed)
+    parts: List[bytes] = []
+    for _ in range(blocks):
+        if rng.random() < 0.5:
+            parts.append(f"12:{rng.randint(0, 59):02d}:00 DEBUG ".encode("ascii"))
+        parts.append(generate_block(rng, huge=rng.random() < huge_rate))
+        if rng.random() < 0.3:
+            parts.append(rng.choice(TOKENS + NON_UTF8 + (b"<ETX>", b"noise")))
+        parts.append(b"\n")
+    if rng.random() < 0.5:
+        parts.append(b"<STX>CLD<CR><LF>" + _line(rng))
+    return b"".join(parts)
+
+
+def reference_blocks(data: bytes) -> List[DclBlock]:
+    blocks = []
+    for start, end in find_block_spans(data):
+        clean = normalize_block(data[start:end].decode("utf-8", errors="ignore"))
+        lines = clean.split("\n") if clean else []
+        fields = extract_fields(lines)
+        block_type = classify_block(lines)
+        blocks.append(
+            DclBlock(
+                start_offset=start,
+                end_offset=end,
+                ts=fields.get("ts"),
+                type=block_type,
+                callsign=fields.get("callsign"),
+                summary=fields.get("summary") or (lines[0] if lines else ""),
+                preview_text=fields.get("preview_text") or clean,
+                full_block_text=clean,
+                metadata_json=fields.get("json"),
+                anomalies=detect_anomalies(data[start:end], block_type, fields.get("callsign"), fields.get("ts")),
+                digest=text_digest(clean),
+            )
+        )
+    BlockDeduplicator().extend(blocks)
+    return blocks
+
+
+def _write(data: bytes, directory: Path, name: str = "DEBUG.log") -> Path:
+    path = directory / name
+    path.write_bytes(data)
+    return path
+
+
+def _load(data: bytes, directory: Path) -> List[DclBlock]:
+    return LogLoader().load(_write(data, directory))
+
+
+def _scan_and_enrich(data: bytes, directory: Path) -> List[DclBlock]:
+    loader = LogLoader()
+    return [loader.enrich(block) for block in loader.scan(_write(data, directory))]
+
+
+def _vectorized(data: bytes, directory: Path) -> List[DclBlock]:
+    return [parse_block(data[start:end], start, end) for start, end in scan_block_spans(data, vectorized=True)]
+
+
+def _streamed(data: bytes, directory: Path) -> List[DclBlock]:
+    return list(iter_log_blocks(_write(data, directory), chunk_bytes=4093))
+
+
+def _live_chunks(data: bytes, directory: Path) -> List[DclBlock]:
+    rng = random.Random(len(data))
+    tokenizer = IncrementalTokenizer()
+    blocks = []
+    position = 0
+    while position < len(data):
+        size = rng.choice((1, 2, 3, 5, 64, 1500))
+        for start, end, raw in tokenizer.feed(data[position : position + size]):
+            blocks.append(parse_block(raw, start, end))
+        position += size
+    return blocks
+
+
+def _parallel(data: bytes, directory: Path) -> List[DclBlock]:
+    # Split between two blocks, as separate daily logs would be.
+    ends = [end for _, end in find_block_spans(data)]
+    cut = ends[len(ends) // 2] if ends else len(data)
+    first, second = _write(data[:cut], directory, "a.log"), _write(data[cut:], directory, "b.log")
+    files = MultiFileLoader(max_workers=2).load([first, second])
+    blocks = []
+    for loaded in files:
+        base = 0 if loaded.path.name == "a.log" else cut
+        for block in loaded.blocks:
+            block.source = None
+            block.start_offset += base
+            block.end_offset += base
+            blocks.append(block)
+    return blocks
+
+
+PATHS: Dict[str, Callable[[bytes, Path], List[DclBlock]]] = {
+    "loader.load": _load,
+    "loader.scan+enrich": _scan_and_enrich,
+    "scanner.vectorized": _vectorized,
+    "iter_log_blocks": _streamed,
+    "incremental_tokenizer": _live_chunks,
+    "multiload.parallel": _parallel,
+}
+SLOW_PATHS = {"multiload.parallel"}
+
+
+def _read_back(blocks: List[DclBlock], data: bytes) -> List[DclBlock]:
+    """Fill in the text the paths leave to be read on demand, the way ``LogLoader.read_text`` does.
+
+    Duplicates are flagged again since only full loads flag them; a second
+    pass over blocks that are already flagged changes nothing.
+    """
+
+    for block in blocks:
+        if not block.full_block_text:
+            block.full_block_text = normalize_block_bytes(data[block.start_offset : block.end_offset])
+    BlockDeduplicator().extend(blocks)
+    return blocks
+
+
+def _available(name: str) -> bool:
+    return name != "scanner.vectorized" or vectorized_scanning_available()
+
+
+@pytest.mark.parametrize("name", [name for name in PATHS if name not in SLOW_PATHS])
+def test_optimized_paths_match_reference(name, tmp_path):
+    if not _available(name):
+        pytest.skip("numpy is not installed")
+    for seed in range(30):
+        data = generate_log(seed)
+        assert _read_back(PATHS[name](data, tmp_path), data) == reference_blocks(data), f"seed {seed}"
+
+
+def test_parallel_loading_matches_reference(tmp_path):
+    data = b"".join(generate_log(seed) for seed in range(4))
+    assert _read_back(PATHS["multiload.parallel"](data, tmp_path), data) == reference_blocks(data)
+
+
+def test_reference_spans_match_text_tokenizer():
+    for seed in range(30):
+        text = generate_log(seed).decode("ascii", errors="replace")
+        spans = find_block_spans(text.encode("utf-8"))
+        raw = text.encode("utf-8")
+        assert [raw[start:end].decode("utf-8") for start, end in spans] == tokenize_blocks(text), f"seed {seed}"
+
+
+def test_huge_block_survives_every_path():
+    data = b"noise " + generate_block(random.Random(7), huge=True) + b"\n"
+    assert len(data) > 64 * 1024
+    expected = reference_blocks(data)
+    assert len(expected) == 1
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in PATHS.items():
+            if name not in SLOW_PATHS and _available(name):
+                assert _read_back(path(data, Path(directory)), data) == expected, name
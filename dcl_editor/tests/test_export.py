@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import csv
+import json
+
+import pytest
+
+from dcl_editor.io import export
+from dcl_editor.io.export import ExportCancelled, export_blocks
+from dcl_editor.io.loader import LogLoader
+from dcl_editor.tests.test_core import SAMPLE
+
+
+@pytest.fixture()
+def loaded(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_text("header\n" + SAMPLE + "\n<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF><ETX>\n", encoding="utf-8")
+    loader = LogLoader()
+    return log, loader.load(log), loader
+
+
+def test_export_csv_and_jsonl(tmp_path, loaded):
+    _, blocks, loader = loaded
+    csv_path = tmp_path / "out.csv"
+    jsonl_path = tmp_path / "out.jsonl"
+    progress = []
+
+    assert export_blocks(blocks, csv_path, "csv", progress=lambda done, total: progress.append((done, total))) == 2
+    assert export_blocks(blocks, jsonl_path, "jsonl", read_text=loader.read_text) == 2
+
+    with csv_path.open(encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["callsign"] for row in rows] == ["THY1QN", "PGT22A"]
+    records = [json.loads(line) for line in jsonl_path.read_text(encoding="utf-8").splitlines()]
+    assert records[0]["type"] == "CDA"
+    assert "THY1QN CLRD TO EDDN OFF 36 VIA VADEN1E" in records[0]["lines"]
+    assert progress[-1] == (2, 2)
+
+
+def test_export_raw_copies_original_bytes(tmp_path, loaded):
+    log, blocks, _ = loaded
+    raw_path = tmp_path / "sub.log"
+    export_blocks(blocks[1:], raw_path, "raw", source=log)
+    assert raw_path.read_bytes() == b"<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF><ETX>"
+
+
+def test_export_cancel_removes_partial_file(tmp_path, loaded, monkeypatch):
+    _, blocks, _ = loaded
+    monkeypatch.setattr(export, "PROGRESS_EVERY", 1)
+    destination = tmp_path / "out.csv"
+    with pytest.raises(ExportCancelled):
+        export_blocks(blocks, destination, "csv", cancelled=lambda: True)
+    assert list(tmp_path.glob("out.csv*")) == []
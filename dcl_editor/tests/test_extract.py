@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from dcl_editor.io import extract
+from dcl_editor.io.extract import coalesce_ranges, extract_sublog, index_path_for
+from dcl_editor.io.loader import LogLoader
+from dcl_editor.tests.test_core import _block
+
+
+LOG = (
+    b"10:00 <STX>CDA<CR><LF>THY1QN<SP>CLRD<CR><LF>170401<ETX>\n"
+    b"10:01 <STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF>170402<ETX>\n"
+    b"10:02 <STX>CDA<CR><LF>THY1QN<SP>DEPARTED<CR><LF>170403<ETX>\n"
+    b"10:03 noise\n"
+    b"10:04 <STX>RCD<CR><LF>THY1QN<SP>REQUEST<CR><LF>170404<ETX>\n"
+)
+
+
+def _spans(blocks):
+    return [(block.start_offset, block.end_offset) for block in blocks]
+
+
+def test_coalesce_merges_touching_and_context_neighbours():
+    blocks = [_block("CDA", "A", "170401", offset) for offset in (0, 10, 30)]
+    for block, end in zip(blocks, (10, 20, 40)):
+        block.end_offset = end
+    assert coalesce_ranges(blocks) == [(0, 20), (30, 40)]
+    assert coalesce_ranges(blocks, context=blocks) == [(0, 40)]
+    other = _block("CLD", "B", "170401", 25)
+    assert coalesce_ranges(blocks, context=blocks + [other]) == [(0, 20), (30, 40)]
+
+
+def test_extract_sublog_copies_bytes_and_reopens_from_index(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(LOG)
+    blocks = LogLoader().load(log)
+    flight = [block for block in blocks if block.callsign == "THY1QN"]
+    destination = tmp_path / "THY1QN.log"
+
+    result = extract_sublog(log, flight, destination, context=blocks)
+
+    assert result.ranges == 2
+    data = destination.read_bytes()
+    assert data == LOG[flight[0].start_offset : flight[0].end_offset] + LOG[flight[1].start_offset : flight[2].end_offset]
+    assert index_path_for(destination).exists()
+
+    loader = LogLoader()
+    reopened = loader.scan(destination)
+    assert [(block.type, block.ts, block.callsign) for block in reopened] == [
+        ("CDA", "170401", "THY1QN"),
+        ("CDA", "170403", "THY1QN"),
+        ("RCD", "170404", "THY1QN"),
+    ]
+    assert _spans(reopened) == _spans(LogLoader().load(destination))
+    assert [loader.enrich(block).summary for block in reopened] == [block.summary for block in flight]
+
+
+def test_extract_reads_each_block_from_its_own_source(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(LOG)
+    spool = tmp_path / "live.log"
+    spool.write_bytes(b"09:59 noise\n" + LOG)
+    blocks = LogLoader().load(log)
+    spooled = LogLoader().load(spool)
+    for block in spooled:
+        block.source = str(spool)
+    destination = tmp_path / "mixed.log"
+
+    result = extract_sublog(log, [blocks[0], spooled[1]], destination, context=blocks + spooled)
+
+    assert result.ranges == 2
+    assert destination.read_bytes() == (
+        LOG[blocks[0].start_offset : blocks[0].end_offset]
+        + spool.read_bytes()[spooled[1].start_offset : spooled[1].end_offset]
+    )
+    reopened = LogLoader().scan(destination)
+    assert [(block.type, block.ts) for block in reopened] == [("CDA", "170401"), ("CLD", "170402")]
+    with pytest.raises(ValueError):
+        extract_sublog(None, blocks[:1], tmp_path / "orphan.log")
+
+
+def test_stale_index_is_ignored(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(LOG)
+    blocks = LogLoader().load(log)
+    destination = tmp_path / "sub.log"
+    extract_sublog(log, blocks[:1], destination)
+    destination.write_bytes(LOG)
+
+    assert len(LogLoader().scan(destination)) == len(blocks)
+
+
+def test_index_of_a_rewritten_file_of_the_same_size_is_ignored(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(LOG)
+    blocks = LogLoader().load(log)
+    destination = tmp_path / "sub.log"
+    extract_sublog(log, blocks[:1], destination)
+    stat = destination.stat()
+    destination.write_bytes(b"x" * stat.st_size)
+    os.utime(destination, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert LogLoader().scan(destination) == []
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="copy_file_range is not available")
+def test_kernel_copy_failure_resumes_from_copied_bytes(tmp_path, monkeypatch):
+    copy_file_range = os.copy_file_range
+
+    def fails_after_a_few_bytes(source_fd, destination_fd, count, offset_src=None):
+        if offset_src != blocks[1].start_offset:
+            raise OSError("interrupted")
+        return copy_file_range(source_fd, destination_fd, min(count, 7), offset_src)
+
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(LOG)
+    blocks = LogLoader().load(log)
+    monkeypatch.setattr(extract.os, "copy_file_range", fails_after_a_few_bytes)
+    destination = tmp_path / "sub.log"
+
+    result = extract_sublog(log, blocks[1:3], destination, write_index=False)
+
+    expected = b"".join(LOG[block.start_offset : block.end_offset] for block in blocks[1:3])
+    assert destination.read_bytes() == expected
+    assert result.bytes_written == len(expected)
+
+
+def test_extract_falls_back_to_mmap(tmp_path, monkeypatch):
+    def unsupported(*args):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(extract.os, "copy_file_range", unsupported, raising=False)
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(LOG)
+    blocks = LogLoader().load(log)
+    destination = tmp_path / "sub.log"
+
+    extract_sublog(log, blocks[1:2], destination, write_index=False)
+
+    assert destination.read_bytes() == LOG[blocks[1].start_offset : blocks[1].end_offset]
+    assert not index_path_for(destination).exists()
+    assert sorted(os.listdir(tmp_path)) == ["DEBUG.log", "sub.log"]
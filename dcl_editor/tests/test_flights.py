@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dcl_editor.io.flights import NO_CALLSIGN, FlightGroups
+from dcl_editor.tests.test_core import _block
+
+
+BLOCKS = [
+    _block("RCD", "THY1QN", "170400"),
+    _block("RCD", "pgt22a", "170401"),
+    _block("CLD", "THY1QN", None),
+    _block("CDA", None, "170403"),
+    _block("CLD", "PGT22A", "170404"),
+    _block("CDA", "THY1QN", "170405"),
+]
+
+
+def _snapshot(groups):
+    return [
+        (flight.callsign, flight.blocks, dict(flight.type_counts), flight.first_ts, flight.last_ts, flight.last_status)
+        for flight in groups.flights.values()
+    ]
+
+
+def test_flights_aggregate_in_first_seen_order():
+    groups = FlightGroups()
+    groups.rebuild(BLOCKS)
+    assert list(groups.flights) == ["THY1QN", "PGT22A", NO_CALLSIGN]
+    thy = groups.flights["THY1QN"]
+    assert thy.blocks == [BLOCKS[0], BLOCKS[2], BLOCKS[5]]
+    assert (thy.first_ts, thy.last_ts, thy.last_status) == ("170400", "170405", "CDA")
+    assert thy.describe_counts() == "3 messages — RCD 1, CLD 1, CDA 1"
+
+
+def test_incremental_updates_match_a_rebuild():
+    incremental = FlightGroups()
+    incremental.extend(BLOCKS[:2])
+    incremental.extend(BLOCKS[2:])
+    changes = incremental.evict(BLOCKS[:3])
+    assert sorted((flight.callsign, removed) for flight, removed in changes) == [("PGT22A", 1), ("THY1QN", 2)]
+
+    expected = FlightGroups()
+    expected.rebuild(BLOCKS[3:])
+    assert sorted(_snapshot(incremental)) == sorted(_snapshot(expected))
+
+    incremental.evict(BLOCKS[3:5])
+    assert list(incremental.flights) == ["THY1QN"]
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+# Cold-start budgets in milliseconds; override with DCL_IMPORT_BUDGET_MS on slow machines.
+CLI_BUDGET_MS = float(os.environ.get("DCL_IMPORT_BUDGET_MS", 250))
+WINDOW_BUDGET_MS = float(os.environ.get("DCL_IMPORT_BUDGET_MS", 1500))
+DEFERRED_MODULES = (
+    "asyncio",
+    "dcl_editor.io.live",
+    "dcl_editor.io.export",
+    "dcl_editor.io.query",
+    "dcl_editor.io.correlator",
+    "dcl_editor.io.multiload",
+    "dcl_editor.ui.workers",
+)
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import *module* in a fresh interpreter and return cumulative microseconds per module."""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def _assert_within_budget(module: str, budget_ms: float) -> None:
+    times = import_times(module)
+    for deferred in DEFERRED_MODULES:
+        assert deferred not in times, f"{module} imports {deferred} at startup"
+    elapsed_ms = times[module] / 1000
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:5]
+    assert elapsed_ms <= budget_ms, f"importing {module} took {elapsed_ms:.0f} ms: {slowest}"
+
+
+def test_cli_import_stays_within_budget():
+    _assert_within_budget("dcl_editor.cli", CLI_BUDGET_MS)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("PySide6") is None, reason="PySide6 is not installed")
+def test_main_window_import_stays_within_budget():
+    _assert_within_budget("dcl_editor.ui.main_window", WINDOW_BUDGET_MS)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from dcl_editor.core.tokenizer import IncrementalTokenizer, find_block_spans
+from dcl_editor.io.live import LiveIngestor, parse_endpoint
+from dcl_editor.io.loader import LogLoader
+from dcl_editor.io.replay import ReplayServer
+from dcl_editor.tests.test_core import SAMPLE
+
+
+FEED = (SAMPLE + "<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF><ETX>noise<STX>RCD<CR><LF>THY7AB<ETX>").encode("ascii")
+
+
+def _collect(ingestor: LiveIngestor, expected: int, timeout: float = 5.0):
+    blocks = []
+    deadline = time.monotonic() + timeout
+    while len(blocks) < expected and time.monotonic() < deadline:
+        blocks.extend(ingestor.drain())
+        time.sleep(0.01)
+    return blocks
+
+
+def test_incremental_tokenizer_matches_spans_for_any_chunking():
+    data = FEED + b"<STX>dangling"
+    for size in (1, 3, 7, 64):
+        tokenizer = IncrementalTokenizer()
+        frames = []
+        for position in range(0, len(data), size):
+            frames.extend(tokenizer.feed(data[position : position + size]))
+        assert [(start, end) for start, end, _ in frames] == find_block_spans(data)
+        assert all(raw == data[start:end] for start, end, raw in frames)
+
+
+def test_incremental_tokenizer_drops_oversized_frames():
+    tokenizer = IncrementalTokenizer(max_frame_bytes=16)
+    assert tokenizer.feed(b"<STX>" + b"x" * 32) == []
+    assert tokenizer.dropped_frames == 1
+    assert [raw for _, _, raw in tokenizer.feed(b"<STX>ok<ETX>")] == [b"<STX>ok<ETX>"]
+
+
+def test_parse_endpoint_rejects_unknown_scheme():
+    assert parse_endpoint("udp://0.0.0.0:4002").port == 4002
+    assert parse_endpoint("pipe:///tmp/dcl.fifo").path == "/tmp/dcl.fifo"
+    with pytest.raises(ValueError):
+        parse_endpoint("http://localhost:80")
+
+
+def test_replayed_feed_is_decoded_like_the_file(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(FEED)
+    expected = LogLoader().load(log)
+
+    server = ReplayServer(log, repeat=2)
+    server.start()
+    ingestor = LiveIngestor(f"tcp+connect://127.0.0.1:{server.bound_port}", batch_size=2, flush_interval=0.05)
+    try:
+        ingestor.start()
+        blocks = _collect(ingestor, 2 * len(expected))
+    finally:
+        ingestor.stop()
+        server.stop()
+
+    assert [(block.type, block.callsign, block.summary) for block in blocks] == [
+        (block.type, block.callsign, block.summary) for block in expected * 2
+    ]
+
+
+def test_udp_feed_is_decoded(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(FEED)
+    ingestor = LiveIngestor("udp://127.0.0.1:0", flush_interval=0.05)
+    ingestor.start()
+    try:
+        server = ReplayServer(log, udp_target=("127.0.0.1", ingestor.bound_port))
+        server.start()
+        blocks = _collect(ingestor, 3)
+        server.stop()
+    finally:
+        ingestor.stop()
+    assert [block.callsign for block in blocks] == ["THY1QN", "PGT22A", "THY7AB"]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from dcl_editor.io.indexer import DclIndexer
+from dcl_editor.io.multiload import MultiFileLoader, logs_in_folder, merge_loaded
+from dcl_editor.tests.test_core import SAMPLE
+
+
+ROOT = Path(__file__).resolve().parents[2]
+SECOND = "<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF>170420<ETX>\n<STX>RCD<CR><LF>THY1QN<SP>REQ<CR><LF>170401<ETX>\n"
+
+
+def _folder(tmp_path):
+    (tmp_path / "DEBUG_1.log").write_text(SAMPLE, encoding="utf-8")
+    (tmp_path / "DEBUG_2.log").write_text(SECOND, encoding="utf-8")
+    (tmp_path / "notes.md").write_text("ignored", encoding="utf-8")
+    return logs_in_folder(tmp_path)
+
+
+def test_multi_file_loader_tags_sources_and_merges_indexes(tmp_path):
+    paths = _folder(tmp_path)
+    assert [path.name for path in paths] == ["DEBUG_1.log", "DEBUG_2.log"]
+
+    files = MultiFileLoader(max_workers=2).load(paths)
+
+    assert [len(loaded.blocks) for loaded in files] == [1, 2]
+    assert {os.path.basename(block.source) for block in files[1].blocks} == {"DEBUG_2.log"}
+    merged = merge_loaded(files)
+    expected = DclIndexer()
+    expected.rebuild([block for loaded in files for block in loaded.blocks])
+    assert merged.blocks == expected.blocks
+    assert merged.blocks[0] is files[0].blocks[0]
+    assert dict(merged.callsign_index) == dict(expected.callsign_index)
+    assert dict(merged.type_index) == dict(expected.type_index)
+    assert (merged.time_keys, merged.time_positions) == (expected.time_keys, expected.time_positions)
+
+
+def test_multi_file_loader_reuses_unchanged_files(tmp_path):
+    paths = _folder(tmp_path)
+    loader = MultiFileLoader(max_workers=1)
+    first = loader.load(paths)
+    progress = []
+
+    second = loader.load(paths, progress=lambda done, total: progress.append((done, total)))
+
+    assert [a is b for a, b in zip(first, second)] == [True, True]
+    assert progress == [(2, 2)]
+
+    with paths[1].open("a", encoding="utf-8") as handle:
+        handle.write("<STX>CDA<CR><LF>PGT22A<SP>DEPARTED<CR><LF>170425<ETX>\n")
+    third = loader.load(paths)
+    assert third[0] is first[0]
+    assert len(third[1].blocks) == 3
+
+
+def test_multi_file_loader_works_with_spawned_workers(tmp_path):
+    # Windows and frozen builds start workers with spawn, which re-imports
+    # the worker function and pickles every LoadedFile back to the parent.
+    paths = _folder(tmp_path)
+    script = (
+        "import multiprocessing, sys\n"
+        "from dcl_editor.io.multiload import MultiFileLoader\n"
+        "if __name__ == '__main__':\n"
+        "    multiprocessing.freeze_support()\n"
+        "    multiprocessing.set_start_method('spawn')\n"
+        "    files = MultiFileLoader(max_workers=2).load(sys.argv[1:])\n"
+        "    print(*(len(loaded.blocks) for loaded in files))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, *map(str, paths)], capture_output=True, text=True, timeout=60, cwd=ROOT
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["1", "2"]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import random
+
+from dcl_editor.io.indexer import DclIndexer
+from dcl_editor.io.ngram import CallsignNgramIndex, edit_distance
+from dcl_editor.tests.test_core import _block
+
+
+def _levenshtein(left: str, right: str) -> int:
+    previous = list(range(len(right) + 1))
+    for row, char in enumerate(left, start=1):
+        current = [row]
+        for column, other in enumerate(right, start=1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + (char != other)))
+        previous = current
+    return previous[-1]
+
+
+def _callsigns(rng: random.Random, count: int) -> list[str]:
+    prefixes = ("THY", "PGT", "SXS", "DLH", "AFR", "BAW", "KLM")
+    suffixes = ("", "A", "QN", "X")
+    return sorted({f"{rng.choice(prefixes)}{rng.randint(1, 9999)}{rng.choice(suffixes)}" for _ in range(count)})
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("THY1QN", "THY1QN") == 0
+    assert edit_distance("THU1QN", "THY1QN") == 1
+    assert edit_distance("TY1QN", "THY1QN") == 1
+    assert edit_distance("PGT22A", "THY1QN", limit=2) == 3
+
+
+def test_lookups_match_brute_force():
+    rng = random.Random(5)
+    keys = _callsigns(rng, 800)
+    index = CallsignNgramIndex()
+    for key in keys:
+        index.add(key)
+    for _ in range(40):
+        key = rng.choice(keys)
+        start = rng.randrange(len(key))
+        fragment = key[start : start + rng.randint(1, 4)]
+        assert index.containing(fragment) == [other for other in keys if fragment in other]
+        typo = list(key)
+        typo[rng.randrange(len(typo))] = rng.choice("ABCXYZ0123")
+        query = "".join(typo)
+        expected = {other: _levenshtein(query, other) for other in keys}
+        found = index.similar(query, 2)
+        assert {other for other, _ in found} == {other for other, distance in expected.items() if distance <= 2}
+        assert all(distance == expected[other] for other, distance in found)
+        assert [distance for _, distance in found] == sorted(distance for _, distance in found)
+
+
+def test_indexer_keeps_trigrams_in_step_with_callsigns():
+    blocks = [_block("RCD", "THY1QN", "170400"), _block("CLD", "PGT22A", "170401"), _block("CDA", "THY71QN", "170402")]
+    indexer = DclIndexer()
+    indexer.rebuild(blocks[:2])
+    indexer.extend(blocks[2:])
+    assert indexer.callsigns_containing("1qn") == ["THY1QN", "THY71QN"]
+    assert indexer.similar_callsigns("THU1QN")[0] == ("THY1QN", 1)
+    indexer.evict(1)
+    assert indexer.callsigns_containing("1QN") == ["THY71QN"]
+    merged = DclIndexer()
+    merged.merge([indexer, indexer])
+    assert merged.callsigns_containing("22") == ["PGT22A"]
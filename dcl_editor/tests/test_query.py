@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import pytest
+
+from dcl_editor.core.models import DclAnomaly
+from dcl_editor.io.indexer import DclIndexer
+from dcl_editor.io.query import (
+    CallsignPredicate,
+    FlagPredicate,
+    NotPredicate,
+    QuerySyntaxError,
+    TextPredicate,
+    TimePredicate,
+    TypePredicate,
+    execute_query,
+    parse_query,
+)
+from dcl_editor.tests.test_core import _block
+
+
+@pytest.fixture()
+def indexer():
+    blocks = [
+        _block("RCD", "THY1QN", "170400"),
+        _block("CLD", "THY1QN", "170405"),
+        _block("CDA", "THY1QN", "170406"),
+        _block("CLD", "PGT22A", "170500"),
+        _block("UNKNOWN", "THY9ZZ", "170531"),
+        _block("CDA", "THY7AB", "170600"),
+    ]
+    blocks[2].full_block_text = "CDA\nTHY1QN CLRD\nSQUAWK 3270"
+    indexer = DclIndexer()
+    indexer.rebuild(blocks)
+    return indexer
+
+
+def test_parse_query_builds_predicates():
+    query = parse_query('type:CDA,CLD callsign:THY* ts:170400..170530 text:"SQUAWK 3270" NOT type:UNKNOWN')
+    assert query.predicates[0] == TypePredicate(frozenset({"CDA", "CLD"}))
+    assert query.predicates[1] == CallsignPredicate("THY", prefix=True)
+    assert isinstance(query.predicates[2], TimePredicate)
+    assert query.predicates[3] == TextPredicate("SQUAWK 3270")
+    assert query.predicates[4] == NotPredicate(TypePredicate(frozenset({"UNKNOWN"})))
+
+
+@pytest.mark.parametrize("text", ["type:XYZ", "ts:99..", 'text:"open', "NOT", "callsign:"])
+def test_parse_query_rejects_invalid_input(text):
+    with pytest.raises(QuerySyntaxError):
+        parse_query(text)
+
+
+def test_execute_query_intersects_indexes_before_scanning(indexer):
+    result = execute_query(parse_query('type:CDA,CLD callsign:THY* ts:170400..170406 "squawk"'), indexer)
+    assert result.indices == [2]
+    assert result.explain[0] == "index ts:170400..170406 -> 3 rows"
+    assert result.explain[-1] == 'scan text:"SQUAWK" -> 1 rows'
+    assert not any("full scan" in step for step in result.explain)
+
+
+def test_execute_query_matches_predicate_scan(indexer):
+    query = parse_query("callsign:THY* NOT type:UNKNOWN ts:..170559")
+    result = execute_query(query, indexer)
+    assert result.blocks == [block for block in indexer.blocks if query.matches(block)]
+    assert [block.callsign for block in result.blocks] == ["THY1QN"] * 3
+
+
+def test_execute_query_without_indexed_predicate_scans_everything(indexer):
+    result = execute_query(parse_query("NOT callsign:THY1QN"), indexer)
+    assert [block.callsign for block in result.blocks] == ["PGT22A", "THY9ZZ", "THY7AB"]
+    assert result.explain[0] == "full scan of 6 rows"
+
+
+def test_callsign_substring_and_typo_queries(indexer):
+    assert parse_query("callsign:*1QN") == parse_query("callsign:*1qn*")
+    assert execute_query(parse_query("callsign:*1QN"), indexer).indices == [0, 1, 2]
+    assert execute_query(parse_query("callsign:THU1QN~"), indexer).indices == [0, 1, 2]
+    assert execute_query(parse_query("callsign:TH9ZZ~1"), indexer).indices == [4]
+    assert execute_query(parse_query("callsign:THU1QN"), indexer).indices == []
+    with pytest.raises(QuerySyntaxError):
+        parse_query("callsign:THY1QN~3")
+    query = parse_query("callsign:THU7QB~2")
+    assert [idx for idx in range(6) if query.matches(indexer.blocks[idx])] == execute_query(query, indexer).indices
+
+
+def test_flag_queries_use_anomaly_bitmaps():
+    blocks = [_block("CDA", "THY1QN", "170400", offset=idx) for idx in range(200)]
+    for idx in (3, 70, 150):
+        blocks[idx].anomalies = DclAnomaly.TRUNCATED
+    for idx in (70, 199):
+        blocks[idx].anomalies |= DclAnomaly.INVALID_TS
+    blocks[150].type = "CLD"
+    indexer = DclIndexer()
+    indexer.rebuild(blocks[:100])
+    indexer.extend(blocks[100:])
+    assert indexer.anomaly_counts() == {DclAnomaly.TRUNCATED: 3, DclAnomaly.INVALID_TS: 2}
+
+    query = parse_query("type:CDA flag:truncated,invalid_ts")
+    assert query.predicates[1] == FlagPredicate(DclAnomaly.TRUNCATED | DclAnomaly.INVALID_TS)
+    assert execute_query(query, indexer).indices == [3, 70, 199]
+    assert execute_query(parse_query("flag:any"), indexer).indices == [3, 70, 150, 199]
+    clean = execute_query(parse_query("NOT flag:any"), indexer)
+    assert clean.indices == [idx for idx in range(200) if idx not in (3, 70, 150, 199)]
+    assert clean.explain[0].startswith("index NOT flag:")
+    with pytest.raises(QuerySyntaxError):
+        parse_query("flag:bogus")
+
+    indexer.evict(71)
+    assert indexer.anomaly_counts() == {DclAnomaly.TRUNCATED: 1, DclAnomaly.INVALID_TS: 1}
+    assert indexer.indices_with_anomalies() == [79, 128]
+
+
+def test_large_predicates_are_probed_instead_of_materialized(monkeypatch):
+    blocks = [_block("CDA", "PGT22A", "170400", offset=idx) for idx in range(100)]
+    blocks[40].callsign = blocks[41].callsign = "THY1QN"
+    blocks[41].anomalies = DclAnomaly.DUPLICATE
+    indexer = DclIndexer()
+    indexer.rebuild(blocks)
+
+    def fail(*args):
+        raise AssertionError("complement list materialized")
+
+    monkeypatch.setattr(indexer, "indices_without_anomalies", fail)
+    result = execute_query(parse_query("type:CDA NOT flag:duplicate callsign:THY1QN"), indexer)
+    assert result.indices == [40]
+    assert result.explain == [
+        "index callsign:THY1QN -> 2 rows",
+        "probe NOT flag:duplicate (~99 rows) -> 1 rows",
+        "probe type:CDA (~100 rows) -> 1 rows",
+    ]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from dcl_editor.io.correlator import ExchangeCorrelator
+from dcl_editor.io.dedupe import BlockDeduplicator
+from dcl_editor.io.indexer import DclIndexer
+from dcl_editor.io.live import LiveIngestor
+from dcl_editor.io.loader import LogLoader
+from dcl_editor.io import retention
+from dcl_editor.io.retention import RetentionPolicy, RetentionWindow
+from dcl_editor.tests.test_core import _block
+from dcl_editor.tests.test_live import FEED
+
+
+def test_indexer_evict_matches_rebuild_of_remaining_blocks():
+    blocks = [
+        _block("RCD", "THY1QN", "170400"),
+        _block("CLD", "PGT22A", "170410"),
+        _block("CLD", "THY1QN", "170405"),
+        _block("CDA", None, None),
+        _block("CDA", "THY1QN", "170420"),
+    ]
+    indexer = DclIndexer()
+    indexer.rebuild(blocks)
+    assert indexer.evict(2) == blocks[:2]
+
+    expected = DclIndexer()
+    expected.rebuild(blocks[2:])
+    assert indexer.blocks == expected.blocks
+    assert dict(indexer.callsign_index) == dict(expected.callsign_index)
+    assert dict(indexer.type_index) == dict(expected.type_index)
+    assert (indexer.time_keys, indexer.time_positions) == (expected.time_keys, expected.time_positions)
+    assert indexer.callsigns_with_prefix("P") == []
+    assert indexer.filter("THY", {"CDA"}) == [blocks[4]]
+
+
+def test_window_evicts_by_count_in_slabs():
+    window = RetentionWindow(RetentionPolicy(max_blocks=4), slack=2)
+    blocks = [_block("RCD", f"FLT{idx}", "170400", offset=idx * 10) for idx in range(8)]
+    assert window.extend(blocks[:5]) == []
+    assert window.extend(blocks[5:6]) == blocks[:2]
+    assert len(window) == 4
+    assert window.extend(blocks[6:]) == blocks[2:4]
+    assert window.evicted_count == 4
+
+
+def test_window_evicts_by_log_time():
+    window = RetentionWindow(RetentionPolicy(max_minutes=30), slack=1)
+    old = [_block("RCD", "THY1QN", "170400"), _block("CLD", "THY1QN", None)]
+    recent = _block("CDA", "THY1QN", "170420")
+    assert window.extend(old + [recent]) == []
+    assert window.extend([_block("FSM", "THY1QN", "170445")]) == old
+    assert len(window) == 2
+
+
+def test_window_keeps_recent_blocks_across_a_month_rollover():
+    window = RetentionWindow(RetentionPolicy(max_minutes=30), slack=1)
+    blocks = [_block("RCD", f"FLT{idx}", ts) for idx, ts in enumerate(("312340", "312355", "010005", "010010"))]
+    assert window.extend(blocks) == []
+    assert window.extend([_block("CLD", "FLT1", "312358")]) == []
+    assert window.extend([_block("CDA", "FLT2", "010015")]) == blocks[:1]
+    assert len(window) == 5
+
+
+def test_history_rereads_evicted_blocks_from_the_source(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(FEED)
+    blocks = LogLoader().load(log)
+    window = RetentionWindow(RetentionPolicy(max_blocks=1), slack=1, default_source=str(log))
+    evicted = window.extend(blocks)
+    assert len(window.evicted) == 1
+    assert [block.summary for block in window.history()] == [block.summary for block in evicted]
+    assert [block.summary for block in window.history(limit=1)] == [evicted[-1].summary]
+
+
+def test_history_reads_newest_spans_first_and_stops_at_the_limit(tmp_path, monkeypatch):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(FEED * 4)
+    blocks = LogLoader().load(log)
+    window = RetentionWindow(RetentionPolicy(max_blocks=1), slack=1, default_source=str(log), span_blocks=2)
+    evicted = window.extend(blocks)
+    assert len(window.evicted) > 2
+    read = []
+    read_span = retention.read_span
+    monkeypatch.setattr(retention, "read_span", lambda span: read.append(span) or read_span(span))
+    assert [block.summary for block in window.history(limit=3)] == [block.summary for block in evicted[-3:]]
+    assert read == window.evicted[-2:][::-1]
+
+
+def test_spooled_live_blocks_point_into_the_spool(tmp_path):
+    spool = tmp_path / "live.log"
+    frames = [(100, 120, b"<STX>CLD<CR><LF>PGT22A<ETX>"), (500, 520, b"<STX>RCD<CR><LF>THY7AB<ETX>")]
+    ingestor = LiveIngestor("udp://127.0.0.1:0", spool=spool)
+    try:
+        blocks = ingestor._parse_frames(frames)
+    finally:
+        ingestor.stop()
+    data = spool.read_bytes()
+    assert [block.source for block in blocks] == [str(spool)] * 2
+    assert [data[block.start_offset : block.end_offset] for block in blocks] == [raw for _, _, raw in frames]
+
+
+def test_spool_segments_are_pruned_once_unreferenced(tmp_path):
+    spool = tmp_path / "live.log"
+    frame = (0, 20, b"<STX>CLD<CR><LF>PGT22A<ETX>")
+    ingestor = LiveIngestor("udp://127.0.0.1:0", spool=spool, spool_segment_bytes=1, spool_segments=2)
+    try:
+        sources = [ingestor._parse_frames([frame])[0].source for _ in range(4)]
+    finally:
+        ingestor.stop()
+    assert [Path(source).name for source in sources] == ["live.log", "live.1.log", "live.2.log", "live.3.log"]
+    assert len(list(tmp_path.iterdir())) == 4
+
+    closed = []
+    removed = ingestor.prune_spool({sources[1]}, closed.append)
+    assert [path.name for path in removed] == ["live.log", "live.2.log"]
+    assert closed == removed
+    assert [path.name for path in ingestor.spool_files] == ["live.1.log", "live.3.log", "live.4.log"]
+    assert ingestor.prune_spool(set()) == [Path(sources[1])]
+    ingestor.remove_spool()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_forget_releases_evicted_originals():
+    dedup = BlockDeduplicator()
+    correlator = ExchangeCorrelator()
+    first = _block("RCD", "THY1QN", "170400")
+    second = _block("CLD", "PGT22A", "170401")
+    dedup.extend([first, second])
+    correlator.extend([first, second])
+    dedup.forget([first])
+    correlator.forget([first])
+    assert dedup.add(_block("RCD", "THY1QN", "170402"))
+    assert correlator.exchanges_for("THY1QN") == []
+    assert len(correlator.exchanges_for("PGT22A")) == 1
+
+
+def test_spool_segment_that_cannot_be_deleted_is_kept(tmp_path, monkeypatch):
+    frame = (0, 20, b"<STX>CLD<CR><LF>PGT22A<ETX>")
+    ingestor = LiveIngestor("udp://127.0.0.1:0", spool=tmp_path / "live.log", spool_segment_bytes=1, spool_segments=1)
+    try:
+        ingestor._parse_frames([frame])
+    finally:
+        ingestor.stop()
+
+    def locked(self, missing_ok=False):
+        raise PermissionError("in use")
+
+    monkeypatch.setattr(Path, "unlink", locked)
+    assert ingestor.prune_spool(set()) == []
+    assert [path.name for path in ingestor.spool_files] == ["live.log", "live.1.log"]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import pytest
+
+from dcl_editor.io.loader import LogLoader
+from dcl_editor.io.sampler import sample_log
+from dcl_editor.tests.test_core import SAMPLE
+from dcl_editor.tests.test_differential import generate_log
+
+
+def _busy_log(path, blocks=20_000):
+    rng = random.Random(7)
+    parts = []
+    for number in range(blocks):
+        block_type = rng.choices(("RCD", "CLD", "CDA", "FSM"), (4, 3, 2, 1))[0]
+        callsign = f"THY{rng.randint(1, 400)}"
+        ts = f"17{number // 1000:02d}{number // 20 % 50:02d}"
+        parts.append(
+            f"12:00:00 DEBUG <STX>{block_type}<CR><LF>FI<SP>{callsign}/AN<CR><LF>"
+            f"DT<SP>QXS<SP>ISTW<SP>{ts}<CR><LF>{callsign}<SP>CLRD<CR><LF><ETX>\n"
+        )
+    path.write_text("".join(parts), encoding="ascii")
+    return path
+
+
+def test_estimates_cover_the_full_parse(tmp_path):
+    log = _busy_log(tmp_path / "DEBUG.log")
+    blocks = LogLoader().load(log)
+    types = Counter(block.type for block in blocks)
+
+    report = sample_log(log, samples=64, window_bytes=4096, seed=3)
+    assert not report.exact
+    assert report.sampled_bytes < log.stat().st_size // 4
+    assert report.total.low <= len(blocks) <= report.total.high
+    assert report.total.high - report.total.low < len(blocks) * 0.05
+    assert sum(estimate.low <= types[block_type] <= estimate.high for block_type, estimate in report.types.items()) >= 3
+    assert (report.first_ts, report.last_ts) == (blocks[0].ts, blocks[-1].ts)
+
+
+def test_small_files_are_parsed_exactly(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_bytes(SAMPLE.encode("ascii") + b"\n" + generate_log(5))
+    blocks = LogLoader().load(log)
+
+    report = sample_log(log)
+    assert report.exact
+    assert (report.total.low, report.total.value, report.total.high) == (len(blocks),) * 3
+    assert {key: estimate.value for key, estimate in report.types.items()} == Counter(block.type for block in blocks)
+
+
+def test_non_positive_sample_counts_are_rejected(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    log.write_text(SAMPLE, encoding="utf-8")
+    with pytest.raises(ValueError):
+        sample_log(log, samples=0)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from dcl_editor.io.server import QueryServer, QueryService
+from dcl_editor.tests.test_core import SAMPLE
+
+
+@pytest.fixture()
+def server(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    extra = "".join(f"<STX>CLD<CR><LF>PGT{number:02d}A<SP>CLRD<CR><LF>1705{number:02d}<ETX>\n" for number in range(5))
+    log.write_text(SAMPLE + "\n" + extra, encoding="utf-8")
+    instance = QueryServer(QueryService(log, cache_size=8))
+    instance.start()
+    yield instance
+    instance.stop()
+
+
+def _get(server, path):
+    with urlopen(f"http://127.0.0.1:{server.bound_port}{path}", timeout=5) as response:
+        return json.loads(response.read())
+
+
+def test_blocks_are_paged_with_a_keyset_cursor(server):
+    first = _get(server, "/blocks?q=type:CLD&limit=2")
+    assert [row["callsign"] for row in first["rows"]] == ["PGT00A", "PGT01A"]
+    assert first["total"] == 5
+
+    pages = [first]
+    while pages[-1]["next"] is not None:
+        pages.append(_get(server, f"/blocks?q=type:CLD&limit=2&after={pages[-1]['next']}"))
+
+    assert [row["id"] for page in pages for row in page["rows"]] == [1, 2, 3, 4, 5]
+    assert _get(server, "/stats")["cache"]["hits"] == 2
+
+
+def test_result_cache_is_bounded_by_total_ids(tmp_path):
+    log = tmp_path / "DEBUG.log"
+    extra = "".join(f"<STX>CLD<CR><LF>PGT{number:02d}A<SP>CLRD<CR><LF>1705{number:02d}<ETX>\n" for number in range(5))
+    log.write_text(SAMPLE + "\n" + extra, encoding="utf-8")
+    service = QueryService(log, cache_size=8, cache_ids=5)
+    assert service.page("type:CLD")[2] == 5
+    assert service.page("type:CDA")[2] == 1
+    assert (len(service.matching), service.matching.ids) == (1, 1)
+    service.page("callsign:PGT00A")
+    assert (len(service.matching), service.matching.ids) == (2, 2)
+    assert service.page("")[2] == 6
+    assert (len(service.matching), service.matching.ids) == (2, 2)
+
+
+def test_search_stats_and_errors(server):
+    assert [row["callsign"] for row in _get(server, "/search?text=VADEN1E")["rows"]] == ["THY1QN"]
+    stats = _get(server, "/stats?top=1")
+    assert stats["blocks"] == 6
+    assert len(stats["top_callsigns"]) == 1
+    assert stats["types"] == {"CDA": 1, "CLD": 5}
+
+    with pytest.raises(HTTPError) as excinfo:
+        _get(server, "/blocks?q=type:BOGUS")
+    assert excinfo.value.code == 400
+    with pytest.raises(HTTPError) as excinfo:
+        _get(server, "/nowhere")
+    assert excinfo.value.code == 404
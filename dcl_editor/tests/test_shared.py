@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from dcl_editor.io import shared
+from dcl_editor.io.loader import load_tail
+from dcl_editor.io.multiload import load_file
+from dcl_editor.io.shared import SharedLogStore
+from dcl_editor.tests.test_core import SAMPLE
+from dcl_editor.tests.test_differential import generate_log
+
+
+ROOT = Path(__file__).resolve().parents[2]
+MORE = b"<STX>CLD<CR><LF>PGT22A<SP>CLRD<CR><LF>170420<ETX>\n"
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "DEBUG.log"
+    path.write_bytes(SAMPLE.encode("ascii") + b"\n" + generate_log(3))
+    return path
+
+
+def _publish(path):
+    loaded = load_file(path)
+    store = SharedLogStore.publish(path, loaded.indexer, loaded.dangling_starts)
+    assert store is not None and store.owner
+    return loaded, store
+
+
+def test_attached_store_matches_the_parsed_log(log):
+    loaded, owner = _publish(log)
+    try:
+        viewer = SharedLogStore.attach(log)
+        assert viewer is not None and not viewer.owner
+        attached = viewer.load()
+        viewer.release()
+    finally:
+        owner.release()
+    assert attached.blocks == loaded.blocks
+    assert attached.dangling_starts == loaded.dangling_starts
+    assert dict(attached.indexer.callsign_index) == dict(loaded.indexer.callsign_index)
+    assert dict(attached.indexer.type_index) == dict(loaded.indexer.type_index)
+    assert (attached.indexer.time_keys, attached.indexer.time_positions) == (
+        loaded.indexer.time_keys,
+        loaded.indexer.time_positions,
+    )
+
+
+def test_last_release_removes_the_store(log):
+    _, owner = _publish(log)
+    viewer = SharedLogStore.attach(log)
+    owner.release()
+    late = SharedLogStore.attach(log)
+    assert late is not None
+    late.release()
+    viewer.release()
+    assert SharedLogStore.attach(log) is None
+
+
+def test_publishing_a_published_file_attaches_without_repeating_blocks(log):
+    loaded, owner = _publish(log)
+    try:
+        second = SharedLogStore.publish(log, load_file(log).indexer, loaded.dangling_starts)
+        assert second is not None and not second.owner
+        assert second.refresh() == []
+        second.release()
+    finally:
+        owner.release()
+
+
+def test_changed_file_is_not_attached(log):
+    _, owner = _publish(log)
+    try:
+        with log.open("ab") as handle:
+            handle.write(MORE)
+        assert SharedLogStore.attach(log) is None
+        assert SharedLogStore.publish(log, load_file(log).indexer) is None
+    finally:
+        owner.release()
+
+
+def test_owner_appends_growth_and_viewers_refresh(log, monkeypatch):
+    monkeypatch.setattr(shared, "MAX_SEGMENTS", 2)
+    _, owner = _publish(log)
+    viewer = SharedLogStore.attach(log)
+    try:
+        before = len(viewer.load().blocks)
+        appended = []
+        for _ in range(3):
+            end = owner.end
+            with log.open("ab") as handle:
+                handle.write(MORE)
+            stat = log.stat()
+            blocks = load_tail(log, end)
+            owner.append(blocks, stat.st_size, stat.st_mtime_ns)
+            appended.extend(blocks)
+        assert [(block.start_offset, block.callsign) for block in viewer.refresh()] == [
+            (block.start_offset, block.callsign) for block in appended
+        ]
+        assert viewer.refresh() == []
+        assert viewer.describes(log.stat())
+        late = SharedLogStore.attach(log)
+        assert len(late.load().blocks) == before + 3
+        late.release()
+        with pytest.raises(RuntimeError):
+            viewer.append(appended, 0, 0)
+    finally:
+        viewer.release()
+        owner.release()
+
+
+def test_other_process_attaches_without_parsing(log):
+    loaded, owner = _publish(log)
+    script = (
+        "import sys\n"
+        "from dcl_editor.io.shared import SharedLogStore\n"
+        "store = SharedLogStore.attach(sys.argv[1])\n"
+        "print(len(store.load().blocks))\n"
+        "store.release()\n"
+    )
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(log)], capture_output=True, text=True, timeout=30, cwd=ROOT
+        )
+    finally:
+        owner.release()
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout) == len(loaded.blocks)
+    assert SharedLogStore.attach(log) is None
+
+
+def test_store_of_a_crashed_viewer_is_reaped(log):
+    script = (
+        "import os, sys\n"
+        "from pathlib import Path\n"
+        "from dcl_editor.io.multiload import load_file\n"
+        "from dcl_editor.io.shared import SharedLogStore\n"
+        "loaded = load_file(Path(sys.argv[1]))\n"
+        "SharedLogStore.publish(sys.argv[1], loaded.indexer)\n"
+        "os._exit(0)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, str(log)], capture_output=True, text=True, timeout=30, cwd=ROOT
+    )
+    assert result.returncode == 0, result.stderr
+    key = shared.store_key(log)
+    assert _segment_exists(shared._manifest_name(key))
+
+    assert SharedLogStore.attach(log) is None
+    assert not _segment_exists(shared._manifest_name(key))
+    assert not _segment_exists(f"{shared._segment_prefix(key)}0")
+
+
+def _segment_exists(name):
+    segment = shared._open(name)
+    if segment is None:
+        return False
+    segment.close()
+    return True
+
+
+def test_lock_wait_times_out(log):
+    key = shared.store_key(log)
+    with shared._HostLock(key):
+        with pytest.raises(TimeoutError):
+            with shared._HostLock(key, timeout=0.05):
+                pass
+    with shared._HostLock(key, timeout=0.05):
+        pass
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+from typing import Callable
+
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QTextOption
-from PySide6.QtWidgets import QDialog, QDialogButtonBox, QPlainTextEdit, QVBoxLayout
+from PySide6.QtGui import QColor, QKeySequence, QTextCharFormat, QTextCursor, QTextOption
+from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QPushButton,
+    QSplitter,
+    QTextEdit,
+    QVBoxLayout,
+)
+
+from ..core.models import DclBlock
+from ..core.normalizer import RAW_TOKEN_PATTERN, format_raw_block, normalize_block_bytes
 
 
 class DetailDialog(QDialog):
-    def __init__(self, text: str, parent=None) -> None:
+    def __init__(self, text: str, parent=None, title: str = "DCL Message") -> None:
         super().__init__(parent)
-        self.setWindowTitle("DCL Message")
+        self.setWindowTitle(title)
         self.resize(700, 480)
         layout = QVBoxLayout(self)
         self.viewer = QPlainTextEdit(self)
@@ -21,3 +36,139 @@ class DetailDialog(QDialog):
         buttons.accepted.connect(self.accept)
         layout.addWidget(buttons)
         self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
+
+
+class TokenHighlightingView(QPlainTextEdit):
+    """Read-only text view that highlights control tokens on the visible lines only."""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setWordWrapMode(QTextOption.NoWrap)
+        self._token_format = QTextCharFormat()
+        self._token_format.setForeground(QColor("#1f6feb"))
+        self._token_format.setFontWeight(600)
+        self.verticalScrollBar().valueChanged.connect(self.highlight_visible)
+        self.textChanged.connect(self.highlight_visible)
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        self.highlight_visible()
+
+    def highlight_visible(self) -> None:
+        selections = []
+        block = self.firstVisibleBlock()
+        height = self.viewport().height()
+        offset = self.contentOffset()
+        while block.isValid() and self.blockBoundingGeometry(block).translated(offset).top() <= height:
+            for match in RAW_TOKEN_PATTERN.finditer(block.text()):
+                selection = QTextEdit.ExtraSelection()
+                cursor = QTextCursor(block)
+                cursor.setPosition(block.position() + match.start())
+                cursor.setPosition(block.position() + match.end(), QTextCursor.KeepAnchor)
+                selection.cursor = cursor
+                selection.format = self._token_format
+                selections.append(selection)
+            block = block.next()
+        self.setExtraSelections(selections)
+
+
+class BlockDetailDialog(QDialog):
+    """Show one block's raw and normalized text, read from the log on demand.
+
+    *fetch* returns the block's original bytes from its offsets and *sibling*
+    returns the previous or next block of the same callsign, so no block text
+    has to be kept in memory for this view.
+    """
+
+    def __init__(
+        self,
+        block: DclBlock,
+        fetch: Callable[[DclBlock], bytes],
+        sibling: Callable[[DclBlock, int], DclBlock | None],
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self.resize(1000, 520)
+        self._fetch = fetch
+        self._sibling = sibling
+        self._block = block
+        layout = QVBoxLayout(self)
+        self.header = QLabel(self)
+        layout.addWidget(self.header)
+        splitter = QSplitter(Qt.Horizontal, self)
+        self.raw_view = TokenHighlightingView(splitter)
+        self.normalized_view = QPlainTextEdit(splitter)
+        self.normalized_view.setReadOnly(True)
+        self.normalized_view.setWordWrapMode(QTextOption.NoWrap)
+        layout.addWidget(splitter, 1)
+
+        navigation = QHBoxLayout()
+        self.previous_button = QPushButton("◀ Previous", self)
+        self.previous_button.setShortcut(QKeySequence("Alt+Left"))
+        self.previous_button.clicked.connect(lambda: self._step(-1))
+        self.next_button = QPushButton("Next ▶", self)
+        self.next_button.setShortcut(QKeySequence("Alt+Right"))
+        self.next_button.clicked.connect(lambda: self._step(1))
+        navigation.addWidget(self.previous_button)
+        navigation.addWidget(self.next_button)
+        navigation.addStretch(1)
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        navigation.addWidget(buttons)
+        layout.addLayout(navigation)
+        self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
+        self.show_block(block)
+
+    def show_block(self, block: DclBlock) -> None:
+        self._block = block
+        try:
+            raw = self._fetch(block)
+        except OSError as exc:
+            raw = b""
+            self.raw_view.setPlainText(f"Source unavailable: {exc}")
+        else:
+            self.raw_view.setPlainText(format_raw_block(raw))
+        self.normalized_view.setPlainText(normalize_block_bytes(raw) if raw else block.full_block_text)
+        where = f"{block.source}, " if block.source else ""
+        self.header.setText(
+            f"{block.ts or '------'}  {block.type}  {block.callsign or '-'}  "
+            f"({where}bytes {block.start_offset}–{block.end_offset})"
+        )
+        self.setWindowTitle(f"DCL Message — {block.callsign}" if block.callsign else "DCL Message")
+        self.previous_button.setEnabled(self._sibling(block, -1) is not None)
+        self.next_button.setEnabled(self._sibling(block, 1) is not None)
+
+    def _step(self, step: int) -> None:
+        block = self._sibling(self._block, step)
+        if block is not None:
+            self.show_block(block)
+
+
+class CompareDialog(QDialog):
+    def __init__(self, left: str, right: str, parent=None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Compare Logs")
+        self.resize(820, 560)
+        layout = QVBoxLayout(self)
+        self.summary = QLabel(f"Comparing {left} with {right}…", self)
+        self.summary.setWordWrap(True)
+        layout.addWidget(self.summary)
+        self.viewer = QPlainTextEdit(self)
+        self.viewer.setReadOnly(True)
+        self.viewer.setWordWrapMode(QTextOption.NoWrap)
+        layout.addWidget(self.viewer)
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
+
+    def append_differences(self, differences: list) -> None:
+        lines: list[str] = []
+        for difference in differences:
+            lines.append(difference.describe())
+            lines.extend(f"    {line}" for line in difference.diff)
+        self.viewer.appendPlainText("\n".join(lines))
+
+    def set_summary(self, text: str) -> None:
+        self.summary.setText(text)
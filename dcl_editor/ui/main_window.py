@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
-from PySide6.QtCore import QSize, Qt
+from PySide6.QtCore import QSize, Qt, QTimer
 from PySide6.QtWidgets import (
     QApplication,
+    QCheckBox,
     QFileDialog,
+    QInputDialog,
     QLabel,
     QMainWindow,
     QMessageBox,
     QHBoxLayout,
+    QProgressDialog,
     QSplitter,
     QStyle,
     QToolButton,
@@ -18,15 +21,51 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..core.models import DclBlock, DclType
+from ..core.models import DclAnomaly, DclBlock, DclType
+from ..io.dedupe import BlockDeduplicator
 from ..io.indexer import DclIndexer
-from ..io.loader import LogLoader
-from .dialogs import DetailDialog
+from ..io.loader import EnrichmentQueue, LogLoader
+from ..io.stats import DclStatistics
+from ..io.timeline import TimelinePyramid
 from .theme import ThemeMode, apply_theme, build_stylesheet
-from .widgets import BlockTableModel, CallsignFilter, ResultsView, ScenarioInput
+from .widgets import (
+    AlertPanel,
+    BlockTableModel,
+    CallsignFilter,
+    FlightTreeModel,
+    QueryInput,
+    ResultsView,
+    ScenarioInput,
+    StatisticsPanel,
+    TimelineWidget,
+)
+
+if TYPE_CHECKING:
+    # Loaded on first use so the window appears before dialogs, workers, the
+    # query engine and the asyncio-based live feed are imported.
+    from ..io.alerts import AlertDispatcher
+    from ..io.correlator import ExchangeCorrelator
+    from ..io.live import LiveIngestor
+    from ..io.multiload import LoadedFile, MultiFileLoader
+    from ..io.query import CallsignPredicate, Query
+    from ..io.retention import RetentionWindow
+    from ..io.shared import SharedLogStore
+    from .dialogs import CompareDialog
+    from .workers import CompareWorker, EnrichmentWorker, ExportWorker, MultiLoadWorker, ShareWorker
 
 
 AVAILABLE_SCENARIOS: set[DclType] = {"RCD", "CLD", "CDA", "FSM", "UNKNOWN"}
+EXPORT_FILTERS = {
+    "CSV (*.csv)": "csv",
+    "JSON Lines (*.jsonl)": "jsonl",
+    "Raw sub-log (*.log)": "raw",
+}
+# Live sessions keep this much in memory; older blocks are re-read from disk.
+LIVE_RETAIN_BLOCKS = 500_000
+LIVE_RETAIN_MINUTES = 24 * 60
+HISTORY_PREVIEW_BLOCKS = 2000
+MIN_FUZZY_CALLSIGN = 4
+MAX_CALLSIGN_SUGGESTIONS = 5
 
 
 class MainWindow(QMainWindow):
@@ -36,14 +75,42 @@ class MainWindow(QMainWindow):
         self.resize(1200, 720)
 
         self.loader = LogLoader()
+        self.multi_loader: MultiFileLoader | None = None
         self.indexer = DclIndexer()
+        self.correlator: ExchangeCorrelator | None = None
+        self.statistics = DclStatistics()
+        self.pyramid = TimelinePyramid()
+        self.raw_blocks: list[DclBlock] = []
         self.blocks: list[DclBlock] = []
+        self.deduplicator = BlockDeduplicator(read_text=self.loader.read_text)
         self.filtered: list[DclBlock] = []
+        self.alerts: AlertDispatcher | None = None
 
         self._current_path: Path | None = None
+        self._current_paths: list[Path] = []
+        self._loaded_files: list[LoadedFile] = []
+        self._multi_load_worker: MultiLoadWorker | None = None
         self._theme_mode = ThemeMode.LIGHT
         self._theme_button: QToolButton | None = None
         self._scenario_types: set[DclType] | None = None
+        self._time_range: tuple[int, int] | None = None
+        self._active_query: Query | None = None
+        self._enrichment_queue: EnrichmentQueue | None = None
+        self._enrichment_worker: EnrichmentWorker | None = None
+        self._live_button: QToolButton | None = None
+        self._export_worker: ExportWorker | None = None
+        self._export_progress: QProgressDialog | None = None
+        self._live_ingestor: LiveIngestor | None = None
+        self._retention: RetentionWindow | None = None
+        self._spool_dir: Path | None = None
+        self._live_sessions = 0
+        self._shared_store: SharedLogStore | None = None
+        self._share_worker: ShareWorker | None = None
+        self._compare_worker: CompareWorker | None = None
+        self._compare_dialog: CompareDialog | None = None
+        self._live_timer = QTimer(self)
+        self._live_timer.setInterval(250)
+        self._live_timer.timeout.connect(self._drain_live_feed)
 
         self._create_ui()
 
@@ -73,6 +140,13 @@ class MainWindow(QMainWindow):
                 callback=self._open_file_dialog,
             )
         )
+        top_layout.addWidget(
+            self._create_action_button(
+                "Open Folder",
+                QStyle.SP_DirOpenIcon,
+                callback=self._open_folder_dialog,
+            )
+        )
         top_layout.addWidget(
             self._create_action_button(
                 "Refresh",
@@ -80,6 +154,34 @@ class MainWindow(QMainWindow):
                 callback=self._refresh_from_disk,
             )
         )
+        top_layout.addWidget(
+            self._create_action_button(
+                "Export Filtered…",
+                QStyle.SP_DialogSaveButton,
+                callback=self._export_filtered,
+            )
+        )
+        top_layout.addWidget(
+            self._create_action_button(
+                "Compare With…",
+                QStyle.SP_FileDialogContentsView,
+                callback=self._compare_with,
+            )
+        )
+        self._live_button = self._create_action_button(
+            "Live Feed",
+            QStyle.SP_MediaPlay,
+            toggled=self._toggle_live_feed,
+            checkable=True,
+        )
+        top_layout.addWidget(self._live_button)
+        top_layout.addWidget(
+            self._create_action_button(
+                "Evicted History",
+                QStyle.SP_FileDialogBack,
+                callback=self._show_evicted_history,
+            )
+        )
         self._theme_button = self._create_action_button(
             "Light Mode",
             QStyle.SP_DialogApplyButton,
@@ -91,12 +193,30 @@ class MainWindow(QMainWindow):
 
         layout.addWidget(top_bar)
 
-        self.model = BlockTableModel()
+        self.table_model = BlockTableModel()
+        self.table_model.placeholder_requested = self._prioritize_block
+        self.flight_model = FlightTreeModel()
+        self.flight_model.placeholder_requested = self._prioritize_block
+        self.model: BlockTableModel | FlightTreeModel = self.table_model
         self.results = ResultsView(self)
         self.results.setObjectName("ResultsView")
         self.results.setProperty("compact", False)
         self.results.setModel(self.model)
         self.results.doubleClicked.connect(self._open_detail)
+        self.results.register_action("Show Flight Timeline", self._open_flight_timeline)
+
+        self.timeline = TimelineWidget(self)
+        self.timeline.setObjectName("TimelineView")
+        self.timeline.rangeSelected.connect(self._on_time_range_selected)
+        self.timeline.selectionCleared.connect(self._on_time_range_cleared)
+        self.timeline.set_pyramid(self.pyramid)
+
+        results_panel = QWidget(self)
+        results_layout = QVBoxLayout(results_panel)
+        results_layout.setContentsMargins(0, 0, 0, 0)
+        results_layout.setSpacing(0)
+        results_layout.addWidget(self.timeline)
+        results_layout.addWidget(self.results, 1)
 
         self.callsign_filter = CallsignFilter(self)
         self.callsign_filter.setObjectName("CallsignFilter")
@@ -131,6 +251,19 @@ class MainWindow(QMainWindow):
         scenario_hint.setObjectName("FilterHint")
         filter_layout.addWidget(scenario_hint)
 
+        query_label = QLabel("Query", self)
+        query_label.setObjectName("FilterLabel")
+        filter_layout.addWidget(query_label)
+        self.query_input = QueryInput(self)
+        self.query_input.setObjectName("QueryFilter")
+        self.query_input.input.setObjectName("QueryInputField")
+        self.query_input.input.textChanged.connect(self._on_filter_changed)
+        filter_layout.addWidget(self.query_input)
+        self.query_hint = QLabel(self)
+        self.query_hint.setObjectName("FilterHint")
+        self.query_hint.setWordWrap(True)
+        filter_layout.addWidget(self.query_hint)
+
         clear_filters = QToolButton(self)
         clear_filters.setObjectName("FilterButton")
         clear_filters.setText("Clear Filters")
@@ -140,11 +273,43 @@ class MainWindow(QMainWindow):
         clear_filters.clicked.connect(self._clear_filters)
         filter_layout.addWidget(clear_filters)
 
+        self.duplicates_toggle = QCheckBox("Show retransmitted duplicates", self)
+        self.duplicates_toggle.setObjectName("DuplicatesToggle")
+        self.duplicates_toggle.toggled.connect(self._toggle_duplicates)
+        filter_layout.addWidget(self.duplicates_toggle)
+
+        self.group_toggle = QCheckBox("Group by flight", self)
+        self.group_toggle.setObjectName("GroupToggle")
+        self.group_toggle.setToolTip("One row per callsign; expand a flight to list its messages.")
+        self.group_toggle.toggled.connect(self._toggle_grouping)
+        filter_layout.addWidget(self.group_toggle)
+
+        self.share_toggle = QCheckBox("Share parsed logs with other viewers", self)
+        self.share_toggle.setObjectName("ShareToggle")
+        self.share_toggle.setToolTip("Reuse a log another viewer on this host has already parsed, and publish yours.")
+        filter_layout.addWidget(self.share_toggle)
+
+        statistics_label = QLabel("Statistics", self)
+        statistics_label.setObjectName("FilterLabel")
+        filter_layout.addWidget(statistics_label)
+        self.statistics_panel = StatisticsPanel(self)
+        self.statistics_panel.setObjectName("StatisticsPanel")
+        filter_layout.addWidget(self.statistics_panel)
+
+        alerts_label = QLabel("Live Alerts", self)
+        alerts_label.setObjectName("FilterLabel")
+        filter_layout.addWidget(alerts_label)
+        self.alert_panel = AlertPanel(self)
+        self.alert_panel.setObjectName("AlertPanel")
+        self.alert_panel.subscriptionRequested.connect(self._add_alert)
+        self.alert_panel.subscriptionRemoved.connect(self._remove_alert)
+        filter_layout.addWidget(self.alert_panel)
+
         filter_layout.addStretch(1)
 
         splitter = QSplitter(Qt.Horizontal, self)
         splitter.addWidget(filter_panel)
-        splitter.addWidget(self.results)
+        splitter.addWidget(results_panel)
         splitter.setStretchFactor(0, 0)
         splitter.setStretchFactor(1, 1)
 
@@ -198,7 +363,10 @@ class MainWindow(QMainWindow):
     def _clear_filters(self) -> None:
         self.callsign_filter.input.clear()
         self.scenario_input.input.clear()
+        self.query_input.input.clear()
         self._scenario_types = None
+        self.timeline.clear_selection()
+        self._on_time_range_cleared()
 
     def _toggle_compact_mode(self, enabled: bool) -> None:
         header = self.results.header()
@@ -227,47 +395,614 @@ class MainWindow(QMainWindow):
 
     # Actions ---------------------------------------------------------
     def _open_file_dialog(self) -> None:
-        path, _ = QFileDialog.getOpenFileName(self, "Open DEBUG.log", str(Path.home()), "Log files (*.log *.txt *.*)")
-        if path:
-            self._load_path(Path(path))
+        paths, _ = QFileDialog.getOpenFileNames(self, "Open DEBUG.log", str(Path.home()), "Log files (*.log *.txt *.*)")
+        if len(paths) == 1:
+            self._load_path(Path(paths[0]))
+        elif paths:
+            self._load_paths([Path(path) for path in paths])
+
+    def _open_folder_dialog(self) -> None:
+        folder = QFileDialog.getExistingDirectory(self, "Open folder of logs", str(Path.home()))
+        if not folder:
+            return
+        from ..io.multiload import logs_in_folder
+
+        paths = logs_in_folder(folder)
+        if not paths:
+            QMessageBox.information(self, "Open Folder", "The folder does not contain any log files.")
+            return
+        self._load_paths(paths)
 
     def _load_path(self, path: Path) -> None:
+        self._stop_enrichment()
+        self._release_shared_store()
+        if self.share_toggle.isChecked() and self._attach_shared(path):
+            return
         try:
-            blocks = self.loader.load(path)
+            blocks = self.loader.scan(path)
         except OSError as exc:
             QMessageBox.critical(self, "Error", f"Could not read file:\n{exc}")
             return
         self._current_path = path
-        self._update_blocks(blocks)
+        self._current_paths = []
+        self._loaded_files = []
+        if self.multi_loader is not None:
+            self.multi_loader.forget()
+        self.model.set_show_sources(False)
+        # Scanned blocks carry offsets only: clear the views built from the previous
+        # log and show the stubs unfiltered; the indexes are built once enrichment ends.
+        self._update_blocks(())
+        self.raw_blocks = blocks
+        self._start_enrichment()
+        self._apply_filters()
+
+    def _load_paths(self, paths: list[Path]) -> None:
+        if self._multi_load_worker is not None:
+            return
+        from ..io.multiload import MultiFileLoader
+        from .workers import MultiLoadWorker
+
+        self._stop_enrichment()
+        self._release_shared_store()
+        if self.multi_loader is None:
+            self.multi_loader = MultiFileLoader()
+        worker = MultiLoadWorker(self.multi_loader, paths, self)
+        progress = QProgressDialog("Loading logs…", None, 0, len(paths), self)
+        progress.setWindowTitle("Open Logs")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        worker.progressed.connect(lambda done, total: progress.setValue(done))
+        worker.loaded.connect(lambda files: self._on_paths_loaded(paths, files))
+        worker.failed.connect(lambda message: QMessageBox.critical(self, "Error", f"Could not read file:\n{message}"))
+        worker.finished.connect(progress.reset)
+        worker.finished.connect(self._on_multi_load_finished)
+        self._multi_load_worker = worker
+        worker.start()
+
+    def _on_paths_loaded(self, paths: list[Path], files: list[LoadedFile]) -> None:
+        self.multi_loader.forget(paths)
+        self._current_path = None
+        self._current_paths = list(paths)
+        self._loaded_files = files
+        self.model.set_show_sources(True)
+        self._update_blocks(block for loaded in files for block in loaded.blocks)
+
+    def _on_multi_load_finished(self) -> None:
+        self._multi_load_worker = None
 
     def _refresh_from_disk(self) -> None:
+        if self._current_paths:
+            self._load_paths(self._current_paths)
+            return
         if not self._current_path:
             return
-        blocks = self.loader.reload()
-        self._update_blocks(blocks)
+        if self._shared_store is not None and self._refresh_shared(self._current_path):
+            return
+        self._load_path(self._current_path)
+
+    # Shared parsed logs ------------------------------------------------
+    def _attach_shared(self, path: Path) -> bool:
+        from ..io.shared import SharedLogStore
+
+        try:
+            store = SharedLogStore.attach(path)
+            loaded = store.load() if store is not None else None
+        except TimeoutError as exc:
+            self.statusBar().showMessage(f"Shared log is busy, parsing it instead: {exc}", 5000)
+            return False
+        except (OSError, ValueError):
+            return False
+        if loaded is None:
+            return False
+        self._shared_store = store
+        self._current_path = path
+        self._current_paths = []
+        self._loaded_files = [loaded]
+        if self.multi_loader is not None:
+            self.multi_loader.forget()
+        self.model.set_show_sources(False)
+        self._update_blocks(loaded.blocks)
+        self.statusBar().showMessage("Opened the parsed log shared by another viewer", 5000)
+        return True
+
+    def _publish_shared(self) -> None:
+        path = self._current_path
+        if path is None or self._shared_store is not None or self._share_worker is not None:
+            return
+        from .workers import ShareWorker
+
+        worker = ShareWorker(path, self.raw_blocks, self.loader.dangling_starts, self)
+        worker.failed.connect(lambda message: self.statusBar().showMessage(f"Could not share log: {message}", 5000))
+        worker.finished.connect(self._on_share_finished)
+        self._share_worker = worker
+        worker.start()
+
+    def _on_share_finished(self) -> None:
+        worker, self._share_worker = self._share_worker, None
+        if worker is None or worker.store is None:
+            return
+        if worker.path != self._current_path or self._shared_store is not None:
+            worker.store.release()
+            return
+        self._shared_store = worker.store
+
+    def _refresh_shared(self, path: Path) -> bool:
+        """Pick up growth of a shared log without a full reload; ``False`` if that is not possible."""
+
+        from ..io.loader import load_tail
+
+        store = self._shared_store
+        try:
+            stat = path.stat()
+            if not store.owner:
+                self._append_blocks(store.refresh())
+                return store.describes(stat)
+            if stat.st_size < store.end:
+                return False
+            blocks = load_tail(path, store.end)
+            store.append(blocks, stat.st_size, stat.st_mtime_ns)
+        except (OSError, ValueError):
+            return False
+        for block in blocks:
+            block.source = str(path)
+        self._append_blocks(blocks)
+        return True
+
+    def _release_shared_store(self) -> None:
+        worker, self._share_worker = self._share_worker, None
+        stores = [self._shared_store]
+        if worker is not None:
+            worker.wait()
+            stores.append(worker.store)
+        self._shared_store = None
+        for store in stores:
+            if store is None:
+                continue
+            try:
+                store.release()
+            except OSError as exc:
+                self.statusBar().showMessage(f"Could not release the shared log: {exc}", 5000)
+
+    def _start_enrichment(self) -> None:
+        from .workers import EnrichmentWorker
+
+        self._enrichment_queue = EnrichmentQueue(self.raw_blocks)
+        worker = EnrichmentWorker(self.loader, self._enrichment_queue, self)
+        worker.batchEnriched.connect(self._on_batch_enriched)
+        worker.finished.connect(self._on_enrichment_finished)
+        self._enrichment_worker = worker
+        worker.start()
+
+    def _stop_enrichment(self) -> None:
+        worker = self._enrichment_worker
+        self._enrichment_worker = None
+        self._enrichment_queue = None
+        if worker is not None:
+            worker.batchEnriched.disconnect(self._on_batch_enriched)
+            worker.finished.disconnect(self._on_enrichment_finished)
+            worker.requestInterruption()
+            worker.wait()
+
+    def _prioritize_block(self, block: DclBlock) -> None:
+        if self._enrichment_queue is not None:
+            self._enrichment_queue.prioritize((block,))
+
+    def _on_batch_enriched(self, _count: int) -> None:
+        self.model.refresh_rows()
+
+    def _on_enrichment_finished(self) -> None:
+        if self.sender() is not self._enrichment_worker:
+            return
+        self._enrichment_worker = None
+        self._enrichment_queue = None
+        self._update_blocks(self.raw_blocks)
+        if self.share_toggle.isChecked() and not self._current_paths:
+            self._publish_shared()
+
+    def closeEvent(self, event) -> None:  # type: ignore[override]
+        self._stop_enrichment()
+        self._stop_live_feed()
+        self._remove_spool()
+        if self._multi_load_worker is not None:
+            self._multi_load_worker.wait()
+        if self._export_worker is not None:
+            self._export_worker.requestInterruption()
+            self._export_worker.wait()
+        self._stop_compare()
+        self._release_shared_store()
+        super().closeEvent(event)
+
+    def _export_filtered(self) -> None:
+        if self._export_worker is not None:
+            return
+        if not self.filtered:
+            QMessageBox.information(self, "Export", "There are no rows to export.")
+            return
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export filtered rows",
+            str(Path.home() / "dcl_export.csv"),
+            ";;".join(EXPORT_FILTERS),
+        )
+        if not path:
+            return
+        fmt = EXPORT_FILTERS.get(selected_filter, "csv")
+        if fmt == "raw" and not self._current_path and any(not block.source for block in self.filtered):
+            QMessageBox.warning(self, "Export", "Raw sub-logs can only be exported from a log file.")
+            return
+        from .workers import ExportWorker
+
+        worker = ExportWorker(
+            self.filtered, Path(path), fmt, self._current_path, self.raw_blocks, self.loader.read_text, self
+        )
+        progress = QProgressDialog("Exporting rows…", "Cancel", 0, len(self.filtered), self)
+        progress.setWindowTitle("Export")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(worker.requestInterruption)
+        worker.progressed.connect(self._on_export_progress)
+        worker.succeeded.connect(self._on_export_succeeded)
+        worker.failed.connect(self._on_export_failed)
+        worker.finished.connect(self._on_export_finished)
+        self._export_worker = worker
+        self._export_progress = progress
+        worker.start()
+
+    def _on_export_progress(self, done: int, total: int) -> None:
+        if self._export_progress is not None:
+            self._export_progress.setMaximum(total)
+            self._export_progress.setValue(done)
+
+    def _on_export_succeeded(self, count: int) -> None:
+        QMessageBox.information(self, "Export", f"Exported {count} rows.")
+
+    def _on_export_failed(self, message: str) -> None:
+        QMessageBox.warning(self, "Export", message)
+
+    def _on_export_finished(self) -> None:
+        if self._export_progress is not None:
+            self._export_progress.reset()
+        self._export_progress = None
+        self._export_worker = None
+
+    def _compare_with(self) -> None:
+        if not self._current_path:
+            QMessageBox.information(self, "Compare", "Open a log before comparing it with another one.")
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Compare with log", str(self._current_path.parent), "Log files (*.log *.txt *.*)"
+        )
+        if not path:
+            return
+        from .dialogs import CompareDialog
+        from .workers import CompareWorker
+
+        self._stop_compare()
+        dialog = CompareDialog(self._current_path.name, Path(path).name, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        worker = CompareWorker(self._current_path, Path(path), self)
+        worker.differencesFound.connect(dialog.append_differences)
+        worker.completed.connect(dialog.set_summary)
+        worker.failed.connect(lambda message: dialog.set_summary(f"Comparison failed: {message}"))
+        dialog.finished.connect(self._stop_compare)
+        self._compare_worker = worker
+        self._compare_dialog = dialog
+        worker.start()
+        dialog.show()
+
+    def _stop_compare(self) -> None:
+        if self._compare_worker is not None:
+            self._compare_worker.requestInterruption()
+            self._compare_worker.wait()
+            self._compare_worker = None
+        self._compare_dialog = None
+
+    def _toggle_live_feed(self, enabled: bool) -> None:
+        if not enabled:
+            self._stop_live_feed()
+            return
+        endpoint, accepted = QInputDialog.getText(
+            self,
+            "Live Feed",
+            "Feed endpoint (tcp://, tcp+connect://, udp://, pipe://):",
+            text="tcp+connect://127.0.0.1:4001",
+        )
+        if not accepted or not endpoint.strip():
+            self._set_live_button_checked(False)
+            return
+        import tempfile
+
+        from ..io.live import LiveIngestor
+        from ..io.retention import RetentionPolicy, RetentionWindow
+
+        if self._spool_dir is None:
+            self._spool_dir = Path(tempfile.mkdtemp(prefix="dcl-live-"))
+        # Each feed spools into its own files; evicted history may still point at earlier ones.
+        self._live_sessions += 1
+        spool = self._spool_dir / f"feed-{self._live_sessions}.log"
+        try:
+            ingestor = LiveIngestor(endpoint.strip(), spool=spool)
+            ingestor.start()
+        except (ValueError, RuntimeError) as exc:
+            QMessageBox.critical(self, "Error", f"Could not start live feed:\n{exc}")
+            self._set_live_button_checked(False)
+            return
+        self._live_ingestor = ingestor
+        if self._retention is None:
+            policy = RetentionPolicy(max_blocks=LIVE_RETAIN_BLOCKS, max_minutes=LIVE_RETAIN_MINUTES)
+            default_source = str(self._current_path) if self._current_path else None
+            self._retention = RetentionWindow(policy, default_source=default_source)
+            self._retention.reset(self.raw_blocks)
+        self._live_timer.start()
+
+    def _stop_live_feed(self) -> None:
+        self._live_timer.stop()
+        if self._live_ingestor is not None:
+            self._live_ingestor.stop()
+            self._append_blocks(self._live_ingestor.drain())
+            self._live_ingestor = None
+
+    def _remove_spool(self) -> None:
+        if self._spool_dir is not None:
+            import shutil
+
+            shutil.rmtree(self._spool_dir, ignore_errors=True)
+            self._spool_dir = None
+
+    def _set_live_button_checked(self, checked: bool) -> None:
+        if self._live_button:
+            self._live_button.blockSignals(True)
+            self._live_button.setChecked(checked)
+            self._live_button.blockSignals(False)
+
+    def _drain_live_feed(self) -> None:
+        ingestor = self._live_ingestor
+        if ingestor is None:
+            return
+        self._append_blocks(ingestor.drain())
+        if not ingestor.running:
+            self._stop_live_feed()
+            self._set_live_button_checked(False)
+
+    def _append_blocks(self, blocks: list[DclBlock]) -> None:
+        if not blocks:
+            return
+        self._index_appended(blocks)
+        if self._retention is not None:
+            self._evict(self._retention.extend(blocks))
+
+    def _index_appended(self, blocks: list[DclBlock]) -> None:
+        self.raw_blocks.extend(blocks)
+        # Flag retransmissions before indexing; the index covers duplicates and the view filters them.
+        collapsed_before = self.deduplicator.collapsed
+        kept = self.deduplicator.extend(blocks)
+        self.indexer.extend(blocks)
+        if not self.duplicates_toggle.isChecked():
+            if self.deduplicator.collapsed != collapsed_before:
+                self.model.refresh_rows()
+            blocks = kept
+        self.blocks.extend(blocks)
+        self._raise_alerts(blocks)
+        self._exchange_correlator().extend(blocks)
+        self.statistics.extend(blocks)
+        self.statistics_panel.set_statistics(self.statistics, self.indexer.anomaly_counts())
+        self.pyramid.extend(blocks)
+        self.timeline.refresh()
+        query = self._active_query
+        visible = blocks
+        if query is not None:
+            visible = [block for block in blocks if query.matches(block, self.loader.read_text)]
+        self.filtered.extend(visible)
+        self.model.append_blocks(visible)
+
+    def _evict(self, evicted: list[DclBlock]) -> None:
+        """Drop the oldest blocks of a live session from every index and the view."""
+
+        if not evicted:
+            return
+        gone = {id(block) for block in evicted}
+        self.raw_blocks = self.raw_blocks[len(evicted) :]
+        self.blocks = self.blocks[_leading_count(self.blocks, gone) :]
+        self.indexer.evict(len(evicted))
+        self.deduplicator.forget(evicted)
+        self._exchange_correlator().forget(evicted)
+        rows = _leading_count(self.filtered, gone)
+        self.filtered = self.filtered[rows:]
+        self.model.remove_first_rows(rows)
+        if self._live_ingestor is not None:
+            # Old spool segments go once no retained block is read from them any more.
+            in_use = {block.source for block in self.raw_blocks if block.source}
+            self._live_ingestor.prune_spool(in_use, self.loader.close_source)
+        self.statusBar().showMessage(f"{self._retention.evicted_count} older blocks moved out of memory", 5000)
+
+    def _show_evicted_history(self) -> None:
+        retention = self._retention
+        if retention is None or not retention.evicted:
+            QMessageBox.information(self, "Evicted History", "No blocks have been evicted in this session.")
+            return
+        try:
+            blocks = retention.history(limit=HISTORY_PREVIEW_BLOCKS)
+        except OSError as exc:
+            QMessageBox.critical(self, "Error", f"Could not read evicted blocks:\n{exc}")
+            return
+        lines = [f"{block.ts or '------'}  {block.type:<7} {block.callsign or '-':<8} {block.summary}" for block in blocks]
+        from .dialogs import DetailDialog
+
+        title = f"Evicted History — last {len(blocks)} of {retention.evicted_count}"
+        dialog = DetailDialog("\n".join(lines), self, title=title)
+        dialog.exec()
+
+    def _add_alert(self, text: str) -> None:
+        from ..io.query import QuerySyntaxError
+
+        if self.alerts is None:
+            from ..io.alerts import AlertDispatcher
+
+            self.alerts = AlertDispatcher(self.loader.read_text)
+        try:
+            subscription = self.alerts.subscribe(text, log=True)
+        except QuerySyntaxError as exc:
+            QMessageBox.warning(self, "Live Alerts", f"Query error: {exc}")
+            return
+        self.alert_panel.add_subscription(subscription)
+
+    def _remove_alert(self, number: int) -> None:
+        if self.alerts is not None:
+            self.alerts.unsubscribe(number)
+
+    def _raise_alerts(self, blocks: list[DclBlock]) -> None:
+        if self.alerts is None or not self.alerts.subscriptions:
+            return
+        matches = self.alerts.dispatch_many(blocks)
+        if not matches:
+            return
+        self.alert_panel.add_matches(matches)
+        self.statusBar().showMessage(matches[-1].describe(), 10000)
+        QApplication.beep()
+
+    def _toggle_duplicates(self, _enabled: bool) -> None:
+        if self._enrichment_worker is None:
+            self._update_views()
+
+    def _toggle_grouping(self, enabled: bool) -> None:
+        model = self.flight_model if enabled else self.table_model
+        if model is self.model:
+            return
+        model.show_repeat_counts = self.model.show_repeat_counts
+        model.set_show_sources(self.model.columnCount() > len(self.model.columns))
+        self.model.set_blocks([])
+        self.model = model
+        self.results.setModel(model)
+        self._apply_filters()
 
     def _update_blocks(self, blocks: Iterable[DclBlock]) -> None:
-        self.blocks = list(blocks)
-        self.indexer.rebuild(self.blocks)
+        self.raw_blocks = list(blocks)
+        self.deduplicator = BlockDeduplicator(read_text=self.loader.read_text)
+        if self._loaded_files:
+            # Loading flagged the duplicates of each file and indexed it; stitch the indexes together.
+            self.deduplicator.remember(self.raw_blocks)
+            self.indexer.merge([loaded.indexer for loaded in self._loaded_files])
+        else:
+            # Blocks enriched in the background are deduplicated here, before their index is built.
+            self.deduplicator.extend(self.raw_blocks)
+            self.indexer.rebuild(self.raw_blocks)
+        if self._retention is not None:
+            self._retention.reset(self.raw_blocks)
+        self._update_views()
+
+    def _exchange_correlator(self) -> ExchangeCorrelator:
+        if self.correlator is None:
+            from ..io.correlator import ExchangeCorrelator
+
+            self.correlator = ExchangeCorrelator()
+        return self.correlator
+
+    def _update_views(self) -> None:
+        """Rebuild the views of the shown blocks; hidden duplicates are filtered out through the index."""
+
+        show_duplicates = self.duplicates_toggle.isChecked()
+        self.model.show_repeat_counts = not show_duplicates
+        if show_duplicates:
+            self.blocks = list(self.indexer.blocks)
+        else:
+            originals = self.indexer.indices_without_anomalies(DclAnomaly.DUPLICATE)
+            self.blocks = [self.indexer.blocks[idx] for idx in originals]
+        self._exchange_correlator().rebuild(self.blocks)
+        self.statistics = DclStatistics()
+        self.statistics.extend(self.blocks)
+        if self._loaded_files:
+            self.statistics.record_dangling(sum(loaded.dangling_starts for loaded in self._loaded_files))
+        else:
+            self.statistics.record_dangling(self.loader.dangling_starts)
+        self.statistics_panel.set_statistics(self.statistics, self.indexer.anomaly_counts())
+        self.pyramid.rebuild(self.blocks)
+        self.timeline.set_pyramid(self.pyramid)
+        self._time_range = None
         self._apply_filters()
 
     def _apply_filters(self) -> None:
-        callsign = self.callsign_filter.input.text().strip().upper()
-        scenario_types = self._scenario_types
-
-        if scenario_types is not None and not scenario_types:
-            self.filtered = []
+        if self._enrichment_worker is not None:
+            # Grouping and queries need parsed fields; until then list the scanned blocks in file order.
+            self._active_query = None
+            self.query_hint.setText("Reading the log — filters and grouping apply once every block is parsed")
+            self.filtered = list(self.raw_blocks) if self.model is self.table_model else []
             self.model.set_blocks(self.filtered)
             return
+        from ..io.query import CallsignPredicate, execute_query
 
-        allowed_types = scenario_types if scenario_types else None
-        self.filtered = self.indexer.filter(callsign or None, allowed_types)
+        self._active_query, error = self._build_query()
+        result = execute_query(self._active_query, self.indexer, self.loader.read_text)
+        callsigns = [predicate for predicate in self._active_query.predicates if isinstance(predicate, CallsignPredicate)]
+        fuzzy = next((predicate for predicate in callsigns if predicate.typos), None)
+        if error:
+            self.query_hint.setText(f"Query error: {error}")
+        elif self.query_input.input.text().strip():
+            self.query_hint.setText("\n".join(result.explain))
+        elif fuzzy is not None:
+            closest = self.indexer.similar_callsigns(fuzzy.value, fuzzy.typos)[:MAX_CALLSIGN_SUGGESTIONS]
+            names = ", ".join(key for key, _ in closest)
+            self.query_hint.setText(f"Did you mean: {names}" if names else "No similar callsign")
+        else:
+            self.query_hint.clear()
+        self.filtered = result.blocks
         self.model.set_blocks(self.filtered)
         self.results.sortByColumn(0, Qt.AscendingOrder)
 
+    def _build_query(self) -> tuple[Query, str | None]:
+        """Combine the query box with the callsign, scenario and timeline filters."""
+
+        from ..io.query import (
+            FlagPredicate,
+            NotPredicate,
+            Query,
+            QuerySyntaxError,
+            TimePredicate,
+            TypePredicate,
+            parse_query,
+        )
+
+        error: str | None = None
+        try:
+            query = parse_query(self.query_input.input.text())
+        except QuerySyntaxError as exc:
+            query, error = Query(), str(exc)
+        callsign = self.callsign_filter.input.text().strip().upper()
+        if callsign:
+            query.predicates.append(self._callsign_predicate(callsign))
+        if self._scenario_types is not None:
+            query.predicates.append(TypePredicate(frozenset(self._scenario_types)))
+        if self._time_range is not None:
+            query.predicates.append(TimePredicate(*self._time_range))
+        if not self.duplicates_toggle.isChecked():
+            query.predicates.append(NotPredicate(FlagPredicate(DclAnomaly.DUPLICATE)))
+        return query, error
+
+    def _callsign_predicate(self, callsign: str) -> CallsignPredicate:
+        """Match by prefix, falling back to substring and then to typo-tolerant matching."""
+
+        from ..io.query import CallsignPredicate
+
+        if self.indexer.callsigns_with_prefix(callsign):
+            return CallsignPredicate(callsign, prefix=True)
+        if self.indexer.callsigns_containing(callsign):
+            return CallsignPredicate(callsign, contains=True)
+        if len(callsign) >= MIN_FUZZY_CALLSIGN:
+            return CallsignPredicate(callsign, typos=1 if len(callsign) < 6 else 2)
+        return CallsignPredicate(callsign, prefix=True)
+
     def _on_filter_changed(self, _text: str) -> None:
         self._apply_filters()
 
+    def _on_time_range_selected(self, start: int, end: int) -> None:
+        self._time_range = (start, end)
+        self._apply_filters()
+
+    def _on_time_range_cleared(self) -> None:
+        if self._time_range is None:
+            return
+        self._time_range = None
+        self._apply_filters()
+
     def _on_scenario_changed(self, text: str) -> None:
         self._scenario_types = self._parse_scenario_text(text)
         self._apply_filters()
@@ -283,6 +1018,33 @@ class MainWindow(QMainWindow):
         block = self.model.block_at(index)
         if not block:
             return
-        dialog = DetailDialog(block.full_block_text, self)
+        from .dialogs import BlockDetailDialog
+
+        dialog = BlockDetailDialog(block, self.loader.read_raw, self.indexer.sibling, self)
         dialog.exec()
 
+    def _open_flight_timeline(self, index) -> None:
+        callsign = self.model.callsign_at(index)
+        if not callsign:
+            return
+        exchanges = self._exchange_correlator().exchanges_for(callsign)
+        lines: list[str] = []
+        for number, exchange in enumerate(exchanges, start=1):
+            status = "complete" if exchange.is_complete else "missing " + ", ".join(exchange.missing_stages)
+            latency = exchange.latency("RCD", "CLD")
+            latency_text = f"{latency} min" if latency is not None else "n/a"
+            lines.append(f"Exchange {number} — {status} — RCD→CLD {latency_text}")
+            for item in exchange.blocks:
+                lines.append(f"  {item.ts or '------'}  {item.type:<7} {item.summary}")
+            lines.append("")
+        from .dialogs import DetailDialog
+
+        dialog = DetailDialog("\n".join(lines).strip(), self, title=f"Flight Timeline — {callsign}")
+        dialog.exec()
+
+
+def _leading_count(blocks: list[DclBlock], gone: set[int]) -> int:
+    count = 0
+    while count < len(blocks) and id(blocks[count]) in gone:
+        count += 1
+    return count
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
+from functools import lru_cache
 
 from PySide6.QtGui import QColor, QPalette
 from PySide6.QtWidgets import QApplication
@@ -29,7 +30,11 @@ _LIGHT_MUTED = QColor(110, 118, 156)
 def apply_theme(app: QApplication | None, mode: ThemeMode = ThemeMode.LIGHT) -> None:
     if app is None:
         return
+    app.setPalette(build_palette(mode))
 
+
+@lru_cache(maxsize=None)
+def build_palette(mode: ThemeMode) -> QPalette:
     palette = QPalette()
 
     if mode is ThemeMode.LIGHT:
@@ -63,9 +68,10 @@ def apply_theme(app: QApplication | None, mode: ThemeMode = ThemeMode.LIGHT) ->
         palette.setColor(QPalette.PlaceholderText, _DARK_MUTED)
         palette.setColor(QPalette.Link, _DARK_ACCENT)
 
-    app.setPalette(palette)
+    return palette
 
 
+@lru_cache(maxsize=None)
 def build_stylesheet(mode: ThemeMode) -> str:
     if mode is ThemeMode.LIGHT:
         return """
@@ -112,7 +118,7 @@ def build_stylesheet(mode: ThemeMode) -> str:
                 letter-spacing: 1.6px;
                 color: #5a4fee;
             }
-            QLabel#FilterHint {
+            QLabel#FilterHint, QLabel#StatisticsText {
                 color: #6c78a0;
                 font-size: 11px;
             }
@@ -127,14 +133,15 @@ def build_stylesheet(mode: ThemeMode) -> str:
             QToolButton#FilterButton:hover {
                 background: rgba(92, 63, 211, 0.2);
             }
-            QLineEdit#CallsignInput, QLineEdit#ScenarioInputField {
+            QLineEdit#CallsignInput, QLineEdit#ScenarioInputField, QLineEdit#QueryInputField, QLineEdit#AlertInputField {
                 background: rgba(255, 255, 255, 0.95);
                 border: 1px solid rgba(92, 63, 211, 0.35);
                 border-radius: 12px;
                 padding: 10px 14px;
                 color: #22263a;
             }
-            QLineEdit#CallsignInput:focus, QLineEdit#ScenarioInputField:focus {
+            QLineEdit#CallsignInput:focus, QLineEdit#ScenarioInputField:focus,
+            QLineEdit#QueryInputField:focus, QLineEdit#AlertInputField:focus {
                 border: 1px solid rgba(255, 113, 172, 0.7);
                 box-shadow: 0 0 0 3px rgba(255, 113, 172, 0.35);
             }
@@ -207,7 +214,7 @@ def build_stylesheet(mode: ThemeMode) -> str:
             letter-spacing: 1.6px;
             color: #9f8cff;
         }
-        QLabel#FilterHint {
+        QLabel#FilterHint, QLabel#StatisticsText {
             color: #9ba3ce;
             font-size: 11px;
         }
@@ -222,14 +229,15 @@ def build_stylesheet(mode: ThemeMode) -> str:
         QToolButton#FilterButton:hover {
             background: rgba(138, 92, 255, 0.4);
         }
-        QLineEdit#CallsignInput, QLineEdit#ScenarioInputField {
+        QLineEdit#CallsignInput, QLineEdit#ScenarioInputField, QLineEdit#QueryInputField, QLineEdit#AlertInputField {
             background: rgba(8, 10, 24, 0.75);
             border: 1px solid rgba(138, 92, 255, 0.45);
             border-radius: 12px;
             padding: 10px 14px;
             color: #f5f7ff;
         }
-        QLineEdit#CallsignInput:focus, QLineEdit#ScenarioInputField:focus {
+        QLineEdit#CallsignInput:focus, QLineEdit#ScenarioInputField:focus,
+            QLineEdit#QueryInputField:focus, QLineEdit#AlertInputField:focus {
             border: 1px solid rgba(255, 98, 146, 0.7);
             box-shadow: 0 0 0 3px rgba(255, 98, 146, 0.35);
         }
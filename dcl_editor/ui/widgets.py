@@ -1,23 +1,37 @@
 from __future__ import annotations
 
+import os
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List
 
-from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
-from PySide6.QtGui import QAction
+from PySide6.QtCore import QAbstractItemModel, QAbstractTableModel, QModelIndex, QPointF, QRectF, Qt, Signal
+from PySide6.QtGui import QAction, QColor, QPainter, QPalette, QStaticText
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QHBoxLayout,
     QHeaderView,
+    QLabel,
     QLineEdit,
+    QListWidget,
+    QListWidgetItem,
     QMenu,
     QPushButton,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QTreeView,
     QVBoxLayout,
     QWidget,
 )
 
-from ..core.models import DclBlock, DclType
+from ..core.models import DclAnomaly, DclBlock, DclType
+from ..io.flights import FlightGroups, FlightSummary
+from ..io.stats import DclStatistics, format_report
+from ..io.timeline import TimelinePyramid
+
+if TYPE_CHECKING:
+    from ..io.alerts import AlertMatch, Subscription
 
 
 @dataclass
@@ -28,36 +42,67 @@ class FilterState:
 
 class BlockTableModel(QAbstractTableModel):
     columns = ("Time", "Type", "Callsign", "Summary")
+    SOURCE_COLUMN = "Source"
+
+    PLACEHOLDER = "…"
+    SUMMARY_COLUMN = 3
+    MAX_CACHED_ROWS = 50_000
 
     def __init__(self, blocks: Iterable[DclBlock] | None = None, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self._blocks: List[DclBlock] = list(blocks or [])
+        self.placeholder_requested: Callable[[DclBlock], None] | None = None
+        self.show_repeat_counts = True
+        self._columns = self.columns
+        # Display tuples of painted rows; unenriched rows are never cached.
+        self._display: Dict[int, tuple[str, ...]] = {}
+
+    def set_show_sources(self, enabled: bool) -> None:
+        columns = self.columns + (self.SOURCE_COLUMN,) if enabled else self.columns
+        if columns != self._columns:
+            self.beginResetModel()
+            self._columns = columns
+            self._display.clear()
+            self.endResetModel()
 
     def rowCount(self, parent: QModelIndex | None = QModelIndex()) -> int:  # type: ignore[override]
         return 0 if parent and parent.isValid() else len(self._blocks)
 
     def columnCount(self, parent: QModelIndex | None = QModelIndex()) -> int:  # type: ignore[override]
-        return len(self.columns)
+        return len(self._columns)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
-        if not index.isValid():
+        if role != Qt.DisplayRole or not index.isValid():
             return None
-        block = self._blocks[index.row()]
-        if role == Qt.DisplayRole:
-            column = index.column()
-            if column == 0:
-                return block.ts or ""
-            if column == 1:
-                return block.type
-            if column == 2:
-                return block.callsign or ""
-            if column == 3:
-                return block.summary
-        return None
+        return self.display_row(index.row())[index.column()]
+
+    def display_row(self, row: int) -> tuple[str, ...]:
+        """Return the display strings of *row*, building them once per enriched row."""
+
+        cached = self._display.get(row)
+        if cached is not None:
+            return cached
+        block = self._blocks[row]
+        values = _block_values(block, self.show_repeat_counts)
+        if not block.enriched:
+            if self.placeholder_requested:
+                self.placeholder_requested(block)
+            return values
+        if len(self._display) >= self.MAX_CACHED_ROWS:
+            self._display.clear()
+        self._display[row] = values
+        return values
+
+    def peek_text(self, row: int, column: int) -> str | None:
+        """Return the display text of *row* without queueing enrichment; ``None`` until it is parsed."""
+
+        if not self._blocks[row].enriched:
+            return None
+        return self.display_row(row)[column]
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
         if role == Qt.DisplayRole and orientation == Qt.Horizontal:
-            return self.columns[section]
+            return self._columns[section]
         return super().headerData(section, orientation, role)
 
     def block_at(self, index: QModelIndex) -> DclBlock | None:
@@ -68,11 +113,272 @@ class BlockTableModel(QAbstractTableModel):
             return self._blocks[row]
         return None
 
+    def callsign_at(self, index: QModelIndex) -> str | None:
+        block = self.block_at(index)
+        return block.callsign if block else None
+
+    def set_blocks(self, blocks: Iterable[DclBlock]) -> None:
+        self.beginResetModel()
+        self._blocks = list(blocks)
+        self._display.clear()
+        self.endResetModel()
+
+    def append_blocks(self, blocks: List[DclBlock]) -> None:
+        if not blocks:
+            return
+        first = len(self._blocks)
+        self.beginInsertRows(QModelIndex(), first, first + len(blocks) - 1)
+        self._blocks.extend(blocks)
+        self.endInsertRows()
+
+    def remove_first_rows(self, count: int) -> None:
+        """Remove the *count* oldest rows, e.g. blocks evicted from a live session."""
+
+        count = min(count, len(self._blocks))
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        del self._blocks[:count]
+        self._display.clear()
+        self.endRemoveRows()
+
+    def refresh_rows(self) -> None:
+        """Repaint rows after their blocks were enriched in the background."""
+
+        self._display.clear()
+        if self._blocks:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._blocks) - 1, len(self._columns) - 1))
+
+
+def _block_values(block: DclBlock, show_repeat_counts: bool) -> tuple[str, ...]:
+    source = os.path.basename(block.source) if block.source else ""
+    if not block.enriched:
+        placeholder = BlockTableModel.PLACEHOLDER
+        return (placeholder, placeholder, placeholder, placeholder, source)
+    summary = block.summary
+    if show_repeat_counts and block.repeat_count > 1:
+        summary = f"{summary}  (×{block.repeat_count})"
+    return (block.ts or "", block.type, block.callsign or "", summary, source)
+
+
+class FlightTreeModel(QAbstractItemModel):
+    """One row per flight from a :class:`FlightGroups` index; messages are fetched on expansion.
+
+    Child indexes carry the flight's serial as their internal id, which stays
+    valid while rows around the flight are inserted or removed.
+    """
+
+    columns = BlockTableModel.columns
+    SOURCE_COLUMN = BlockTableModel.SOURCE_COLUMN
+    SUMMARY_COLUMN = BlockTableModel.SUMMARY_COLUMN
+    NO_CALLSIGN_LABEL = "(no callsign)"
+    CHILD_BATCH = 200
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.groups = FlightGroups()
+        self.placeholder_requested: Callable[[DclBlock], None] | None = None
+        self.show_repeat_counts = True
+        self._columns = self.columns
+        self._blocks: List[DclBlock] = []
+        self._flights: List[FlightSummary] = []
+        self._rows: Dict[int, int] = {}
+        # Children inserted so far per flight serial; the rest wait for fetchMore.
+        self._fetched: Dict[int, int] = {}
+
+    def set_show_sources(self, enabled: bool) -> None:
+        columns = self.columns + (self.SOURCE_COLUMN,) if enabled else self.columns
+        if columns != self._columns:
+            self.beginResetModel()
+            self._columns = columns
+            self.endResetModel()
+
+    # Structure ---------------------------------------------------------
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:  # type: ignore[override]
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, self._flights[parent.row()].serial)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:  # type: ignore[override]
+        if not index.isValid() or not index.internalId():
+            return QModelIndex()
+        row = self._rows.get(index.internalId())
+        return QModelIndex() if row is None else self.createIndex(row, 0, 0)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        if not parent.isValid():
+            return len(self._flights)
+        if parent.internalId() or parent.column() != 0:
+            return 0
+        return self._fetched.get(self._flights[parent.row()].serial, 0)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # type: ignore[override]
+        return len(self._columns)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:  # type: ignore[override]
+        if not parent.isValid():
+            return bool(self._flights)
+        return not parent.internalId() and parent.column() == 0
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # type: ignore[override]
+        if not parent.isValid() or parent.internalId():
+            return False
+        flight = self._flights[parent.row()]
+        return self._fetched.get(flight.serial, 0) < len(flight.blocks)
+
+    def fetchMore(self, parent: QModelIndex) -> None:  # type: ignore[override]
+        if not self.canFetchMore(parent):
+            return
+        flight = self._flights[parent.row()]
+        fetched = self._fetched.get(flight.serial, 0)
+        batch = min(self.CHILD_BATCH, len(flight.blocks) - fetched)
+        self.beginInsertRows(parent, fetched, fetched + batch - 1)
+        self._fetched[flight.serial] = fetched + batch
+        self.endInsertRows()
+
+    # Data --------------------------------------------------------------
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        if not index.internalId():
+            return self._flight_values(self._flights[index.row()])[index.column()]
+        block = self.block_at(index)
+        if block is None:
+            return None
+        if not block.enriched and self.placeholder_requested:
+            self.placeholder_requested(block)
+        return _block_values(block, self.show_repeat_counts)[index.column()]
+
+    @staticmethod
+    def _flight_values(flight: FlightSummary) -> tuple[str, ...]:
+        first, last = flight.first_ts or "", flight.last_ts or ""
+        span = first if first == last else f"{first} – {last}"
+        newest = flight.blocks[-1].source
+        source = os.path.basename(newest) if newest else ""
+        callsign = flight.callsign or FlightTreeModel.NO_CALLSIGN_LABEL
+        return (span, flight.last_status or "", callsign, flight.describe_counts(), source)
+
+    def peek_text(self, row: int, column: int) -> str | None:
+        """Return the display text of flight *row*; flight rows never queue enrichment."""
+
+        return self._flight_values(self._flights[row])[column]
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._columns[section]
+        return super().headerData(section, orientation, role)
+
+    def block_at(self, index: QModelIndex) -> DclBlock | None:
+        """Return the message of a child row; flight rows have no single block."""
+
+        if not index.isValid() or not index.internalId():
+            return None
+        row = self._rows.get(index.internalId())
+        if row is None:
+            return None
+        blocks = self._flights[row].blocks
+        return blocks[index.row()] if 0 <= index.row() < len(blocks) else None
+
+    def callsign_at(self, index: QModelIndex) -> str | None:
+        if not index.isValid():
+            return None
+        if index.internalId():
+            block = self.block_at(index)
+            return block.callsign if block else None
+        return self._flights[index.row()].callsign or None
+
+    # Updates -----------------------------------------------------------
     def set_blocks(self, blocks: Iterable[DclBlock]) -> None:
         self.beginResetModel()
         self._blocks = list(blocks)
+        self.groups.rebuild(self._blocks)
+        self._flights = list(self.groups.flights.values())
+        self._reindex_rows()
+        self._fetched.clear()
         self.endResetModel()
 
+    def append_blocks(self, blocks: List[DclBlock]) -> None:
+        """Add *blocks* to their flights, inserting rows for new flights and fetched children."""
+
+        if not blocks:
+            return
+        self._blocks.extend(blocks)
+        grown: Counter[int] = Counter()
+        touched: Dict[int, FlightSummary] = {}
+        for block in blocks:
+            flight = self.groups.add(block)
+            grown[flight.serial] += 1
+            touched[flight.serial] = flight
+        new = [flight for serial, flight in touched.items() if serial not in self._rows]
+        if new:
+            first = len(self._flights)
+            self.beginInsertRows(QModelIndex(), first, first + len(new) - 1)
+            self._flights.extend(new)
+            for row, flight in enumerate(new, start=first):
+                self._rows[flight.serial] = row
+            self.endInsertRows()
+        last_column = len(self._columns) - 1
+        for serial, flight in touched.items():
+            row = self._rows[serial]
+            fetched = self._fetched.get(serial, 0)
+            if fetched and fetched == len(flight.blocks) - grown[serial]:
+                # Expanded and fully fetched: show the new messages right away.
+                self.beginInsertRows(self.index(row, 0), fetched, len(flight.blocks) - 1)
+                self._fetched[serial] = len(flight.blocks)
+                self.endInsertRows()
+            self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+    def remove_first_rows(self, count: int) -> None:
+        """Remove the *count* oldest messages, dropping flights that become empty."""
+
+        count = min(count, len(self._blocks))
+        if count <= 0:
+            return
+        evicted = self._blocks[:count]
+        del self._blocks[:count]
+        emptied: List[int] = []
+        for flight, removed in self.groups.evict(evicted):
+            row = self._rows[flight.serial]
+            fetched = self._fetched.get(flight.serial, 0)
+            if not flight.blocks:
+                emptied.append(row)
+                continue
+            shown = min(removed, fetched)
+            if shown:
+                self.beginRemoveRows(self.index(row, 0), 0, shown - 1)
+                self._fetched[flight.serial] = fetched - shown
+                self.endRemoveRows()
+        # Remove emptied flights as contiguous ranges, last range first.
+        emptied.sort()
+        while emptied:
+            last = emptied.pop()
+            first = last
+            while emptied and emptied[-1] == first - 1:
+                first = emptied.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for flight in self._flights[first : last + 1]:
+                self._fetched.pop(flight.serial, None)
+            del self._flights[first : last + 1]
+            self._reindex_rows()
+            self.endRemoveRows()
+
+    def refresh_rows(self) -> None:
+        """Repaint flights and fetched messages after their blocks were enriched."""
+
+        if not self._flights:
+            return
+        last_column = len(self._columns) - 1
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self._flights) - 1, last_column))
+        for serial, fetched in self._fetched.items():
+            if fetched:
+                parent = self.index(self._rows[serial], 0)
+                self.dataChanged.emit(self.index(0, 0, parent), self.index(fetched - 1, last_column, parent))
+
+    def _reindex_rows(self) -> None:
+        self._rows = {flight.serial: row for row, flight in enumerate(self._flights)}
+
 
 class CallsignFilter(QWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
@@ -94,6 +400,214 @@ class ScenarioInput(QWidget):
         layout.addWidget(self.input)
 
 
+class QueryInput(QWidget):
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.input = QLineEdit(self)
+        self.input.setPlaceholderText('e.g. type:CDA callsign:THY* text:"SQUAWK"')
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.input)
+
+
+class StatisticsPanel(QWidget):
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.label = QLabel(self)
+        self.label.setObjectName("StatisticsText")
+        self.label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.label)
+        self.set_statistics(DclStatistics())
+
+    def set_statistics(self, stats: DclStatistics, anomalies: Dict[DclAnomaly, int] | None = None) -> None:
+        self.label.setText("\n".join(format_report(stats, anomalies=anomalies)))
+
+
+class AlertPanel(QWidget):
+    subscriptionRequested = Signal(str)
+    subscriptionRemoved = Signal(int)
+
+    MAX_RECENT = 200
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.input = QLineEdit(self)
+        self.input.setObjectName("AlertInputField")
+        self.input.setPlaceholderText("Alert on e.g. callsign:THY1QN type:CLD")
+        self.input.returnPressed.connect(self._request_subscription)
+        self.subscriptions = QListWidget(self)
+        self.subscriptions.setToolTip("Double-click a standing query to remove it")
+        self.subscriptions.itemDoubleClicked.connect(self._remove_subscription)
+        self.recent = QListWidget(self)
+        self.recent.setObjectName("AlertList")
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.input)
+        layout.addWidget(self.subscriptions)
+        layout.addWidget(self.recent)
+
+    def add_subscription(self, subscription: Subscription) -> None:
+        item = QListWidgetItem(subscription.name, self.subscriptions)
+        item.setData(Qt.UserRole, subscription.id)
+        self.input.clear()
+
+    def add_matches(self, matches: List[AlertMatch]) -> None:
+        for match in matches:
+            self.recent.insertItem(0, match.describe())
+        while self.recent.count() > self.MAX_RECENT:
+            self.recent.takeItem(self.recent.count() - 1)
+
+    def _request_subscription(self) -> None:
+        text = self.input.text().strip()
+        if text:
+            self.subscriptionRequested.emit(text)
+
+    def _remove_subscription(self, item: QListWidgetItem) -> None:
+        self.subscriptionRemoved.emit(int(item.data(Qt.UserRole)))
+        self.subscriptions.takeItem(self.subscriptions.row(item))
+
+
+TIMELINE_COLORS: dict[DclType, QColor] = {
+    "RCD": QColor(92, 63, 211),
+    "CLD": QColor(46, 170, 220),
+    "CDA": QColor(60, 190, 120),
+    "FSM": QColor(255, 113, 172),
+    "UNKNOWN": QColor(150, 150, 170),
+}
+
+
+class TimelineWidget(QWidget):
+    """Message density histogram; drag selects a time range, right-drag pans, wheel zooms."""
+
+    rangeSelected = Signal(int, int)
+    selectionCleared = Signal()
+
+    MIN_SPAN_MINUTES = 10
+    BAR_PIXELS = 3
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.setMinimumHeight(84)
+        self._pyramid: TimelinePyramid | None = None
+        self._view_start = 0
+        self._view_end = 0
+        self._drag_origin: float | None = None
+        self._drag_current: float | None = None
+        self._pan_origin: tuple[float, int, int] | None = None
+        self._selection: tuple[int, int] | None = None
+
+    def set_pyramid(self, pyramid: TimelinePyramid) -> None:
+        self._pyramid = pyramid
+        self._selection = None
+        self.reset_view()
+
+    def reset_view(self) -> None:
+        if self._pyramid and self._pyramid.first_minute is not None:
+            self._view_start = self._pyramid.first_minute
+            self._view_end = max(self._pyramid.last_minute + 1, self._view_start + self.MIN_SPAN_MINUTES)
+        self.update()
+
+    def clear_selection(self) -> None:
+        self._selection = None
+        self.update()
+
+    def refresh(self) -> None:
+        """Repaint after the pyramid grew; the view is initialised on the first data."""
+
+        if self._view_end <= self._view_start:
+            self.reset_view()
+        else:
+            self.update()
+
+    def _minute_at(self, x: float) -> int:
+        span = self._view_end - self._view_start
+        return self._view_start + int(x / max(1, self.width()) * span)
+
+    def _x_at(self, minute: int) -> float:
+        span = max(1, self._view_end - self._view_start)
+        return (minute - self._view_start) / span * self.width()
+
+    def paintEvent(self, event) -> None:  # type: ignore[override]
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+        if not self._pyramid or self._pyramid.first_minute is None:
+            painter.end()
+            return
+        span = self._view_end - self._view_start
+        level = self._pyramid.level_for_span(span, max(1, self.width() // self.BAR_PIXELS))
+        bins = self._pyramid.bins(level, self._view_start, self._view_end)
+        peak = max((sum(counts.values()) for _, counts in bins), default=0)
+        height = self.height() - 4
+        for bucket, counts in bins:
+            left = self._x_at(bucket)
+            width = max(1.0, self._x_at(bucket + level) - left - 1)
+            bottom = float(self.height())
+            for block_type, color in TIMELINE_COLORS.items():
+                count = counts.get(block_type, 0)
+                if not count:
+                    continue
+                bar = height * count / peak
+                painter.fillRect(QRectF(left, bottom - bar, width, bar), color)
+                bottom -= bar
+        selection = self._selection_pixels()
+        if selection:
+            highlight = QColor(self.palette().highlight().color())
+            highlight.setAlpha(70)
+            painter.fillRect(QRectF(selection[0], 0, selection[1] - selection[0], self.height()), highlight)
+        painter.end()
+
+    def _selection_pixels(self) -> tuple[float, float] | None:
+        if self._drag_origin is not None and self._drag_current is not None:
+            return min(self._drag_origin, self._drag_current), max(self._drag_origin, self._drag_current)
+        if self._selection:
+            return self._x_at(self._selection[0]), self._x_at(self._selection[1] + 1)
+        return None
+
+    def wheelEvent(self, event) -> None:  # type: ignore[override]
+        if not self._pyramid or self._pyramid.first_minute is None:
+            return
+        anchor = self._minute_at(event.position().x())
+        factor = 0.8 if event.angleDelta().y() > 0 else 1.25
+        span = max(self.MIN_SPAN_MINUTES, int((self._view_end - self._view_start) * factor))
+        ratio = (anchor - self._view_start) / max(1, self._view_end - self._view_start)
+        self._view_start = anchor - int(span * ratio)
+        self._view_end = self._view_start + span
+        self.update()
+
+    def mousePressEvent(self, event) -> None:  # type: ignore[override]
+        x = event.position().x()
+        if event.button() == Qt.LeftButton:
+            self._drag_origin = self._drag_current = x
+        elif event.button() in (Qt.RightButton, Qt.MiddleButton):
+            self._pan_origin = (x, self._view_start, self._view_end)
+
+    def mouseMoveEvent(self, event) -> None:  # type: ignore[override]
+        x = event.position().x()
+        if self._drag_origin is not None:
+            self._drag_current = x
+            self.update()
+        elif self._pan_origin is not None:
+            origin, start, end = self._pan_origin
+            shift = int((origin - x) / max(1, self.width()) * (end - start))
+            self._view_start, self._view_end = start + shift, end + shift
+            self.update()
+
+    def mouseReleaseEvent(self, event) -> None:  # type: ignore[override]
+        if self._drag_origin is not None and self._drag_current is not None:
+            low, high = sorted((self._drag_origin, self._drag_current))
+            self._drag_origin = self._drag_current = None
+            if high - low < 3:
+                self._selection = None
+                self.selectionCleared.emit()
+            else:
+                self._selection = (self._minute_at(low), self._minute_at(high))
+                self.rangeSelected.emit(*self._selection)
+            self.update()
+        self._pan_origin = None
+
+
 class TypeChips(QWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -125,6 +639,51 @@ class TypeChips(QWidget):
         self._callbacks.append(callback)
 
 
+class ElidedTextDelegate(QStyledItemDelegate):
+    """Paint long text elided to the cell width using cached static text layouts."""
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self._layouts: OrderedDict[tuple[str, int, str], QStaticText] = OrderedDict()
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:  # type: ignore[override]
+        item = QStyleOptionViewItem(option)
+        self.initStyleOption(item, index)
+        text = item.text
+        item.text = ""
+        widget = item.widget
+        style = widget.style() if widget else None
+        if style is not None:
+            style.drawControl(QStyle.CE_ItemViewItem, item, painter, widget)
+        rect = style.subElementRect(QStyle.SE_ItemViewItemText, item, widget) if style else option.rect
+        if not text or rect.width() <= 0:
+            return
+        layout = self._layout(text, rect.width(), item)
+        selected = bool(option.state & QStyle.State_Selected)
+        painter.save()
+        painter.setFont(item.font)
+        painter.setPen(option.palette.color(QPalette.HighlightedText if selected else QPalette.Text))
+        top = rect.top() + (rect.height() - item.fontMetrics.height()) / 2
+        painter.drawStaticText(QPointF(rect.left(), top), layout)
+        painter.restore()
+
+    def _layout(self, text: str, width: int, item: QStyleOptionViewItem) -> QStaticText:
+        key = (text, width, item.font.key())
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            return layout
+        layout = QStaticText(item.fontMetrics.elidedText(text, Qt.ElideRight, width))
+        layout.setTextFormat(Qt.PlainText)
+        layout.prepare(font=item.font)
+        self._layouts[key] = layout
+        if len(self._layouts) > self.CACHE_SIZE:
+            self._layouts.popitem(last=False)
+        return layout
+
+
 class ResultsView(QTreeView):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
@@ -136,9 +695,48 @@ class ResultsView(QTreeView):
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
         header = self.header()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        # ResizeToContents would measure every row on each reset; widths are
+        # estimated from a sample of rows instead.
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(True)
         self._context_actions: list[tuple[str, callable]] = []
+        self._summary_delegate = ElidedTextDelegate(self)
+        self._sized_models: set[int] = set()
+
+    def setModel(self, model) -> None:  # type: ignore[override]
+        super().setModel(model)
+        grouped = isinstance(model, FlightTreeModel)
+        self.setRootIsDecorated(grouped)
+        if grouped or isinstance(model, BlockTableModel):
+            self.setItemDelegateForColumn(model.SUMMARY_COLUMN, self._summary_delegate)
+        if id(model) not in self._sized_models:
+            self._sized_models.add(id(model))
+            model.modelReset.connect(self.estimate_column_widths)
+        self.estimate_column_widths()
+
+    def estimate_column_widths(self, samples: int = 200) -> None:
+        """Size columns from the header and a sample of rows that are already parsed.
+
+        Rows are read through ``peek_text`` rather than ``data()`` so sampling
+        never queues enrichment of rows that are not on screen.
+        """
+
+        model = self.model()
+        if model is None or not hasattr(model, "peek_text"):
+            return
+        rows = model.rowCount()
+        step = max(1, rows // samples)
+        metrics = self.fontMetrics()
+        padding = metrics.horizontalAdvance("MM")
+        header = self.header()
+        for column in range(model.columnCount() - 1):
+            title = model.headerData(column, Qt.Horizontal, Qt.DisplayRole) or ""
+            widest = metrics.horizontalAdvance(str(title))
+            for row in range(0, rows, step):
+                text = model.peek_text(row, column)
+                if text:
+                    widest = max(widest, metrics.horizontalAdvance(text))
+            header.resizeSection(column, widest + padding)
 
     def register_action(self, title: str, callback: callable) -> None:
         self._context_actions.append((title, callback))
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Sequence
+
+from PySide6.QtCore import QThread, Signal
+
+from ..core.models import BlockTextReader, DclBlock, stored_text
+from ..io.compare import LogComparer
+from ..io.export import ExportCancelled, export_blocks
+from ..io.indexer import DclIndexer
+from ..io.loader import EnrichmentQueue, LogLoader
+from ..io.multiload import MultiFileLoader
+
+
+class EnrichmentWorker(QThread):
+    """Run the second loading phase in the background, batch by batch."""
+
+    batchEnriched = Signal(int)
+
+    BATCH_SIZE = 256
+
+    def __init__(self, loader: LogLoader, queue: EnrichmentQueue, parent=None) -> None:
+        super().__init__(parent)
+        self._loader = loader
+        self._queue = queue
+
+    def run(self) -> None:  # type: ignore[override]
+        while not self.isInterruptionRequested():
+            batch = self._queue.next_batch(self.BATCH_SIZE)
+            if not batch:
+                break
+            for block in batch:
+                self._loader.enrich(block)
+            self.batchEnriched.emit(len(batch))
+
+
+class ExportWorker(QThread):
+    """Stream the filtered rows to a file without blocking the UI."""
+
+    progressed = Signal(int, int)
+    succeeded = Signal(int)
+    failed = Signal(str)
+
+    def __init__(
+        self,
+        blocks: Sequence[DclBlock],
+        destination: Path,
+        fmt: str,
+        source: Path | None = None,
+        context: Sequence[DclBlock] | None = None,
+        read_text: BlockTextReader = stored_text,
+        parent=None,
+    ) -> None:
+        super().__init__(parent)
+        self._blocks = blocks
+        self._destination = destination
+        self._fmt = fmt
+        self._source = source
+        self._context = context
+        self._read_text = read_text
+
+    def run(self) -> None:  # type: ignore[override]
+        try:
+            count = export_blocks(
+                self._blocks,
+                self._destination,
+                self._fmt,
+                source=self._source,
+                context=self._context,
+                read_text=self._read_text,
+                progress=self.progressed.emit,
+                cancelled=self.isInterruptionRequested,
+            )
+        except ExportCancelled:
+            self.failed.emit("Export cancelled.")
+        except (OSError, ValueError) as exc:
+            self.failed.emit(str(exc))
+        else:
+            self.succeeded.emit(count)
+
+
+class CompareWorker(QThread):
+    """Stream the differences between two logs to the UI in batches."""
+
+    differencesFound = Signal(list)
+    completed = Signal(str)
+    failed = Signal(str)
+
+    BATCH_SIZE = 200
+
+    def __init__(self, left: Path, right: Path, parent=None) -> None:
+        super().__init__(parent)
+        self._comparer = LogComparer(left, right)
+
+    def run(self) -> None:  # type: ignore[override]
+        batch = []
+        try:
+            for difference in self._comparer.differences():
+                if self.isInterruptionRequested():
+                    return
+                batch.append(difference)
+                if len(batch) >= self.BATCH_SIZE:
+                    self.differencesFound.emit(batch)
+                    batch = []
+        except OSError as exc:
+            self.failed.emit(str(exc))
+            return
+        if batch:
+            self.differencesFound.emit(batch)
+        counts = self._comparer.counts
+        self.completed.emit(
+            f"{self._comparer.matched} matched, {counts['missing']} missing, "
+            f"{counts['extra']} extra, {counts['changed']} changed"
+        )
+
+
+class MultiLoadWorker(QThread):
+    """Parse several logs in worker processes and hand back their indexes."""
+
+    progressed = Signal(int, int)
+    loaded = Signal(list)
+    failed = Signal(str)
+
+    def __init__(self, loader: MultiFileLoader, paths: Sequence[Path], parent=None) -> None:
+        super().__init__(parent)
+        self._loader = loader
+        self._paths = list(paths)
+
+    def run(self) -> None:  # type: ignore[override]
+        try:
+            files = self._loader.load(self._paths, progress=self.progressed.emit)
+        except OSError as exc:
+            self.failed.emit(str(exc))
+        else:
+            self.loaded.emit(files)
+
+
+class ShareWorker(QThread):
+    """Publish a parsed log to shared memory for other viewers on the host.
+
+    The resulting store, if any, is left in :attr:`store` for the owner to
+    adopt or release once the thread has finished.
+    """
+
+    failed = Signal(str)
+
+    def __init__(self, path: Path, blocks: Sequence[DclBlock], dangling_starts: int, parent=None) -> None:
+        super().__init__(parent)
+        self.path = path
+        self.store = None
+        self._blocks = list(blocks)
+        self._dangling_starts = dangling_starts
+
+    def run(self) -> None:  # type: ignore[override]
+        from ..io.shared import SharedLogStore
+
+        indexer = DclIndexer()
+        indexer.rebuild(self._blocks)
+        try:
+            self.store = SharedLogStore.publish(self.path, indexer, self._dangling_starts)
+        except (OSError, ValueError) as exc:
+            self.failed.emit(str(exc))
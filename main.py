@@ -1,7 +1,13 @@
 """Application entry point for the DCL Editor project."""
 
-from dcl_editor.app import main as run_app
+import multiprocessing
 
 
 if __name__ == "__main__":
+    # A frozen build starts its loader worker processes by re-running this
+    # script; let them run their task before the GUI is imported.
+    multiprocessing.freeze_support()
+
+    from dcl_editor.app import main as run_app
+
     raise SystemExit(run_app())
@@ -0,0 +1,70 @@
+"""Measure the throughput of every parsing path on generated adversarial logs.
+
+Each path is first checked against the reference pipeline, then timed:
+
+    python scripts/bench_parsers.py --megabytes 50 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dcl_editor.tests.test_differential import PATHS, _available, generate_log, reference_blocks  # noqa: E402
+
+
+def build_input(megabytes: float, huge_rate: float) -> bytes:
+    parts = []
+    size = 0
+    seed = 0
+    while size < megabytes * 1024 * 1024:
+        chunk = generate_log(seed, blocks=200, huge_rate=huge_rate)
+        parts.append(chunk)
+        size += len(chunk)
+        seed += 1
+    return b"".join(parts)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=20.0, help="size of the generated log")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per path; the best is reported")
+    parser.add_argument("--huge-rate", type=float, default=0.01, help="fraction of blocks that are very large")
+    args = parser.parse_args(argv)
+
+    data = build_input(args.megabytes, args.huge_rate)
+    megabytes = len(data) / (1024 * 1024)
+    timings = {}
+    started = time.perf_counter()
+    expected = reference_blocks(data)
+    timings["reference"] = time.perf_counter() - started
+    print(f"{megabytes:.1f} MiB, {len(expected)} blocks")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, path in PATHS.items():
+            if not _available(name):
+                print(f"{name:<24} skipped (optional dependency missing)")
+                continue
+            best = None
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                result = path(data, Path(directory))
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            if result != expected:
+                print(f"{name:<24} MISMATCH against the reference")
+                return 1
+            timings[name] = best
+
+    for name, elapsed in timings.items():
+        print(f"{name:<24} {elapsed:8.3f} s {megabytes / elapsed:8.1f} MiB/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
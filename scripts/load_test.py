@@ -0,0 +1,85 @@
+"""Load-test a running query service and report requests per second and latency.
+
+Start a server first, then point this script at it:
+
+    python -m dcl_editor serve DEBUG.log --port 8765
+    python scripts/load_test.py --url http://127.0.0.1:8765 --clients 16 --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from urllib.request import urlopen
+
+
+DEFAULT_QUERIES = (
+    "type:CLD",
+    "type:CDA,CLD",
+    "callsign:THY*",
+    "NOT type:UNKNOWN",
+    'text:"CLRD"',
+)
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="base URL of the service")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent client threads")
+    parser.add_argument("--requests", type=int, default=1000, help="total number of requests")
+    parser.add_argument("--limit", type=int, default=100, help="rows per page")
+    parser.add_argument("--query", action="append", help="query to cycle through; may be repeated")
+    args = parser.parse_args(argv)
+
+    queries = itertools.cycle(args.query or DEFAULT_QUERIES)
+    lock = threading.Lock()
+    paths = []
+    for _ in range(args.requests):
+        paths.append(f"/blocks?q={quote(next(queries))}&limit={args.limit}")
+
+    latencies: list[float] = []
+    failures = 0
+
+    def fetch(path: str) -> None:
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            with urlopen(args.url + path, timeout=30) as response:
+                response.read()
+        except OSError:
+            with lock:
+                failures += 1
+            return
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(fetch, paths))
+    wall = time.perf_counter() - started
+
+    if not latencies:
+        print(f"All {failures} requests failed")
+        return 1
+    print(f"{len(latencies)} requests in {wall:.2f}s with {args.clients} clients, {failures} failed")
+    print(f"throughput {len(latencies) / wall:.0f} req/s")
+    print(
+        f"latency mean {statistics.mean(latencies) * 1000:.1f} ms, "
+        f"p50 {percentile(latencies, 0.50) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms"
+    )
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())